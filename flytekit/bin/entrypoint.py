@@ -1,17 +1,28 @@
 from __future__ import absolute_import
 
 import importlib as _importlib
+import json as _json
+import logging as _logging
 import os as _os
+import socket as _socket
+import sys as _sys
+import tempfile as _tempfile
+import traceback as _traceback
 
 import click as _click
 import datetime as _datetime
 import random as _random
+from concurrent import futures as _futures
 from flyteidl.core import literals_pb2 as _literals_pb2
+from six import moves as _six_moves
 
-from flytekit.common import utils as _utils
-from flytekit.common.exceptions import scopes as _scopes, system as _system_exceptions
-from flytekit.configuration import internal as _internal_config, TemporaryConfiguration as _TemporaryConfiguration
+from flytekit.common import constants as _constants, index_lookup as _index_lookup, output_cache as _output_cache, \
+    packed_inputs as _packed_inputs, tracing as _tracing, utils as _utils
+from flytekit.common.exceptions import scopes as _scopes
+from flytekit.configuration import internal as _internal_config, sdk as _sdk_config, \
+    TemporaryConfiguration as _TemporaryConfiguration
 from flytekit.engines import loader as _engine_loader
+from flytekit.engines.flyte import engine as _flyte_engine
 from flytekit.interfaces.data import data_proxy as _data_proxy
 from flytekit.interfaces import random as _flyte_random
 from flytekit.models import literals as _literal_models
@@ -31,34 +42,158 @@ def _compute_array_job_index():
     return offset + int(_os.environ.get(_os.environ.get('BATCH_JOB_ARRAY_INDEX_VAR_NAME')))
 
 
-def _map_job_index_to_child_index(local_input_dir, datadir, index):
-    local_lookup_file = local_input_dir.get_named_tempfile('indexlookup.pb')
-    idx_lookup_file = _os.path.join(datadir, 'indexlookup.pb')
+def _array_batch_sub_task_indices(job_index):
+    """
+    If the array job packs several sub-tasks into each container, returns the indices of the sub-tasks this container
+    executes.  They are a contiguous range of the sub-tasks.
+    :param int job_index:
+    :rtype: list[int]|None
+    """
+    batch_size = int(_os.environ.get(_constants.ARRAY_BATCH_SIZE_ENV_VAR) or 1)
+    if batch_size <= 1:
+        return None
+    sub_task_count = int(_os.environ[_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR])
+    return list(_six_moves.range(job_index * batch_size, min((job_index + 1) * batch_size, sub_task_count)))
 
-    # if the indexlookup.pb does not exist, then just return the index
-    if not _data_proxy.Data.data_exists(idx_lookup_file):
-        return index
 
-    _data_proxy.Data.get_data(idx_lookup_file, local_lookup_file)
-    mapping_proto = _utils.load_proto_from_file(_literals_pb2.LiteralCollection, local_lookup_file)
-    if len(mapping_proto.literals) < index:
-        raise _system_exceptions.FlyteSystemAssertion(
-            "dynamic task index lookup array size: {} is smaller than lookup index {}".format(
-                len(mapping_proto.literals), index))
-    return mapping_proto.literals[index].scalar.primitive.integer
+def _execute_with_inputs(task_def, local_inputs_file, output_prefix, output_cache=None):
+    """
+    :param flytekit.common.tasks.task.SdkTask task_def:
+    :param Text local_inputs_file:
+    :param Text output_prefix:
+    :param flytekit.common.output_cache.OutputCache output_cache: If specified, cached outputs are used instead of
+        running the task, and the outputs of the task are cached if it succeeds.
+    """
+    with _tracing.span('load_inputs') as span:
+        input_proto = _utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
+        span.add_path_bytes(local_inputs_file)
+    inputs = _literal_models.LiteralMap.from_flyte_idl(input_proto)
+    if output_cache is not None:
+        with _tracing.span('fetch_cached_outputs'):
+            if output_cache.fetch(inputs, output_prefix):
+                return
+    _engine_loader.get_engine().get_task(task_def).execute(inputs, context={'output_prefix': output_prefix})
+    if output_cache is not None:
+        with _tracing.span('cache_outputs'):
+            output_cache.store(inputs, output_prefix)
 
 
-@_scopes.system_entry_point
-def execute_task(task_module, task_name, inputs, output_prefix, test):
-    with _TemporaryConfiguration(_internal_config.CONFIGURATION_PATH.get()):
-        with _utils.AutoDeletingTempDir('input_dir') as input_dir:
-            # Load user code
-            task_module = _importlib.import_module(task_module)
-            task_def = getattr(task_module, task_name)
+def _fetch_inputs(input_dir, inputs, output_prefix, job_index):
+    """
+    Resolves the location of the inputs of the task and downloads them.  This is I/O bound, so it runs on a background
+    thread while the user code is imported.
+
+    :param flytekit.common.utils.AutoDeletingTempDir input_dir:
+    :param Text inputs:
+    :param Text output_prefix:
+    :param int job_index: The index of this container in its array job or None if the task isn't an array job.
+    :returns: The local inputs file and the output prefix of the task.  If the container executes a batch of sub-tasks,
+        the indices of the sub-tasks are returned instead of an inputs file, since every sub-task fetches its own
+        inputs.
+    :rtype: (Text, Text, list[int])
+    """
+    with _tracing.span('fetch_inputs'):
+        if job_index is not None:
+            # The job index of a container of a batched array job is expanded to the sub-tasks it executes.  Batched
+            # array jobs are never discoverable, so the job index isn't a child index to look up.
+            sub_task_indices = _array_batch_sub_task_indices(job_index)
+            if sub_task_indices is not None:
+                return None, output_prefix, sub_task_indices
+
+            # If an ArrayTask is discoverable, the original job index may be different than the one specified in
+            # the environment variable. Look up the correct input/outputs in the index lookup mapping file.
+            with _utils.PerformanceTimer("Looking up the index of array job {}".format(job_index)), \
+                    _tracing.span('look_up_array_job_index'):
+                job_index = _index_lookup.map_job_index_to_child_index(input_dir, inputs, job_index)
+
+        local_inputs_file = input_dir.get_named_tempfile('inputs.pb')
+        if job_index is None:
+            _data_proxy.Data.get_data(inputs, local_inputs_file)
+            return local_inputs_file, output_prefix, None
+        _fetch_array_sub_task_inputs(inputs, job_index, local_inputs_file)
+        return local_inputs_file, _os.path.join(output_prefix, str(job_index)), None
+
+
+def _fetch_array_sub_task_inputs(inputs, sub_task_index, local_inputs_file):
+    """
+    Downloads the inputs of a sub-task of an array job.  They are either in a file of their own under the index of the
+    sub-task, or in the packed inputs file of the array job, in which case only the inputs of the sub-task are read.
+
+    :param Text inputs: The inputs prefix of the array job.
+    :param int sub_task_index:
+    :param Text local_inputs_file:
+    """
+    packed_inputs_file = _os.environ.get(_constants.ARRAY_PACKED_INPUTS_ENV_VAR)
+    if packed_inputs_file:
+        _packed_inputs.fetch_inputs(_os.path.join(inputs, packed_inputs_file), sub_task_index, local_inputs_file)
+    else:
+        _data_proxy.Data.get_data(_os.path.join(inputs, str(sub_task_index), 'inputs.pb'), local_inputs_file)
 
-            if not test:
-                local_inputs_file = input_dir.get_named_tempfile('inputs.pb')
 
+def _execute_array_sub_task(task_module, task_name, inputs, output_prefix, sub_task_index):
+    """
+    Executes one sub-task of a batch, possibly in a worker process.  Like every container of an unbatched array job, it
+    reads its own inputs and writes its outputs to the directory of its own index.
+
+    :param Text task_module:
+    :param Text task_name:
+    :param Text inputs:
+    :param Text output_prefix:
+    :param int sub_task_index:
+    """
+    _flyte_random.seed_flyte_random(
+        "{} {} {} {}".format(_random.random(), _datetime.datetime.utcnow(), _os.getpid(), sub_task_index)
+    )
+    task_def = getattr(_importlib.import_module(task_module), task_name)
+    with _utils.AutoDeletingTempDir('input_dir') as input_dir:
+        local_inputs_file = input_dir.get_named_tempfile('inputs.pb')
+        _fetch_array_sub_task_inputs(inputs, sub_task_index, local_inputs_file)
+        _execute_with_inputs(
+            task_def,
+            local_inputs_file,
+            _os.path.join(output_prefix, str(sub_task_index)),
+            output_cache=_output_cache.OutputCache.from_config(task_def, "{}.{}".format(task_module, task_name))
+        )
+
+
+def _execute_array_batch(task_module, task_name, inputs, output_prefix, sub_task_indices):
+    """
+    :param Text task_module:
+    :param Text task_name:
+    :param Text inputs:
+    :param Text output_prefix:
+    :param list[int] sub_task_indices:
+    """
+    parallelism = min(_sdk_config.ARRAY_BATCH_PARALLELISM.get(), len(sub_task_indices))
+    if parallelism <= 1:
+        for i in sub_task_indices:
+            _execute_array_sub_task(task_module, task_name, inputs, output_prefix, i)
+        return
+
+    with _futures.ProcessPoolExecutor(max_workers=parallelism) as executor:
+        submitted = [
+            executor.submit(_execute_array_sub_task, task_module, task_name, inputs, output_prefix, i)
+            for i in sub_task_indices
+        ]
+        for f in submitted:
+            f.result()
+
+
+def _execute_task(task_module, task_name, inputs, output_prefix, test):
+    """
+    :param Text task_module:
+    :param Text task_name:
+    :param Text inputs:
+    :param Text output_prefix:
+    :param bool test:
+    :returns: The output prefix of the task, or None if the container didn't execute a single task.
+    :rtype: Text
+    """
+    with _utils.AutoDeletingTempDir('input_dir') as input_dir:
+        with _futures.ThreadPoolExecutor(max_workers=1) as fetcher:
+            fetched_inputs = None
+            job_index = None
+            if not test:
                 # Handle inputs/outputs for array job.
                 if _os.environ.get('BATCH_JOB_ARRAY_INDEX_VAR_NAME'):
                     job_index = _compute_array_job_index()
@@ -72,20 +207,52 @@ def execute_task(task_module, task_name, inputs, output_prefix, test):
                             job_index
                         )
                     )
+                fetched_inputs = fetcher.submit(_fetch_inputs, input_dir, inputs, output_prefix, job_index)
+
+            # Load user code while the inputs are being fetched.
+            with _utils.PerformanceTimer("Importing {}".format(task_module)), _tracing.span('import_module'):
+                task_def = getattr(_importlib.import_module(task_module), task_name)
+
+            if fetched_inputs is None:
+                return None
+            with _utils.PerformanceTimer("Waiting for inputs"), _tracing.span('wait_for_inputs'):
+                local_inputs_file, output_prefix, sub_task_indices = fetched_inputs.result()
+
+        with _tracing.span('execute'):
+            if sub_task_indices is not None:
+                _execute_array_batch(task_module, task_name, inputs, output_prefix, sub_task_indices)
+                # Every sub-task of the batch has its own outputs, so there is no single place for the timings of
+                # the container.
+                return None
+            output_cache = None
+            if job_index is not None:
+                # Only the outputs of the sub-tasks of array jobs are cached.
+                output_cache = _output_cache.OutputCache.from_config(task_def, "{}.{}".format(task_module, task_name))
+            _execute_with_inputs(task_def, local_inputs_file, output_prefix, output_cache=output_cache)
+            return output_prefix
 
-                    # If an ArrayTask is discoverable, the original job index may be different than the one specified in
-                    # the environment variable. Look up the correct input/outputs in the index lookup mapping file.
-                    job_index = _map_job_index_to_child_index(input_dir, inputs, job_index)
 
-                    inputs = _os.path.join(inputs, str(job_index), 'inputs.pb')
-                    output_prefix = _os.path.join(output_prefix, str(job_index))
+def _report_timings(tracer, output_prefix):
+    """
+    :param flytekit.common.tracing.Tracer tracer:
+    :param Text output_prefix: Where the outputs of the task are, or None if timings are only emitted as stats.
+    """
+    if output_prefix is not None and _sdk_config.WRITE_TIMINGS.get():
+        with _utils.AutoDeletingTempDir('timings') as timings_dir:
+            timings_file = timings_dir.get_named_tempfile(_constants.TIMINGS_FILE_NAME)
+            tracer.write(timings_file)
+            _data_proxy.Data.put_data(timings_file, _os.path.join(output_prefix, _constants.TIMINGS_FILE_NAME))
+    tracer.emit(_flyte_engine.get_task_stats('execution'))
+
 
-                _data_proxy.Data.get_data(inputs, local_inputs_file)
-                input_proto = _utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
-                _engine_loader.get_engine().get_task(task_def).execute(
-                    _literal_models.LiteralMap.from_flyte_idl(input_proto),
-                    context={'output_prefix': output_prefix}
-                )
+@_scopes.system_entry_point
+def execute_task(task_module, task_name, inputs, output_prefix, test):
+    with _tracing.Tracer() as tracer, _utils.ExitStack() as configuration:
+        with _tracing.span('load_config'):
+            configuration.enter_context(_TemporaryConfiguration(_internal_config.CONFIGURATION_PATH.get()))
+        output_prefix = _execute_task(task_module, task_name, inputs, output_prefix, test)
+        if not test:
+            _report_timings(tracer, output_prefix)
 
 
 @_click.command('pyflyte-execute')
@@ -97,3 +264,124 @@ def execute_task(task_module, task_name, inputs, output_prefix, test):
 def execute_task_cmd(task_module, task_name, inputs, output_prefix, test):
     _click.echo(_utils.get_version_message())
     execute_task(task_module, task_name, inputs, output_prefix, test)
+
+
+def _execute_request(request):
+    """
+    Executes a task request of a warm worker.  Requests are isolated from each other as far as the process allows:
+    environment overrides are reverted and temporary files are removed once the request completes.  Imported modules
+    stay loaded, which is what makes subsequent requests fast.
+
+    :param dict[Text,T] request: Must have task_module, task_name, inputs and output_prefix keys.  An optional env key
+        holds environment variables to set for the request only, which can be used to override configuration.
+    """
+    env = request.get('env') or {}
+    old_env = {k: _os.environ.get(k) for k in env}
+    old_tempdir = _tempfile.tempdir
+    try:
+        _os.environ.update(env)
+        with _utils.AutoDeletingTempDir('request') as request_dir:
+            _tempfile.tempdir = request_dir.name
+            execute_task(
+                request['task_module'],
+                request['task_name'],
+                request['inputs'],
+                request['output_prefix'],
+                False
+            )
+    finally:
+        _tempfile.tempdir = old_tempdir
+        for k, v in old_env.items():
+            if v is None:
+                _os.environ.pop(k, None)
+            else:
+                _os.environ[k] = v
+
+
+def _serve(request_lines, respond):
+    """
+    Executes one task request per line and responds with one line per request.  Requests and responses are JSON
+    documents.  A response has a status of either 'ok' or 'error' and, if the request specified it, the same id.  A
+    failing request doesn't stop the worker.
+
+    :param Iterable[Text] request_lines:
+    :param (Text) -> None respond:
+    """
+    for line in request_lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        response = {}
+        try:
+            request = _json.loads(line)
+            if 'id' in request:
+                response['id'] = request['id']
+            _execute_request(request)
+            response['status'] = 'ok'
+        except Exception:
+            _logging.error("Task request failed: {}".format(line))
+            response['status'] = 'error'
+            response['error'] = _traceback.format_exc()
+        respond(_json.dumps(response))
+
+
+def _serve_stdio():
+    """
+    Serves requests from stdin.  Anything the tasks print to stdout is redirected to stderr, so that stdout only
+    carries responses.
+    """
+    responses = _os.fdopen(_os.dup(_sys.stdout.fileno()), 'w')
+    _sys.stdout.flush()
+    _os.dup2(_sys.stderr.fileno(), _sys.stdout.fileno())
+
+    def _respond(response):
+        responses.write(response + "\n")
+        responses.flush()
+
+    _serve(iter(_sys.stdin.readline, ''), _respond)
+
+
+def _serve_socket(path):
+    """
+    Serves requests from connections to a unix domain socket, one connection at a time.
+    :param Text path:
+    """
+    server = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    try:
+        while True:
+            connection, _ = server.accept()
+            try:
+                stream = connection.makefile('rw')
+
+                def _respond(response):
+                    stream.write(response + "\n")
+                    stream.flush()
+
+                _serve(iter(stream.readline, ''), _respond)
+            finally:
+                connection.close()
+    finally:
+        server.close()
+        _os.remove(path)
+
+
+@_click.command('pyflyte-execute-server')
+@_click.option('--socket', 'socket_path', help='Path of a unix domain socket to serve requests on instead of stdin.')
+@_click.option('--preload', multiple=True, help='Modules to import before serving the first request.')
+def execute_task_server_cmd(socket_path, preload):
+    """
+    Runs pyflyte-execute as a long-lived worker that executes many tasks.  Interpreter start-up and imports are paid for
+    once rather than for every task, which dominates the runtime of short tasks.  Each request is a JSON document on a
+    line of its own, i.e. {"task_module": ..., "task_name": ..., "inputs": ..., "output_prefix": ..., "env": {...}}.
+    """
+    _click.echo(_utils.get_version_message(), err=True)
+    for module in preload:
+        _importlib.import_module(module)
+
+    if socket_path:
+        _serve_socket(socket_path)
+    else:
+        _serve_stdio()
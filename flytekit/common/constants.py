@@ -1,9 +1,20 @@
 from __future__ import absolute_import
 
 INPUT_FILE_NAME = 'inputs.pb'
+PACKED_INPUTS_FILE_NAME = 'inputs.packed'
 OUTPUT_FILE_NAME = 'outputs.pb'
+TIMINGS_FILE_NAME = 'timings.json'
 FUTURES_FILE_NAME = 'futures.pb'
 ERROR_FILE_NAME = 'error.pb'
+INDEX_LOOKUP_FILE_NAME = 'indexlookup.pb'
+PACKED_INDEX_LOOKUP_FILE_NAME = 'indexlookup.bin'
+OFFLOADED_LITERALS_DIR = 'offloaded'
+PROFILES_DIR = 'profiles'
+SPILLED_INPUTS_DIR = 'spilled_inputs'
+OFFLOADED_LITERAL_FORMAT = 'flyte-offloaded-literal'
+ARRAY_BATCH_SIZE_ENV_VAR = 'FLYTE_ARRAY_BATCH_SIZE'
+ARRAY_SUB_TASK_COUNT_ENV_VAR = 'FLYTE_ARRAY_SUB_TASK_COUNT'
+ARRAY_PACKED_INPUTS_ENV_VAR = 'FLYTE_ARRAY_PACKED_INPUTS'
 
 
 class SdkTaskType(object):
@@ -6,6 +6,7 @@ from sys import exc_info as _exc_info
 from flytekit.common.exceptions import system as _system_exceptions, user as _user_exceptions, base as _base_exceptions
 from flytekit.models.core import errors as _error_model
 from traceback import format_tb as _format_tb
+import threading as _threading
 
 
 class FlyteScopedException(Exception):
@@ -135,12 +136,49 @@ _NULL_CONTEXT = 0
 _USER_CONTEXT = 1
 _SYSTEM_CONTEXT = 2
 
-# Keep the stack with a null-context so we never have to range check when peeking back.
-_CONTEXT_STACK = [_NULL_CONTEXT]
+
+class _ContextStack(object):
+
+    def __init__(self):
+        # Keep the stack with a null-context so we never have to range check when peeking back.  The stack is shared by
+        # every thread, unless a thread is given its own with ThreadScopes.
+        self._shared = [_NULL_CONTEXT]
+        self._local = _threading.local()
+
+    @property
+    def stack(self):
+        """
+        :rtype: list[int]
+        """
+        stack = getattr(self._local, 'stack', None)
+        return self._shared if stack is None else stack
+
+    @stack.setter
+    def stack(self, value):
+        self._local.stack = value
+
+
+_CONTEXT_STACK = _ContextStack()
+
+
+class ThreadScopes(object):
+    """
+    Gives the thread that enters it its own stack of exception scopes, holding the scopes of the thread that created
+    it.  Threads that execute tasks concurrently use it so that their scopes don't interleave.
+    """
+
+    def __init__(self):
+        self._stack = list(_CONTEXT_STACK.stack)
+
+    def __enter__(self):
+        _CONTEXT_STACK.stack = list(self._stack)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _CONTEXT_STACK.stack = None
 
 
 def _is_base_context():
-    return _CONTEXT_STACK[-2] == _NULL_CONTEXT
+    return _CONTEXT_STACK.stack[-2] == _NULL_CONTEXT
 
 
 @_decorator
@@ -152,7 +190,7 @@ def system_entry_point(wrapped, instance, args, kwargs):
     should take action themselves or pass on to the platform owners.  We will dispatch metrics and such appropriately.
     """
     try:
-        _CONTEXT_STACK.append(_SYSTEM_CONTEXT)
+        _CONTEXT_STACK.stack.append(_SYSTEM_CONTEXT)
         if _is_base_context():
             try:
                 return wrapped(*args, **kwargs)
@@ -177,7 +215,7 @@ def system_entry_point(wrapped, instance, args, kwargs):
                     FlyteScopedSystemException(*_exc_info(), kind=_error_model.ContainerError.Kind.RECOVERABLE),
                     _exc_info()[2])
     finally:
-        _CONTEXT_STACK.pop()
+        _CONTEXT_STACK.stack.pop()
 
 
 @_decorator
@@ -192,7 +230,7 @@ def user_entry_point(wrapped, instance, args, kwargs):
     to the user.
     """
     try:
-        _CONTEXT_STACK.append(_USER_CONTEXT)
+        _CONTEXT_STACK.stack.append(_USER_CONTEXT)
         if _is_base_context():
             try:
                 return wrapped(*args, **kwargs)
@@ -222,4 +260,4 @@ def user_entry_point(wrapped, instance, args, kwargs):
                     FlyteScopedUserException(*_exc_info()),
                     _exc_info()[2])
     finally:
-        _CONTEXT_STACK.pop()
+        _CONTEXT_STACK.stack.pop()
@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+
+import os as _os
+import struct as _struct
+
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+from flytekit.common import constants as _constants, utils as _utils
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.interfaces.data import data_proxy as _data_proxy
+
+# The packed index lookup holds the child index of every job index as an unsigned 64-bit little endian integer, so the
+# child index of job index i is stored at offset 8 * i.
+_INDEX = _struct.Struct('<Q')
+
+
+def to_bytes(child_indices):
+    """
+    :param list[int] child_indices: The child index of every job index.
+    :rtype: bytes
+    """
+    return _struct.pack('<{}Q'.format(len(child_indices)), *child_indices)
+
+
+def write(child_indices, path):
+    """
+    Writes a packed index lookup file.
+    :param list[int] child_indices: The child index of every job index.
+    :param Text path:
+    """
+    with open(path, 'wb') as w:
+        w.write(to_bytes(child_indices))
+
+
+def map_job_index_to_child_index(local_input_dir, datadir, index):
+    """
+    If an array job is discoverable, the job index of a container may be different than the index of the sub-task it
+    executes, since only the sub-tasks whose outputs weren't discovered run.  The index of the sub-task is read from
+    the packed index lookup file with a ranged read, so it takes the same time whatever the size of the array job.  It
+    is only looked for if the platform is configured to write it, so that containers don't pay for a request that
+    can't succeed.  Otherwise the index lookup file, a LiteralCollection of the child indices, is read whole.
+
+    :param flytekit.common.utils.AutoDeletingTempDir local_input_dir:
+    :param Text datadir: The inputs prefix of the array job.
+    :param int index: The job index of the container.
+    :returns: The index of the sub-task to execute, which is the job index if there is no index lookup file.
+    :rtype: int
+    """
+    packed_lookup_file = _os.path.join(datadir, _constants.PACKED_INDEX_LOOKUP_FILE_NAME)
+    if _sdk_config.PACKED_INDEX_LOOKUP.get() and _data_proxy.Data.data_exists(packed_lookup_file):
+        local_lookup_file = local_input_dir.get_named_tempfile(_constants.PACKED_INDEX_LOOKUP_FILE_NAME)
+        _data_proxy.Data.get_data_range(
+            packed_lookup_file, local_lookup_file, _INDEX.size * index, _INDEX.size * (index + 1))
+        with open(local_lookup_file, 'rb') as r:
+            data = r.read()
+        if len(data) != _INDEX.size:
+            raise _system_exceptions.FlyteSystemAssertion(
+                "dynamic task index lookup {} doesn't hold lookup index {}".format(packed_lookup_file, index))
+        return _INDEX.unpack(data)[0]
+
+    lookup_file = _os.path.join(datadir, _constants.INDEX_LOOKUP_FILE_NAME)
+    # if the indexlookup.pb does not exist, then just return the index
+    if not _data_proxy.Data.data_exists(lookup_file):
+        return index
+
+    local_lookup_file = local_input_dir.get_named_tempfile(_constants.INDEX_LOOKUP_FILE_NAME)
+    _data_proxy.Data.get_data(lookup_file, local_lookup_file)
+    mapping_proto = _utils.load_proto_from_file(_literals_pb2.LiteralCollection, local_lookup_file)
+    if len(mapping_proto.literals) <= index:
+        raise _system_exceptions.FlyteSystemAssertion(
+            "dynamic task index lookup array size: {} is smaller than lookup index {}".format(
+                len(mapping_proto.literals), index))
+    return mapping_proto.literals[index].scalar.primitive.integer
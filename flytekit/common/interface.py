@@ -55,6 +55,19 @@ class BindingData(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _literal_model
                     additional_msg="When binding workflow input: {}".format(t_value)
                 )
             promise = t_value.promise
+        elif isinstance(t_value, _promise.MappedNodeOutput):
+            if not issubclass(downstream_sdk_type, _containers.ListImpl):
+                raise _user_exceptions.FlyteTypeException(
+                    t_value.sdk_type,
+                    downstream_sdk_type,
+                    additional_msg="Cannot bind the output of a map node to a non-list type."
+                )
+            # The outputs of the sub-tasks of a map node are gathered into a list.
+            collection = _literal_models.BindingDataCollection(
+                [BindingData(promise=t_value.element(i)) for i in _six.moves.range(len(t_value))]
+            )
+            if upstream_nodes is not None and len(t_value) > 0:
+                upstream_nodes.append(t_value.sdk_node)
         elif isinstance(t_value, _promise.NodeOutput):
             if not downstream_sdk_type.is_castable_from(t_value.sdk_type):
                 _user_exceptions.FlyteTypeException(
@@ -73,10 +86,11 @@ class BindingData(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _literal_model
                     received_value=t_value,
                     additional_msg="Cannot bind a list to a non-list type."
                 )
+            sub_literal_type = downstream_sdk_type.sub_type.to_flyte_literal_type()
             collection = _literal_models.BindingDataCollection(
                 [
                     BindingData.from_python_std(
-                        downstream_sdk_type.sub_type.to_flyte_literal_type(),
+                        sub_literal_type,
                         v,
                         upstream_nodes=upstream_nodes
                     )
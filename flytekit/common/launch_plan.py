@@ -347,6 +347,13 @@ class SdkRunnableLaunchPlan(
         """
         return self._sdk_workflow.id
 
+    @property
+    def sdk_workflow(self):
+        """
+        :rtype: flytekit.common.workflow.SdkWorkflow
+        """
+        return self._sdk_workflow
+
     @_exception_scopes.system_entry_point
     def __call__(self, *args, **input_map):
         """
@@ -0,0 +1,298 @@
+from __future__ import absolute_import
+
+import hashlib as _hashlib
+import logging as _logging
+import os as _os
+import shutil as _shutil
+import threading as _threading
+import uuid as _uuid
+
+import six as _six
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+from flytekit.common import constants as _constants, utils as _common_utils
+from flytekit.common.types import helpers as _type_helpers
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.models import literals as _literal_models
+
+_BLOBS_DIR = 'blobs'
+
+# Eviction removes entries until the store is this fraction of its maximum size, so that it doesn't run on every put
+# once the store is full.
+_EVICTION_TARGET = 0.8
+
+_MEMO_STORES = {}
+
+
+class LocalMemoStore(object):
+    """
+    An on-disk store of task outputs for local executions.  Outputs are keyed by the task, its discovery version and
+    a hash of its inputs, which mirrors how the platform discovers cached outputs.  Blobs and schemas that the outputs
+    reference on the local file system are copied into the store, so entries stay valid after the working directory of
+    the execution that produced them is cleaned up.
+
+    Entries are laid out as <directory>/<task name>/<discovery version>/<inputs hash>/ so that all the entries of a task
+    or of a single version of a task can be invalidated at once.  The store keeps a running total of the size of its
+    entries, which is computed once and then updated on every put.  When the total grows beyond the maximum size, the
+    least recently used entries are evicted.  Eviction scans the whole store, so it also corrects the total for entries
+    that other processes added.
+    """
+
+    def __init__(self, directory, max_size=0):
+        """
+        :param Text directory:
+        :param int max_size: Size in bytes above which least recently used entries are evicted.  0 means unbounded.
+        """
+        self._directory = directory
+        self._max_size = max_size
+        self._size = None
+        self._lock = _threading.Lock()
+
+    @property
+    def directory(self):
+        """
+        :rtype: Text
+        """
+        return self._directory
+
+    def get(self, task_name, discovery_version, inputs):
+        """
+        :param Text task_name:
+        :param Text discovery_version:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: flytekit.models.literals.LiteralMap|None
+        """
+        outputs_path = _os.path.join(
+            self._entry_directory(task_name, discovery_version, inputs),
+            _constants.OUTPUT_FILE_NAME
+        )
+        try:
+            outputs = _common_utils.load_proto_from_file(_literals_pb2.LiteralMap, outputs_path)
+            # The modification time of the outputs file tracks when the entry was last used for eviction.
+            _os.utime(outputs_path, None)
+        except (IOError, OSError):
+            return None
+        _logging.info("Found outputs of {} in the local memo store at {}.".format(task_name, outputs_path))
+        return _literal_models.LiteralMap.from_flyte_idl(outputs)
+
+    def put(self, task_name, discovery_version, inputs, outputs):
+        """
+        :param Text task_name:
+        :param Text discovery_version:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param flytekit.models.literals.LiteralMap outputs:
+        """
+        entry_directory = self._entry_directory(task_name, discovery_version, inputs)
+        if _os.path.exists(entry_directory):
+            return
+
+        # Build the entry next to its final location and move it in place at once, so that concurrent executions never
+        # read partial entries.
+        staging_directory = "{}.{}.tmp".format(entry_directory, _uuid.uuid4().hex)
+        size = 0
+        try:
+            outputs_pb = _literals_pb2.LiteralMap()
+            for k, v in _six.iteritems(outputs.literals):
+                outputs_pb.literals[k].CopyFrom(_type_helpers.hydrate_literal(v).to_flyte_idl())
+            blobs_directory = _os.path.join(staging_directory, _BLOBS_DIR)
+            for literal_pb in _six.itervalues(outputs_pb.literals):
+                _localize_blobs(literal_pb, blobs_directory, _os.path.join(entry_directory, _BLOBS_DIR))
+            _common_utils.write_proto_to_file(
+                outputs_pb,
+                _os.path.join(staging_directory, _constants.OUTPUT_FILE_NAME)
+            )
+            size = _directory_size(staging_directory)
+            _os.rename(staging_directory, entry_directory)
+        except OSError:
+            size = 0
+            # Another execution stored the same entry first.
+            if not _os.path.exists(entry_directory):
+                raise
+        finally:
+            _shutil.rmtree(staging_directory, ignore_errors=True)
+
+        if self._max_size > 0:
+            with self._lock:
+                if self._size is None:
+                    # The scan already counts the new entry.
+                    self._size = self._scan()[1]
+                else:
+                    self._size += size
+                full = self._size > self._max_size
+            if full:
+                self.evict(int(self._max_size * _EVICTION_TARGET))
+
+    def invalidate(self, task_name=None, discovery_version=None):
+        """
+        Removes entries from the store.
+        :param Text task_name: If not specified, the whole store is cleared.
+        :param Text discovery_version: If specified, only the entries of this version of the task are removed.
+        """
+        directory = self._directory
+        if task_name is not None:
+            directory = _os.path.join(directory, task_name)
+            if discovery_version is not None:
+                directory = _os.path.join(directory, _version_directory_name(discovery_version))
+        _shutil.rmtree(directory, ignore_errors=True)
+        with self._lock:
+            self._size = None
+
+    def evict(self, max_size):
+        """
+        Removes the least recently used entries until the store is no bigger than max_size.
+        :param int max_size: Size in bytes.
+        """
+        with self._lock:
+            entries, total_size = self._scan()
+            for _, size, entry_directory in sorted(entries):
+                if total_size <= max_size:
+                    break
+                _shutil.rmtree(entry_directory, ignore_errors=True)
+                total_size -= size
+            self._size = total_size
+
+    def _scan(self):
+        """
+        Lists the entries of the store.
+        :returns: The last time each entry was used, its size and its directory, and the total size of the entries.
+        :rtype: (list[(float, int, Text)], int)
+        """
+        entries = []
+        total_size = 0
+        for task_name in _list_directories(self._directory):
+            task_directory = _os.path.join(self._directory, task_name)
+            for version in _list_directories(task_directory):
+                version_directory = _os.path.join(task_directory, version)
+                for entry in _list_directories(version_directory):
+                    if entry.endswith(".tmp"):
+                        continue
+                    entry_directory = _os.path.join(version_directory, entry)
+                    try:
+                        last_used = _os.path.getmtime(_os.path.join(entry_directory, _constants.OUTPUT_FILE_NAME))
+                    except OSError:
+                        continue
+                    size = _directory_size(entry_directory)
+                    entries.append((last_used, size, entry_directory))
+                    total_size += size
+        return entries, total_size
+
+    def _entry_directory(self, task_name, discovery_version, inputs):
+        """
+        :param Text task_name:
+        :param Text discovery_version:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: Text
+        """
+        return _os.path.join(
+            self._directory,
+            task_name,
+            _version_directory_name(discovery_version),
+            hash_literal_map(inputs)
+        )
+
+
+def hash_literal_map(literal_map):
+    """
+    Computes a hash of the values in a literal map.  Offloaded literals are hashed by their contents rather than their
+    location, so equal inputs produce equal hashes regardless of where they are stored.
+    :param flytekit.models.literals.LiteralMap literal_map:
+    :rtype: Text
+    """
+    h = _hashlib.sha256()
+    for k in sorted(literal_map.literals):
+        literal_pb = _type_helpers.hydrate_literal(literal_map.literals[k]).to_flyte_idl()
+        data = literal_pb.SerializeToString(deterministic=True)
+        key = k.encode('utf-8')
+        # Prefix every field with its length so that different maps can't produce the same stream of bytes.
+        h.update("{}:{}:".format(len(key), len(data)).encode('utf-8'))
+        h.update(key)
+        h.update(data)
+    return h.hexdigest()
+
+
+def get_memo_store():
+    """
+    Returns the memo store for local executions if it is enabled in the configuration.  Stores are shared by the
+    executions of a process, so that the size of the store is only computed once.
+    :rtype: LocalMemoStore|None
+    """
+    if not _sdk_config.LOCAL_CACHE_ENABLED.get():
+        return None
+    key = (
+        _sdk_config.LOCAL_CACHE_DIRECTORY.get() or _os.path.join(_sdk_config.LOCAL_SANDBOX.get(), 'cache'),
+        _sdk_config.LOCAL_CACHE_MAX_SIZE.get()
+    )
+    if key not in _MEMO_STORES:
+        _MEMO_STORES[key] = LocalMemoStore(key[0], max_size=key[1])
+    return _MEMO_STORES[key]
+
+
+def _version_directory_name(discovery_version):
+    """
+    :param Text discovery_version:
+    :rtype: Text
+    """
+    return "version-{}".format(_six.moves.urllib.parse.quote(discovery_version or "", safe=""))
+
+
+def _is_local_path(uri):
+    """
+    :param Text uri:
+    :rtype: bool
+    """
+    return "://" not in uri and _os.path.exists(uri)
+
+
+def _localize_blobs(literal_pb, local_directory, store_directory):
+    """
+    Copies the files of blobs and schemas that are stored on the local file system to local_directory and points the
+    literal at their final location under store_directory.
+    :param flyteidl.core.literals_pb2.Literal literal_pb:
+    :param Text local_directory:
+    :param Text store_directory:
+    """
+    kind = literal_pb.WhichOneof('value')
+    if kind == 'collection':
+        for sub_literal in literal_pb.collection.literals:
+            _localize_blobs(sub_literal, local_directory, store_directory)
+    elif kind == 'map':
+        for sub_literal in _six.itervalues(literal_pb.map.literals):
+            _localize_blobs(sub_literal, local_directory, store_directory)
+    elif kind == 'scalar' and literal_pb.scalar.WhichOneof('value') in ('blob', 'schema'):
+        reference = getattr(literal_pb.scalar, literal_pb.scalar.WhichOneof('value'))
+        if not _is_local_path(reference.uri):
+            return
+        name = "{}-{}".format(_uuid.uuid4().hex, _os.path.basename(reference.uri.rstrip(_os.sep)))
+        if _os.path.isdir(reference.uri):
+            _shutil.copytree(reference.uri, _os.path.join(local_directory, name))
+        else:
+            if not _os.path.exists(local_directory):
+                _os.makedirs(local_directory)
+            _shutil.copy2(reference.uri, _os.path.join(local_directory, name))
+        reference.uri = _os.path.join(store_directory, name)
+
+
+def _list_directories(directory):
+    """
+    :param Text directory:
+    :rtype: list[Text]
+    """
+    try:
+        return [name for name in _os.listdir(directory) if _os.path.isdir(_os.path.join(directory, name))]
+    except OSError:
+        return []
+
+
+def _directory_size(directory):
+    """
+    :param Text directory:
+    :rtype: int
+    """
+    size = 0
+    for root, _, file_names in _os.walk(directory):
+        for file_name in file_names:
+            try:
+                size += _os.path.getsize(_os.path.join(root, file_name))
+            except OSError:
+                pass
+    return size
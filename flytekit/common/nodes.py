@@ -4,14 +4,15 @@ import abc as _abc
 import six as _six
 from sortedcontainers import SortedDict as _SortedDict
 
-from flytekit.common import sdk_bases as _sdk_bases, promise as _promise
+from flytekit.common import constants as _constants, sdk_bases as _sdk_bases, promise as _promise
 from flytekit.common.exceptions import scopes as _exception_scopes, user as _user_exceptions
 from flytekit.common.mixins import hash as _hash_mixin, artifact as _artifact_mixin
 from flytekit.common.tasks import executions as _task_executions
 from flytekit.common.types import helpers as _type_helpers
 from flytekit.common.utils import _dnsify
 from flytekit.engines import loader as _engine_loader
-from flytekit.models import common as _common_models, node_execution as _node_execution_models
+from flytekit.models import common as _common_models, literals as _literal_models, \
+    node_execution as _node_execution_models
 from flytekit.models.core import workflow as _workflow_model, execution as _execution_models
 
 
@@ -93,6 +94,19 @@ class OutputParameterMapper(ParameterMapper):
         return _promise.NodeOutput(sdk_node, sdk_type, name)
 
 
+class MappedOutputParameterMapper(ParameterMapper):
+    """
+    This subclass of ParameterMapper is used to represent outputs for a map node.
+    """
+    def _return_mapping_object(self, sdk_node, sdk_type, name):
+        """
+        :param SdkMapNode sdk_node:
+        :param flytekit.common.types.FlyteSdkType sdk_type:
+        :param Text name:
+        """
+        return _promise.MappedNodeOutput(sdk_node, sdk_type, name)
+
+
 class SdkTaskNode(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _workflow_model.TaskNode)):
 
     def __init__(self, sdk_task):
@@ -287,6 +301,141 @@ class SdkNode(_six.with_metaclass(_sdk_bases.ExtendedSdkType,  _hash_mixin.HashO
         return "Node({})".format(self._executable_sdk_object)
 
 
+class SdkMapNode(object):
+    """
+    Maps a task over a list of values in a dynamic task.  The node compiles to a single array job, with a sub-task for
+    every value, and each of its outputs gathers the outputs of the sub-tasks into a list.  Unlike yielding a node for
+    every value, no nodes, promises or bindings are created per value.
+
+    .. code-block:: python
+
+        @dynamic_task
+        def my_task(wf_params, values, out):
+            squares = map_task(square, over=values)
+            yield squares
+            out.set(squares.outputs.out)
+    """
+
+    def __init__(self, sdk_task, over, inputs=None):
+        """
+        :param flytekit.common.tasks.task.SdkTask sdk_task:
+        :param list[T] over: The values of the input the task is mapped over.
+        :param dict[Text, T] inputs: The values of the other inputs of the task, which are the same for every sub-task.
+        """
+        if sdk_task.type != _constants.SdkTaskType.PYTHON_TASK:
+            raise _user_exceptions.FlyteAssertion(
+                "Only python tasks can be mapped over a list of values, {} is a {}.".format(sdk_task, sdk_task.type)
+            )
+        inputs = inputs or {}
+        unbound = [name for name in sdk_task.interface.inputs if name not in inputs]
+        if len(unbound) != 1:
+            raise _user_exceptions.FlyteAssertion(
+                "A task can only be mapped over a single input, but {} inputs of {} are not bound: {}.  Bind all the "
+                "other inputs with kwargs.".format(len(unbound), sdk_task, unbound)
+            )
+        for name, value in _six.iteritems(dict(inputs, **{unbound[0]: over})):
+            if isinstance(value, (_promise.Input, _promise.NodeOutput)):
+                raise _user_exceptions.FlyteAssertion(
+                    "The input {} of a map node must be a value, not the promise {}.  The values a task is mapped "
+                    "over must be known when the map node is created.".format(name, value)
+                )
+
+        self._id = None
+        self._sdk_task = sdk_task
+        self._mapped_input = unbound[0]
+        self._mapped_type = _type_helpers.get_sdk_type_from_literal_type(sdk_task.interface.inputs[unbound[0]].type)
+        self._over = list(over)
+        # The inputs all the sub-tasks share are converted once.
+        self._literals = {
+            name: _type_helpers.get_sdk_type_from_literal_type(sdk_task.interface.inputs[name].type).from_python_std(
+                value)
+            for name, value in _six.iteritems(inputs)
+        }
+        self._metadata = _workflow_model.NodeMetadata(
+            "DEADBEEF", sdk_task.metadata.timeout, sdk_task.metadata.retries)
+        # Like the node of an array job of yielded sub-tasks, the node of the map node binds the inputs of its first
+        # sub-task.
+        self._bindings = []
+        if self._over:
+            bindings, _ = sdk_task.interface.create_bindings_for_inputs(dict(inputs, **{unbound[0]: self._over[0]}))
+            self._bindings = sorted(bindings, key=lambda b: b.var)
+        self._outputs = MappedOutputParameterMapper(sdk_task.interface.outputs, self)
+
+    @property
+    def id(self):
+        """
+        :rtype: Text
+        """
+        return self._id
+
+    @property
+    def executable_sdk_object(self):
+        """
+        :rtype: flytekit.common.tasks.task.SdkTask
+        """
+        return self._sdk_task
+
+    @property
+    def inputs(self):
+        """
+        :rtype: list[flytekit.models.literals.Binding]
+        """
+        return self._bindings
+
+    @property
+    def mapped_input(self):
+        """
+        The name of the input the task is mapped over.
+        :rtype: Text
+        """
+        return self._mapped_input
+
+    @property
+    def metadata(self):
+        """
+        :rtype: flytekit.models.core.workflow.NodeMetadata
+        """
+        return self._metadata
+
+    @property
+    def outputs(self):
+        """
+        :rtype: dict[Text, flytekit.common.promise.MappedNodeOutput]
+        """
+        return self._outputs
+
+    def __len__(self):
+        return len(self._over)
+
+    def assign_id_and_return(self, id):
+        """
+        :param Text id:
+        :rtype: SdkMapNode
+        """
+        if self.id:
+            raise _user_exceptions.FlyteAssertion(
+                "Error assigning ID: {} because {} is already assigned.".format(id, self)
+            )
+        self._id = _dnsify(id) if id else None
+        return self
+
+    def iter_inputs(self):
+        """
+        Produces the inputs of the sub-tasks one at a time, so that they needn't all be in memory at once.
+        :rtype: collections.Iterator[flytekit.models.literals.LiteralMap]
+        """
+        for value in self._over:
+            literals = dict(self._literals)
+            literals[self._mapped_input] = self._mapped_type.from_python_std(value)
+            yield _literal_models.LiteralMap(literals=literals)
+
+    def __repr__(self):
+        """
+        :rtype: Text
+        """
+        return "MapNode({} over {} values)".format(self._sdk_task, len(self))
+
+
 class SdkNodeExecution(
     _six.with_metaclass(
         _sdk_bases.ExtendedSdkType,
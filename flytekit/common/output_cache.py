@@ -0,0 +1,127 @@
+from __future__ import absolute_import
+
+import logging as _logging
+import os as _os
+import traceback as _traceback
+import uuid as _uuid
+
+from flytekit.common import constants as _constants, local_cache as _local_cache, utils as _common_utils
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.interfaces.data import data_proxy as _data_proxy
+
+
+class OutputCache(object):
+    """
+    A cache of the outputs of tasks in remote storage, which pyflyte-execute consults before running the user code of
+    the sub-tasks of array jobs.  Outputs are keyed by the task, its discovery version and a hash of the contents of its
+    inputs, and laid out as <prefix>/<task name>/<discovery version>/<inputs hash>/outputs.pb like the entries of the
+    local memo store.
+
+    An entry is a single file that is only written once the task succeeded.  Object stores make a file visible all at
+    once, and files under local prefixes are moved in place, so concurrent executions never read partial entries.  The
+    cache is only an optimization, so failing to read or write it is logged and otherwise ignored.
+    """
+
+    def __init__(self, prefix, task_name, discovery_version):
+        """
+        :param Text prefix:
+        :param Text task_name:
+        :param Text discovery_version:
+        """
+        self._prefix = prefix
+        self._task_name = task_name
+        self._discovery_version = discovery_version
+
+    @classmethod
+    def from_config(cls, task_def, task_name):
+        """
+        :param flytekit.common.tasks.task.SdkTask task_def:
+        :param Text task_name: The name the outputs of the task are cached under.
+        :returns: The cache of the task, or None if the outputs of the task aren't cached.
+        :rtype: OutputCache
+        """
+        prefix = _sdk_config.OUTPUT_CACHE_PREFIX.get()
+        if not prefix or not task_def.metadata.discoverable:
+            return None
+        return cls(prefix, task_name, task_def.metadata.discovery_version)
+
+    def entry_path(self, inputs):
+        """
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: Text
+        """
+        return _os.path.join(
+            self._prefix,
+            self._task_name,
+            _local_cache._version_directory_name(self._discovery_version),
+            _local_cache.hash_literal_map(inputs),
+            _constants.OUTPUT_FILE_NAME
+        )
+
+    def fetch(self, inputs, output_prefix):
+        """
+        Copies the cached outputs of the task to output_prefix.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param Text output_prefix:
+        :returns: Whether the outputs were in the cache.
+        :rtype: bool
+        """
+        try:
+            return self._fetch(inputs, output_prefix)
+        except Exception:
+            _logging.warning("Could not read the output cache of {}:\n{}".format(
+                self._task_name, _traceback.format_exc()))
+            return False
+
+    def store(self, inputs, output_prefix):
+        """
+        Caches the outputs the task wrote to output_prefix, if it succeeded.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param Text output_prefix:
+        :returns: Whether the outputs were cached.
+        :rtype: bool
+        """
+        try:
+            return self._store(inputs, output_prefix)
+        except Exception:
+            _logging.warning("Could not write the output cache of {}:\n{}".format(
+                self._task_name, _traceback.format_exc()))
+            return False
+
+    def _fetch(self, inputs, output_prefix):
+        """
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param Text output_prefix:
+        :rtype: bool
+        """
+        entry_path = self.entry_path(inputs)
+        if not _data_proxy.Data.data_exists(entry_path):
+            return False
+        with _common_utils.AutoDeletingTempDir('cached_outputs') as local_dir:
+            local_path = local_dir.get_named_tempfile(_constants.OUTPUT_FILE_NAME)
+            _data_proxy.Data.get_data(entry_path, local_path)
+            _data_proxy.Data.put_data(local_path, _os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME))
+        _logging.info("Copied the cached outputs of {} from {}.".format(self._task_name, entry_path))
+        return True
+
+    def _store(self, inputs, output_prefix):
+        """
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param Text output_prefix:
+        :rtype: bool
+        """
+        outputs_path = _os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME)
+        if _data_proxy.Data.data_exists(_os.path.join(output_prefix, _constants.ERROR_FILE_NAME)) or \
+                not _data_proxy.Data.data_exists(outputs_path):
+            return False
+        entry_path = self.entry_path(inputs)
+        with _common_utils.AutoDeletingTempDir('cached_outputs') as local_dir:
+            local_path = local_dir.get_named_tempfile(_constants.OUTPUT_FILE_NAME)
+            _data_proxy.Data.get_data(outputs_path, local_path)
+            if "://" in entry_path:
+                _data_proxy.Data.put_data(local_path, entry_path)
+            else:
+                staging_path = "{}.{}.tmp".format(entry_path, _uuid.uuid4().hex)
+                _data_proxy.Data.put_data(local_path, staging_path)
+                _os.rename(staging_path, entry_path)
+        return True
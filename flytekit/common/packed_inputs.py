@@ -0,0 +1,130 @@
+from __future__ import absolute_import
+
+import os as _os
+import struct as _struct
+
+from flyteidl.core import literals_pb2 as _literals_pb2
+from six import moves as _six_moves
+
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.models import literals as _literal_models
+
+# The file starts with a header holding a magic number and the number of literal maps, followed by an offset table and
+# the serialized literal maps.  The offset table holds the absolute offset of every literal map and the size of the
+# file, so literal map i is stored between offsets i and i + 1.  All integers are unsigned 64-bit little endian.
+_MAGIC = b'FLYTEPK\x01'
+_HEADER = _struct.Struct('<8sQ')
+_OFFSET = _struct.Struct('<Q')
+
+
+class PackedLiteralMaps(object):
+    """
+    The inputs of the sub-tasks of an array job, packed into a single file with an offset table so that each sub-task
+    can read its own inputs without reading the whole file.
+    """
+
+    def __init__(self, literal_maps=None):
+        """
+        :param list[flytekit.models.literals.LiteralMap] literal_maps:
+        """
+        # Literal maps are serialized as they are added, which takes a fraction of the memory of the models.
+        self._serialized = [m.to_flyte_idl().SerializeToString() for m in literal_maps or []]
+
+    @property
+    def literal_maps(self):
+        """
+        :rtype: list[flytekit.models.literals.LiteralMap]
+        """
+        return [_parse_literal_map(s) for s in self._serialized]
+
+    def append(self, literal_map):
+        """
+        :param flytekit.models.literals.LiteralMap literal_map:
+        """
+        self._serialized.append(literal_map.to_flyte_idl().SerializeToString())
+
+    def __len__(self):
+        return len(self._serialized)
+
+    def to_bytes(self):
+        """
+        :rtype: bytes
+        """
+        offsets = [_HEADER.size + _OFFSET.size * (len(self._serialized) + 1)]
+        for s in self._serialized:
+            offsets.append(offsets[-1] + len(s))
+        return b''.join(
+            [_HEADER.pack(_MAGIC, len(self._serialized)), _struct.pack('<{}Q'.format(len(offsets)), *offsets)] +
+            self._serialized
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        :param bytes data:
+        :rtype: PackedLiteralMaps
+        """
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise _system_exceptions.FlyteSystemAssertion("The inputs are not a packed inputs file.")
+        offsets = _struct.unpack_from('<{}Q'.format(count + 1), data, _HEADER.size)
+        packed = cls()
+        packed._serialized = [data[offsets[i]:offsets[i + 1]] for i in _six_moves.range(count)]
+        return packed
+
+    def write(self, path):
+        """
+        :param Text path:
+        """
+        directory = _os.path.dirname(path)
+        if directory and not _os.path.exists(directory):
+            _os.makedirs(directory)
+        with open(path, 'wb') as w:
+            w.write(self.to_bytes())
+
+    @classmethod
+    def read(cls, path):
+        """
+        :param Text path:
+        :rtype: PackedLiteralMaps
+        """
+        with open(path, 'rb') as r:
+            return cls.from_bytes(r.read())
+
+
+def _parse_literal_map(serialized):
+    """
+    :param bytes serialized:
+    :rtype: flytekit.models.literals.LiteralMap
+    """
+    pb = _literals_pb2.LiteralMap()
+    pb.ParseFromString(serialized)
+    return _literal_models.LiteralMap.from_flyte_idl(pb)
+
+
+def fetch_inputs(packed_path, index, local_path):
+    """
+    Downloads the inputs of one sub-task from a packed inputs file, which takes two ranged reads: one for the offsets
+    of the inputs and one for the inputs themselves.
+
+    :param Text packed_path: The packed inputs file, which can be remote.
+    :param int index: The index of the sub-task.
+    :param Text local_path: Where to write the inputs of the sub-task, as a serialized LiteralMap.
+    """
+    # The data proxy is only needed to execute sub-tasks, not to declare or plan them.
+    from flytekit.interfaces.data import data_proxy as _data_proxy
+    offsets_start = _HEADER.size + _OFFSET.size * index
+    offsets_end = offsets_start + 2 * _OFFSET.size
+    _data_proxy.Data.get_data_range(packed_path, local_path, offsets_start, offsets_end)
+    with open(local_path, 'rb') as r:
+        offsets = r.read()
+    start, end = _struct.unpack('<2Q', offsets) if len(offsets) == 2 * _OFFSET.size else (0, 0)
+    # The number of literal maps is not read, to save a request, so an index past the end reads into the literal maps
+    # rather than the offset table, which the checks below catch.
+    if start < offsets_end or end < start:
+        raise _system_exceptions.FlyteSystemAssertion(
+            "The packed inputs file {} doesn't hold inputs for index {}.".format(packed_path, index))
+    _data_proxy.Data.get_data_range(packed_path, local_path, start, end)
+    if _os.path.getsize(local_path) != end - start:
+        raise _system_exceptions.FlyteSystemAssertion(
+            "The packed inputs file {} doesn't hold inputs for index {}.".format(packed_path, index))
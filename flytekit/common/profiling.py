@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import cProfile as _cProfile
+import logging as _logging
+import os as _os
+import pstats as _pstats
+
+from flytekit.configuration import sdk as _sdk_config
+
+try:
+    import tracemalloc as _tracemalloc
+except ImportError:
+    # tracemalloc is only part of the standard library as of Python 3.4.
+    _tracemalloc = None
+
+CPU_PROFILE_FILE_NAME = 'cpu.prof'
+CPU_SUMMARY_FILE_NAME = 'cpu.txt'
+MEMORY_SUMMARY_FILE_NAME = 'memory.txt'
+
+_SUMMARY_LENGTH = 50
+
+
+class UserCodeProfiler(object):
+    """
+    Profiles the code executed while it is entered and writes the results to a directory when it exits.  The CPU
+    profile is a cProfile dump that pstats and the usual visualization tools can read, along with a summary of the
+    functions with the highest cumulative time.  The memory summary holds the peak of the memory allocated by Python
+    code and the lines that hold the most memory when the profiler exits.
+
+    Only the thread that enters the profiler is CPU profiled.  Memory is tracked for all threads.
+    """
+
+    def __init__(self, directory, cpu=False, memory=False):
+        """
+        :param Text directory: Where to write the results.
+        :param bool cpu: Whether to profile CPU usage.
+        :param bool memory: Whether to track memory allocations.
+        """
+        self._directory = directory
+        self._cpu_profiler = _cProfile.Profile() if cpu else None
+        self._memory = memory
+        if memory and _tracemalloc is None:
+            _logging.warning("Memory profiling requires tracemalloc, which isn't available in this version of Python.")
+            self._memory = False
+
+    @classmethod
+    def from_config(cls, directory):
+        """
+        :param Text directory: Where to write the results.
+        :returns: A profiler, or None if profiling isn't enabled.
+        :rtype: UserCodeProfiler
+        """
+        cpu = _sdk_config.PROFILE_CPU.get()
+        memory = _sdk_config.PROFILE_MEMORY.get()
+        if not cpu and not memory:
+            return None
+        return cls(directory, cpu=cpu, memory=memory)
+
+    def __enter__(self):
+        if self._memory:
+            _tracemalloc.start()
+        if self._cpu_profiler is not None:
+            self._cpu_profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._cpu_profiler is not None:
+            self._cpu_profiler.disable()
+        snapshot = None
+        if self._memory:
+            _, peak = _tracemalloc.get_traced_memory()
+            snapshot = _tracemalloc.take_snapshot()
+            _tracemalloc.stop()
+
+        if not _os.path.exists(self._directory):
+            _os.makedirs(self._directory)
+        if self._cpu_profiler is not None:
+            self._cpu_profiler.dump_stats(_os.path.join(self._directory, CPU_PROFILE_FILE_NAME))
+            with open(_os.path.join(self._directory, CPU_SUMMARY_FILE_NAME), 'w') as f:
+                _pstats.Stats(self._cpu_profiler, stream=f).sort_stats('cumulative').print_stats(_SUMMARY_LENGTH)
+        if snapshot is not None:
+            _logging.info("Peak memory allocated by Python code: {} bytes".format(peak))
+            with open(_os.path.join(self._directory, MEMORY_SUMMARY_FILE_NAME), 'w') as f:
+                f.write("Peak memory allocated: {} bytes\n\n".format(peak))
+                f.write("Top {} lines by memory held at exit:\n".format(_SUMMARY_LENGTH))
+                for stat in snapshot.statistics('lineno')[:_SUMMARY_LENGTH]:
+                    f.write("{}\n".format(stat))
+        _logging.info("Wrote the profiles of the task to {}".format(self._directory))
@@ -4,7 +4,7 @@ import six as _six
 
 from flytekit.common import constants as _constants, sdk_bases as _sdk_bases
 from flytekit.common.exceptions import user as _user_exceptions
-from flytekit.common.types import helpers as _type_helpers
+from flytekit.common.types import containers as _containers, helpers as _type_helpers
 from flytekit.models import interface as _interface_models, types as _type_models
 
 
@@ -167,6 +167,13 @@ class NodeOutput(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _type_models.Ou
         """
         return self._node
 
+    @sdk_node.setter
+    def sdk_node(self, sdk_node):
+        """
+        :param flytekit.common.nodes.SdkNode sdk_node:
+        """
+        self._node = sdk_node
+
     @property
     def sdk_type(self):
         """
@@ -176,3 +183,33 @@ class NodeOutput(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _type_models.Ou
 
     def __repr__(self):
         return "NodeOutput({}:{})".format(self.sdk_node, self.var)
+
+
+class MappedNodeOutput(NodeOutput):
+    """
+    An output of a map node: the outputs of all the sub-tasks of the node, gathered into a list.  The promises for the
+    outputs of the individual sub-tasks are only created when the output is bound.
+    """
+
+    def __init__(self, sdk_node, sdk_type, var):
+        """
+        :param flytekit.common.nodes.SdkMapNode sdk_node:
+        :param flytekit.common.types.FlyteSdkType sdk_type: The type of the output of a single sub-task.
+        :param Text var:
+        """
+        self._sub_type = sdk_type
+        super(MappedNodeOutput, self).__init__(sdk_node, _containers.List(sdk_type), var)
+
+    def __len__(self):
+        return len(self.sdk_node)
+
+    def element(self, index):
+        """
+        :param int index:
+        :returns: The output of the sub-task at index.
+        :rtype: NodeOutput
+        """
+        return NodeOutput(self.sdk_node, self._sub_type, "[{}].{}".format(index, self.var))
+
+    def __repr__(self):
+        return "MappedNodeOutput({}:{})".format(self.sdk_node, self.var)
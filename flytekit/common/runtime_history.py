@@ -0,0 +1,259 @@
+from __future__ import absolute_import
+
+import fcntl as _fcntl
+import logging as _logging
+import math as _math
+import os as _os
+import uuid as _uuid
+
+import six as _six
+
+from flytekit.common import local_cache as _local_cache
+from flytekit.configuration import sdk as _sdk_config
+
+_RUNTIMES_FILE_NAME = 'runtimes'
+_LOCK_FILE_NAME = 'runtimes.lock'
+
+# A sub-task is a straggler if it is expected to run this many times longer than the typical sub-task of its task.
+_STRAGGLER_FACTOR = 4.0
+
+
+class RuntimeHistory(object):
+    """
+    An on-disk record of how long the user code of python tasks ran, keyed by the task, its version and a hash of its
+    inputs.  The runtimes of a version of a task are appended to <directory>/<task name>/<version>/runtimes, one line
+    per execution, so that concurrent executions can record their runtimes without coordinating.  Appends share a lock
+    that compaction takes exclusively, so that records aren't lost when the file is replaced.
+
+    Only executions that can write to the directory are recorded, so the history is most useful for local executions
+    or when the directory is on a file system shared by the containers of an execution.  Failing to write to the history
+    never fails an execution.
+    """
+
+    def __init__(self, directory):
+        """
+        :param Text directory:
+        """
+        self._directory = directory
+
+    @property
+    def directory(self):
+        """
+        :rtype: Text
+        """
+        return self._directory
+
+    def record(self, task_name, version, inputs, seconds):
+        """
+        :param Text task_name:
+        :param Text version:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param float seconds:
+        """
+        path = self._runtimes_path(task_name, version)
+        try:
+            try:
+                if not _os.path.exists(_os.path.dirname(path)):
+                    _os.makedirs(_os.path.dirname(path))
+            except OSError:
+                # Another execution created the directory first.
+                pass
+            with open(_os.path.join(_os.path.dirname(path), _LOCK_FILE_NAME), 'a') as lock:
+                _fcntl.flock(lock, _fcntl.LOCK_SH)
+                # A single short write to a file opened for appending doesn't interleave with the writes of other
+                # processes.
+                with open(path, 'a') as f:
+                    f.write("{} {!r}\n".format(_local_cache.hash_literal_map(inputs), seconds))
+        except (IOError, OSError) as e:
+            _logging.warning("Could not record the runtime of {} in {}: {}".format(task_name, path, e))
+
+    def load(self, task_name, version):
+        """
+        Reads the latest runtime recorded for each of the inputs a version of a task was executed with.  Superseded
+        runtimes are dropped from the file once they make up most of it.
+
+        :param Text task_name:
+        :param Text version:
+        :rtype: dict[Text, float]
+        """
+        path = self._runtimes_path(task_name, version)
+        try:
+            runtimes, lines = _read_runtimes(path)
+        except (IOError, OSError):
+            return {}
+        if lines > 2 * len(runtimes):
+            try:
+                self._compact(path)
+            except (IOError, OSError) as e:
+                _logging.warning("Could not compact the runtimes of {} in {}: {}".format(task_name, path, e))
+        return runtimes
+
+    def _compact(self, path):
+        """
+        Rewrites the runtimes file with the latest runtime of each of the inputs.  Records are appended under a shared
+        lock, so holding the lock exclusively guarantees that none of them are written to the file being replaced.  If
+        another execution holds the lock, compaction is left to a later load.
+
+        :param Text path:
+        """
+        with open(_os.path.join(_os.path.dirname(path), _LOCK_FILE_NAME), 'a') as lock:
+            try:
+                _fcntl.flock(lock, _fcntl.LOCK_EX | _fcntl.LOCK_NB)
+            except (IOError, OSError):
+                return
+            runtimes, _ = _read_runtimes(path)
+            compacted_path = "{}.{}.tmp".format(path, _uuid.uuid4().hex)
+            try:
+                with open(compacted_path, 'w') as f:
+                    f.writelines("{} {!r}\n".format(k, v) for k, v in _six.iteritems(runtimes))
+                _os.rename(compacted_path, path)
+            finally:
+                if _os.path.exists(compacted_path):
+                    _os.remove(compacted_path)
+
+    def _runtimes_path(self, task_name, version):
+        """
+        :param Text task_name:
+        :param Text version:
+        :rtype: Text
+        """
+        return _os.path.join(
+            self._directory,
+            task_name,
+            _local_cache._version_directory_name(version),
+            _RUNTIMES_FILE_NAME
+        )
+
+
+def _read_runtimes(path):
+    """
+    :param Text path:
+    :returns: The latest runtime of each of the inputs in the runtimes file, and the number of lines in the file.
+    :rtype: (dict[Text, float], int)
+    """
+    runtimes = {}
+    lines = 0
+    with open(path) as f:
+        for line in f:
+            lines += 1
+            fields = line.split()
+            if len(fields) != 2:
+                # An execution is writing the line.
+                continue
+            try:
+                runtimes[fields[0]] = float(fields[1])
+            except ValueError:
+                continue
+    return runtimes, lines
+
+
+class ArrayJobPlanner(object):
+    """
+    Plans the array jobs of a dynamic task from the runtimes its sub-tasks had in earlier executions.
+
+    Sub-tasks that are expected to run much longer than is typical for their task are stragglers.  They are moved to an
+    array job of their own, which starts along with the array job of the other sub-tasks rather than leaving a few slow
+    sub-tasks to run at the end of a single array job.  The parallelism of each array job is the lowest that is expected
+    to complete it in the time its task's longest sub-task takes, since more concurrency can't complete it any sooner.
+    """
+
+    def __init__(self, history):
+        """
+        :param RuntimeHistory history:
+        """
+        self._history = history
+        # Tasks are keyed by their identity, which is cheaper than hashing them.  The tasks are held on to so that their
+        # identities aren't reused.
+        self._task_runtimes = {}
+        # The total and longest expected runtimes of the sub-tasks of every array job, keyed by the identity of the task
+        # and whether the array job holds stragglers.
+        self._array_runtimes = {}
+
+    @classmethod
+    def from_config(cls):
+        """
+        :returns: A planner, or None if the runtime history isn't enabled.
+        :rtype: ArrayJobPlanner
+        """
+        history = get_runtime_history()
+        return cls(history) if history is not None else None
+
+    def add(self, task, inputs):
+        """
+        Adds a sub-task to the plan.
+
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :returns: Whether the sub-task is a straggler.
+        :rtype: bool
+        """
+        runtimes, typical = self._runtimes(task)
+        if typical is None:
+            return False
+        estimate = runtimes.get(_local_cache.hash_literal_map(inputs), typical)
+        straggler = estimate > _STRAGGLER_FACTOR * typical
+        total, longest = self._array_runtimes.get((id(task), straggler), (0.0, 0.0))
+        self._array_runtimes[(id(task), straggler)] = (total + estimate, max(longest, estimate))
+        return straggler
+
+    def parallelism(self, task, stragglers, max_concurrency=None, batch_size=None):
+        """
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param bool stragglers: Whether to plan the array job of the stragglers of the task.
+        :param int max_concurrency: An upper bound for the parallelism.
+        :param int batch_size: The number of sub-tasks each container of the array job executes.
+        :returns: The parallelism of the array job, or 0 if there is nothing to plan it from.
+        :rtype: int
+        """
+        total, _ = self._array_runtimes.get((id(task), stragglers), (0.0, 0.0))
+        longest = max(self._array_runtimes.get((id(task), s), (0.0, 0.0))[1] for s in (False, True))
+        if total <= 0 or longest <= 0:
+            return max_concurrency or 0
+        parallelism = int(_math.ceil(total / longest))
+        if batch_size and batch_size > 1:
+            parallelism = int(_math.ceil(parallelism / float(batch_size)))
+        if max_concurrency:
+            parallelism = min(parallelism, max_concurrency)
+        return parallelism
+
+    def _runtimes(self, task):
+        """
+        :param flytekit.common.tasks.task.SdkTask task:
+        :returns: The recorded runtimes of the task and the median of them.
+        :rtype: (dict[Text, float], float)
+        """
+        if id(task) not in self._task_runtimes:
+            runtimes, typical = {}, None
+            task_name = get_task_name(task)
+            if task_name is not None:
+                runtimes = self._history.load(task_name, task.id.version)
+            if runtimes:
+                ordered = sorted(_six.itervalues(runtimes))
+                typical = ordered[len(ordered) // 2]
+                _logging.info("Planning the sub-tasks of {} from {} recorded runtimes.".format(task_name, len(ordered)))
+            self._task_runtimes[id(task)] = (task, runtimes, typical)
+        return self._task_runtimes[id(task)][1:]
+
+
+def get_task_name(task):
+    """
+    :param flytekit.common.tasks.task.SdkTask task:
+    :returns: The name runtimes of the task are recorded under, or None if the task isn't defined by a python function.
+    :rtype: Text
+    """
+    task_module = getattr(task, 'task_module', None)
+    if task_module is None:
+        return None
+    return "{}.{}".format(task_module, task.task_function_name)
+
+
+def get_runtime_history():
+    """
+    Returns the runtime history if it is enabled in the configuration.
+    :rtype: RuntimeHistory|None
+    """
+    if not _sdk_config.RUNTIME_HISTORY_ENABLED.get():
+        return None
+    return RuntimeHistory(
+        _sdk_config.RUNTIME_HISTORY_DIRECTORY.get() or _os.path.join(_sdk_config.LOCAL_SANDBOX.get(), 'runtimes')
+    )
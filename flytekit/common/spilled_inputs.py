@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+
+import os as _os
+import shutil as _shutil
+
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+from flytekit.common import utils as _common_utils
+from flytekit.models import literals as _literal_models
+
+
+class SpilledLiteralMap(object):
+    """
+    A literal map that was written to a local file as soon as it was produced, so that it isn't held in memory until
+    the files generated by a task are written.
+    """
+
+    def __init__(self, path):
+        """
+        :param Text path: The local file holding the serialized literal map.
+        """
+        self._path = path
+
+    @property
+    def path(self):
+        """
+        :rtype: Text
+        """
+        return self._path
+
+    @classmethod
+    def spill(cls, literal_map, path):
+        """
+        :param flytekit.models.literals.LiteralMap literal_map:
+        :param Text path: Where to write the literal map.
+        :rtype: SpilledLiteralMap
+        """
+        _common_utils.write_proto_to_file(literal_map.to_flyte_idl(), path)
+        return cls(path)
+
+    def load(self):
+        """
+        :rtype: flytekit.models.literals.LiteralMap
+        """
+        return _literal_models.LiteralMap.from_flyte_idl(
+            _common_utils.load_proto_from_file(_literals_pb2.LiteralMap, self._path)
+        )
+
+    def write(self, path):
+        """
+        Moves the file holding the literal map to path.
+        :param Text path:
+        """
+        directory = _os.path.dirname(path)
+        if directory and not _os.path.exists(directory):
+            _os.makedirs(directory)
+        _shutil.move(self._path, path)
+        self._path = path
@@ -1,16 +1,23 @@
 from __future__ import absolute_import
 
+import collections as _collections
+import copy as _copy
 import os as _os
 
 import itertools as _itertools
 import math
+import weakref as _weakref
 import six as _six
 
-from flytekit.common import constants as _constants, interface as _interface, sdk_bases as _sdk_bases
-from flytekit.common.exceptions import scopes as _exception_scopes
+from flytekit.common import constants as _constants, interface as _interface, local_cache as _local_cache, \
+    nodes as _nodes, packed_inputs as _packed_inputs, runtime_history as _runtime_history, sdk_bases as _sdk_bases, \
+    spilled_inputs as _spilled_inputs, tracing as _tracing
+from flytekit.common.core import identifier as _identifier
+from flytekit.common.exceptions import scopes as _exception_scopes, user as _user_exceptions
 from flytekit.common.tasks import output as _task_output, sdk_runnable as _sdk_runnable
 from flytekit.common.types import helpers as _type_helpers
 from flytekit.common.utils import _dnsify
+from flytekit.configuration import sdk as _sdk_config
 from flytekit.models import literals as _literal_models, dynamic_job as _dynamic_job, array_job as _array_job
 
 
@@ -34,6 +41,21 @@ class PromiseOutputReference(_task_output.OutputReference):
         self._raw_value = value
 
 
+def _add_promise_node_ids(binding_data, node_ids):
+    """
+    Collects the ids of the nodes whose outputs are referenced by binding data.
+    :param collections.Iterable[flytekit.models.literals.BindingData] binding_data:
+    :param set[Text] node_ids:
+    """
+    for b in binding_data:
+        if b.promise is not None:
+            node_ids.add(b.promise.node_id)
+        elif b.collection is not None:
+            _add_promise_node_ids(b.collection.bindings, node_ids)
+        elif b.map is not None:
+            _add_promise_node_ids(_six.itervalues(b.map.bindings), node_ids)
+
+
 class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnable.SdkRunnableTask)):
     """
     This class includes the additional logic for building a task that executes parent-child tasks in Python code.  It
@@ -63,7 +85,10 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
             allowed_failure_ratio,
             max_concurrency,
             environment,
-            custom
+            custom,
+            array_batch_size=None,
+            deduplicate_sub_tasks=False,
+            offload_large_literals=False
     ):
         """
         :param task_function: Function container user code.  This will be executed via the SDK's engine.
@@ -85,15 +110,21 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
         :param int max_concurrency:
         :param dict[Text, Text] environment:
         :param dict[Text, T] custom:
+        :param int array_batch_size: The number of sub-tasks each container of an array job executes.
+        :param bool deduplicate_sub_tasks: Whether invocations of the same task with the same inputs run only once.
+        :param bool offload_large_literals: Whether large literals of the outputs and sub-task inputs are offloaded.
         """
         super(SdkDynamicTask, self).__init__(
             task_function, task_type, discovery_version, retries, deprecated,
             storage_request, cpu_request, gpu_request, memory_request, storage_limit,
-            cpu_limit, gpu_limit, memory_limit, discoverable, timeout, environment, custom)
+            cpu_limit, gpu_limit, memory_limit, discoverable, timeout, environment, custom,
+            offload_large_literals=offload_large_literals)
 
         # These will only appear in the generated futures
         self._allowed_failure_ratio = allowed_failure_ratio
         self._max_concurrency = max_concurrency
+        self._array_batch_size = array_batch_size
+        self._deduplicate_sub_tasks = deduplicate_sub_tasks
 
     def _create_array_job(self, inputs_prefix):
         """
@@ -105,6 +136,181 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
                                    size=1,
                                    min_successes=1)
 
+    def _batch_size(self, task, outputs_consumed):
+        """
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param bool outputs_consumed: Whether the spec binds the outputs of the array job.
+        :returns: The number of sub-tasks of the task each container of its array job executes, or None if every
+            container executes a single sub-task.
+        :rtype: int
+        """
+        # The platform maps the containers of the array job of a discoverable task to the sub-tasks whose outputs
+        # weren't discovered through an index lookup, which leaves no contiguous range of sub-tasks to batch.
+        if not self._array_batch_size or self._array_batch_size <= 1 or task.metadata.discoverable:
+            return None
+        # The platform only collects the outputs of as many sub-tasks as the array job has containers, so the outputs
+        # of the sub-tasks of a batched array job can't be bound.
+        if outputs_consumed:
+            return None
+        return self._array_batch_size
+
+    def _create_array_task(self, task, array_job, effective_failure_ratio, pack_array_inputs, batch_size):
+        """
+        Creates the array task that runs all the invocations of a task, once their number is known.
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param _array_job.ArrayJob array_job: The array job, with one element per invocation.
+        :param float effective_failure_ratio:
+        :param bool pack_array_inputs: Whether the inputs of the invocations are in a packed inputs file.
+        :param int batch_size: The number of invocations each container executes, or None for one.
+        :rtype: flytekit.common.tasks.task.SdkTask
+        """
+        # Copy the task so that the user's task is not turned into an array task for the rest of the process.
+        array_task = _copy.copy(task)
+        array_env = {}
+        if array_job.size > 1:
+            # min_successes is computed once the size of the array job is known rather than for every sub-task.
+            array_job.min_successes = int(math.ceil((1 - effective_failure_ratio) * array_job.size))
+        if batch_size is not None:
+            # Each container executes a contiguous range of sub-tasks, so the array job launches fewer containers
+            # than there are sub-tasks.  Inputs and outputs are still laid out per sub-task.
+            sub_task_count = array_job.size
+            array_job.size = int(math.ceil(sub_task_count / float(batch_size)))
+            array_job.min_successes = int(math.ceil((1 - effective_failure_ratio) * array_job.size))
+            array_env[_constants.ARRAY_BATCH_SIZE_ENV_VAR] = _six.text_type(batch_size)
+            array_env[_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR] = _six.text_type(sub_task_count)
+        if pack_array_inputs:
+            # Tells the containers of the array job where to find their inputs.
+            array_env[_constants.ARRAY_PACKED_INPUTS_ENV_VAR] = _constants.PACKED_INPUTS_FILE_NAME
+        if array_env:
+            array_task.assign_container_and_return(task.container.copy_with_env(array_env))
+        # assign custom field to the ArrayJob properties computed.
+        return array_task.assign_custom_and_return(array_job.to_dict()).assign_type_and_return(
+            _constants.SdkTaskType.CONTAINER_ARRAY_TASK)
+
+    @staticmethod
+    def _create_array_node(sub_task_node, node_id, stragglers=False):
+        """
+        Creates the node of an array job from the node of its first sub-task.
+        :param flytekit.common.nodes.SdkNode sub_task_node:
+        :param Text node_id:
+        :param bool stragglers: Whether the array job runs the stragglers of the task.  Its task then needs an id of its
+            own, since the task of the array job of the other sub-tasks has the id of the user's task.
+        :rtype: flytekit.common.nodes.SdkNode
+        """
+        if not stragglers:
+            return sub_task_node.assign_id_and_return(node_id)
+        task = sub_task_node.executable_sdk_object
+        return _nodes.SdkNode(
+            node_id,
+            sub_task_node.upstream_nodes,
+            sub_task_node.inputs,
+            sub_task_node.metadata,
+            sdk_task=SdkDynamicTask._rename_task(task, "{}-stragglers".format(task.id.name))
+        )
+
+    @staticmethod
+    def _rename_task(task, name):
+        """
+        Copies a task under another name, for array jobs whose task must not share the id of the user's task.
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param Text name:
+        :rtype: flytekit.common.tasks.task.SdkTask
+        """
+        return _copy.copy(task).assign_id_and_return(_identifier.Identifier(
+            task.id.resource_type, task.id.project, task.id.domain, name, task.id.version
+        ))
+
+    def _create_array_tasks(self, array_job_index, planner, effective_failure_ratio, consumed_node_ids):
+        """
+        Creates the array tasks of the array jobs of yielded sub-tasks, once all the sub-tasks were added to them.
+        :param dict[(int, bool), (flytekit.common.tasks.task.SdkTask, _array_job.ArrayJob,
+            flytekit.common.nodes.SdkNode, flytekit.common.packed_inputs.PackedLiteralMaps)] array_job_index: The array
+            jobs keyed by the identity of their task and whether they hold its stragglers.
+        :param flytekit.common.runtime_history.ArrayJobPlanner planner:
+        :param float effective_failure_ratio:
+        :param set[Text] consumed_node_ids: The ids of the nodes whose outputs the spec binds.
+        :rtype: list[flytekit.common.tasks.task.SdkTask]
+        """
+        array_tasks = []
+        for (_, stragglers), (task, array_job, node, packed_inputs) in _six.iteritems(array_job_index):
+            batch_size = self._batch_size(task, node.id in consumed_node_ids)
+            if planner is not None:
+                array_job.parallelism = planner.parallelism(
+                    task, stragglers, max_concurrency=self._max_concurrency, batch_size=batch_size)
+            array_tasks.append(self._create_array_task(
+                node.executable_sdk_object, array_job, effective_failure_ratio, packed_inputs is not None, batch_size))
+        return array_tasks
+
+    @staticmethod
+    def _next_count(task, task_ids, generated_ids):
+        """
+        Counts the nodes of a task, so that their ids are unique in the document.
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param dict[int, (flytekit.common.tasks.task.SdkTask, Text)] task_ids: The tasks seen so far and their
+            formatted ids, keyed by the identity of the task.  Holding on to the tasks keeps their identities from
+            being reused while the spec is produced.
+        :param dict[Text, int] generated_ids: The number of nodes of every task so far.
+        :returns: The formatted id of the task and the count of its new node.
+        :rtype: (Text, int)
+        """
+        entry = task_ids.get(id(task))
+        if entry is None:
+            entry = task_ids[id(task)] = (task, _six.text_type(task.id))
+        safe_task_id = entry[1]
+        new_count = generated_ids[safe_task_id] = generated_ids.get(safe_task_id, -1) + 1
+        return safe_task_id, new_count
+
+    def _add_map_node(self, map_node, count, tasks, nodes, generated_files, effective_failure_ratio, pack_array_inputs,
+                      spilled_inputs_dir):
+        """
+        Adds the array job of a map node, with a sub-task for every value the node maps its task over.  The inputs of
+        the sub-tasks are written as they are produced.  A map node over no values has nothing to run.
+        :param flytekit.common.nodes.SdkMapNode map_node:
+        :param (Text, int) count: The formatted id of the task of the node and the count of the node.  Every map node
+            has an array task of its own, so that the sizes of their array jobs don't collide.
+        :param list[flytekit.common.tasks.task.SdkTask] tasks:
+        :param list[flytekit.common.nodes.SdkNode] nodes:
+        :param dict[Text, T] generated_files:
+        :param float effective_failure_ratio:
+        :param bool pack_array_inputs:
+        :param Text spilled_inputs_dir:
+        """
+        if len(map_node) == 0:
+            return
+        pack_array_inputs = SdkDynamicTask._packs_inputs(map_node.executable_sdk_object, pack_array_inputs)
+        safe_task_id, new_count = count
+        map_node.assign_id_and_return(_dnsify("{}-{}".format(safe_task_id, new_count)))
+        task = map_node.executable_sdk_object
+        task = SdkDynamicTask._rename_task(task, "{}-map-{}".format(task.id.name, new_count))
+        node = _nodes.SdkNode(map_node.id, [], map_node.inputs, map_node.metadata, sdk_task=task)
+
+        array_job = self._create_array_job(inputs_prefix=map_node.id)
+        array_job.size = len(map_node)
+        if pack_array_inputs:
+            packed_inputs = _packed_inputs.PackedLiteralMaps()
+            for sub_task_inputs in map_node.iter_inputs():
+                packed_inputs.append(sub_task_inputs)
+            generated_files[_os.path.join(map_node.id, _constants.PACKED_INPUTS_FILE_NAME)] = packed_inputs
+        else:
+            for i, sub_task_inputs in enumerate(map_node.iter_inputs()):
+                input_path = _os.path.join(map_node.id, _six.text_type(i), _constants.INPUT_FILE_NAME)
+                SdkDynamicTask._add_inputs_file(generated_files, input_path, sub_task_inputs, spilled_inputs_dir)
+        # Map nodes exist to collect the outputs of their sub-tasks, so they are never batched.
+        tasks.append(self._create_array_task(task, array_job, effective_failure_ratio, pack_array_inputs, None))
+        nodes.append(node)
+
+    @staticmethod
+    def _packs_inputs(task, pack_array_inputs):
+        """
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param bool pack_array_inputs: Whether the configuration asks for the inputs of array jobs to be packed.
+        :returns: Whether the inputs of the sub-tasks of the task are written to a packed inputs file.
+        :rtype: bool
+        """
+        # The platform discovers the outputs of the sub-tasks of discoverable array jobs from the inputs file of each
+        # sub-task, so those must stay in files of their own.
+        return pack_array_inputs and not task.metadata.discoverable
+
     @staticmethod
     def _can_run_as_array(task_type):
         """
@@ -114,6 +320,139 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
         """
         return task_type == _constants.SdkTaskType.PYTHON_TASK
 
+    @staticmethod
+    def _add_workflow_node(workflow_node, task_ids, generated_ids, nodes, sub_workflows):
+        """
+        Adds a node that runs a workflow or a launch plan.  The node only references what it runs, so a workflow is
+        added to the sub-workflows of the spec once however many nodes run it, and a launch plan is registered already.
+        The inputs of the node are bound in the node rather than written to a file.
+        :param flytekit.common.nodes.SdkNode workflow_node:
+        :param dict[T, Text] task_ids:
+        :param dict[Text, int] generated_ids:
+        :param list[flytekit.common.nodes.SdkNode] nodes:
+        :param dict[Text, flytekit.common.workflow.SdkWorkflow] sub_workflows:
+        """
+        entity = workflow_node.executable_sdk_object
+        if workflow_node.workflow_node.sub_workflow_ref is None and workflow_node.workflow_node.launchplan_ref is None:
+            # A launch plan that isn't registered can't be referenced, so its workflow runs as a sub-workflow instead.
+            safe_id, new_count = SdkDynamicTask._next_count(entity.sdk_workflow, task_ids, generated_ids)
+            node_id = _dnsify("{}-{}".format(safe_id, new_count))
+            node = SdkDynamicTask._launch_plan_as_sub_workflow(workflow_node, node_id)
+            SdkDynamicTask._point_outputs_at(workflow_node, node)
+        else:
+            safe_id, new_count = SdkDynamicTask._next_count(entity, task_ids, generated_ids)
+            node = workflow_node.assign_id_and_return(_dnsify("{}-{}".format(safe_id, new_count)))
+        nodes.append(node)
+        if node.workflow_node.sub_workflow_ref is not None:
+            SdkDynamicTask._add_sub_workflow(node.executable_sdk_object, sub_workflows)
+
+    @staticmethod
+    def _launch_plan_as_sub_workflow(launch_plan_node, node_id):
+        """
+        :param flytekit.common.nodes.SdkNode launch_plan_node: A node that runs a launch plan.
+        :param Text node_id:
+        :returns: A node that runs the workflow of the launch plan, with the fixed inputs of the launch plan bound.
+        :rtype: flytekit.common.nodes.SdkNode
+        """
+        launch_plan = launch_plan_node.executable_sdk_object
+        bindings = list(launch_plan_node.inputs) + [
+            _literal_models.Binding(var=k, binding=SdkDynamicTask._literal_to_binding_data(v))
+            for k, v in _six.iteritems(launch_plan.fixed_inputs.literals)
+        ]
+        return _nodes.SdkNode(
+            node_id,
+            launch_plan_node.upstream_nodes,
+            sorted(bindings, key=lambda b: b.var),
+            launch_plan_node.metadata,
+            sdk_workflow=launch_plan.sdk_workflow
+        )
+
+    @staticmethod
+    def _literal_to_binding_data(literal):
+        """
+        :param flytekit.models.literals.Literal literal:
+        :rtype: flytekit.models.literals.BindingData
+        """
+        if literal.collection is not None:
+            return _literal_models.BindingData(collection=_literal_models.BindingDataCollection(
+                [SdkDynamicTask._literal_to_binding_data(v) for v in literal.collection.literals]))
+        elif literal.map is not None:
+            return _literal_models.BindingData(map=_literal_models.BindingDataMap(
+                {k: SdkDynamicTask._literal_to_binding_data(v) for k, v in _six.iteritems(literal.map.literals)}))
+        return _literal_models.BindingData(scalar=literal.scalar)
+
+    @staticmethod
+    def _add_sub_workflow(workflow, sub_workflows):
+        """
+        :param flytekit.common.workflow.SdkWorkflow workflow:
+        :param dict[Text, flytekit.common.workflow.SdkWorkflow] sub_workflows: The sub-workflows added so far, keyed by
+            their ids.
+        """
+        workflow_id = _six.text_type(workflow.id)
+        if workflow_id in sub_workflows:
+            return
+        sub_workflows[workflow_id] = workflow
+        for node in workflow.nodes:
+            if node.workflow_node is not None and node.workflow_node.sub_workflow_ref is not None:
+                SdkDynamicTask._add_sub_workflow(node.executable_sdk_object, sub_workflows)
+
+    @staticmethod
+    def _sub_workflow_tasks(sub_workflows, tasks):
+        """
+        The nodes of sub-workflows reference their tasks by id, so the tasks must be in the spec along with the
+        sub-workflows.
+        :param dict[Text, flytekit.common.workflow.SdkWorkflow] sub_workflows:
+        :param list[flytekit.common.tasks.task.SdkTask] tasks: The tasks already in the spec.
+        :rtype: list[flytekit.common.tasks.task.SdkTask]
+        :raises: flytekit.common.exceptions.user.FlyteAssertion
+        """
+        task_types = {_six.text_type(t.id): t.type for t in tasks}
+        sub_workflow_tasks = []
+        for workflow in _six.itervalues(sub_workflows):
+            for node in workflow.nodes:
+                if node.task_node is None:
+                    continue
+                task = node.executable_sdk_object
+                task_id = _six.text_type(task.id)
+                if task_types.get(task_id) == _constants.SdkTaskType.CONTAINER_ARRAY_TASK:
+                    raise _user_exceptions.FlyteAssertion(
+                        "The task {} is yielded to run as an array job and is also run by the sub-workflow {}.  Yield "
+                        "the task in a workflow of its own, or run the sub-workflow with a launch plan.".format(
+                            task_id, workflow.id)
+                    )
+                if task_id not in task_types:
+                    task_types[task_id] = task.type
+                    sub_workflow_tasks.append(task)
+        return sub_workflow_tasks
+
+    @staticmethod
+    def _point_outputs_at(sub_task_node, node, node_index=None):
+        """
+        Points the outputs of a yielded node at the node that produces them.
+        :param flytekit.common.nodes.SdkNode sub_task_node:
+        :param flytekit.common.nodes.SdkNode node: The node that runs the invocation.
+        :param Text node_index: The index of the invocation if the node is an array job.
+        """
+        for node_output in _six.itervalues(sub_task_node.outputs):
+            if not node_output.sdk_node.id:
+                node_output.sdk_node.assign_id_and_return(node.id)
+            # The output no longer holds on to the yielded node, which can be freed once the user code drops it.
+            node_output.sdk_node = node
+            if node_index is not None:
+                node_output.var = "[{}].{}".format(node_index, node_output.var)
+
+    @staticmethod
+    def _add_inputs_file(generated_files, path, literal_map, spilled_inputs_dir=None):
+        """
+        :param dict[Text, T] generated_files:
+        :param Text path: The path of the inputs file relative to the outputs of the task.
+        :param flytekit.models.literals.LiteralMap literal_map:
+        :param Text spilled_inputs_dir: If set, the inputs are written to a file under this directory right away.
+        """
+        if spilled_inputs_dir is not None:
+            literal_map = _spilled_inputs.SpilledLiteralMap.spill(literal_map, _os.path.join(spilled_inputs_dir, path))
+        generated_files[path] = literal_map
+
     def _produce_dynamic_job_spec(self, context, inputs):
         """
         Runs user code and and produces future task nodes to run sub-tasks.
@@ -130,14 +469,28 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
         }
 
         inputs_dict.update(outputs_dict)
-        yielded_sub_tasks = [sub_task for sub_task in
-                             super(SdkDynamicTask, self)._execute_user_code(context, inputs_dict) or []]
-
-        upstream_nodes = list()
-        output_bindings = [_literal_models.Binding(var=name, binding=_interface.BindingData.from_python_std(
-            b.sdk_type.to_flyte_literal_type(), b.raw_value, upstream_nodes=upstream_nodes))
-                           for name, b in _six.iteritems(outputs_dict)]
-        upstream_nodes = set(upstream_nodes)
+        yielded_sub_tasks = super(SdkDynamicTask, self)._execute_user_code(context, inputs_dict) or []
+        spilled_inputs_dir = None
+        if _sdk_config.STREAM_DYNAMIC_JOB_SPEC.get():
+            # Sub-tasks are processed as the user code yields them and their inputs are written to local files, so
+            # neither the yielded nodes nor their inputs accumulate in memory.
+            spilled_inputs_dir = _os.path.join(context.working_directory.name, _constants.SPILLED_INPUTS_DIR)
+        else:
+            yielded_sub_tasks = list(yielded_sub_tasks)
+
+        output_bindings = []
+
+        def _upstream_nodes():
+            # The outputs can only be bound once the user code has set them, which it has once the yielded sub-tasks
+            # are exhausted.
+            upstream_nodes = list()
+            output_bindings.extend(
+                _literal_models.Binding(var=name, binding=_interface.BindingData.from_python_std(
+                    b.sdk_type.to_flyte_literal_type(), b.raw_value, upstream_nodes=upstream_nodes))
+                for name, b in _six.iteritems(outputs_dict)
+            )
+            for node in set(upstream_nodes):
+                yield node
 
         generated_files = {}
         # Keeping future-tasks in original order. We don't use upstream_nodes exclusively because the parent task can
@@ -145,78 +498,109 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
         array_job_index = {}
         tasks = []
         nodes = []
-        visited_nodes = set()
+        # Nodes that are no longer referenced can't be yielded again, so they needn't be kept alive to be skipped.
+        visited_nodes = _weakref.WeakSet()
         generated_ids = {}
+        # Formatting the id of a task is expensive, so it's done once per task rather than once per node.  Tasks are
+        # keyed by their identity, since hashing or comparing an entity can serialize it, and _next_count holds on to
+        # every task whose identity is used as a key below.
+        task_ids = {}
+        invocations = {}
+        sub_workflows = _collections.OrderedDict()
         effective_failure_ratio = self._allowed_failure_ratio or 0.0
-        for sub_task_node in _itertools.chain(yielded_sub_tasks, upstream_nodes):
+        pack_array_inputs = _sdk_config.PACK_ARRAY_INPUTS.get()
+        planner = _runtime_history.ArrayJobPlanner.from_config()
+        for sub_task_node in _itertools.chain(yielded_sub_tasks, _upstream_nodes()):
             if sub_task_node in visited_nodes:
                 continue
             visited_nodes.add(sub_task_node)
+            task = sub_task_node.executable_sdk_object
+            if isinstance(sub_task_node, _nodes.SdkMapNode):
+                # A map node compiles to an array job of its own.
+                self._add_map_node(
+                    sub_task_node, SdkDynamicTask._next_count(task, task_ids, generated_ids), tasks, nodes,
+                    generated_files, effective_failure_ratio, pack_array_inputs, spilled_inputs_dir)
+                continue
+            if sub_task_node.workflow_node is not None:
+                SdkDynamicTask._add_workflow_node(sub_task_node, task_ids, generated_ids, nodes, sub_workflows)
+                continue
+
+            sub_task_inputs = _literal_models.LiteralMap(
+                literals={binding.var: binding.binding.to_literal_model() for binding in sub_task_node.inputs})
+
+            invocation = None
+            if self._deduplicate_sub_tasks:
+                # An invocation of the same task with the same inputs as an earlier one isn't scheduled again.  Its
+                # outputs are read from the earlier invocation instead.
+                invocation = (id(task), _local_cache.hash_literal_map(sub_task_inputs))
+                if invocation in invocations:
+                    SdkDynamicTask._point_outputs_at(sub_task_node, *invocations[invocation])
+                    continue
 
             # Generate an id that's unique in the document (if the same task is used multiple times with
             # different resources, executable_sdk_object.id will be the same but generated node_ids should not
-            # be.
-            safe_task_id = _six.text_type(sub_task_node.executable_sdk_object.id)
-            if safe_task_id in generated_ids:
-                new_count = generated_ids[safe_task_id] = generated_ids[safe_task_id] + 1
-            else:
-                new_count = generated_ids[safe_task_id] = 0
-            unique_node_id = _dnsify("{}-{}".format(safe_task_id, new_count))
+            # be.  The id is only built for nodes that need one, since the sub-tasks of an array job share a node.
+            safe_task_id, new_count = SdkDynamicTask._next_count(task, task_ids, generated_ids)
 
             # If the task can run as an array job, group its instances together. Otherwise, keep each invocation as a
             # separate node.
-            if SdkDynamicTask._can_run_as_array(sub_task_node.executable_sdk_object.type):
-                if sub_task_node.executable_sdk_object in array_job_index:
-                    array_job, node = array_job_index[sub_task_node.executable_sdk_object]
+            if SdkDynamicTask._can_run_as_array(task.type):
+                array_key = (id(task), planner is not None and planner.add(task, sub_task_inputs))
+                if array_key in array_job_index:
+                    _, array_job, node, packed_inputs = array_job_index[array_key]
                     array_job.size += 1
-                    array_job.min_successes = int(math.ceil((1 - effective_failure_ratio) * array_job.size))
                 else:
+                    unique_node_id = _dnsify("{}-{}".format(safe_task_id, new_count))
                     array_job = self._create_array_job(inputs_prefix=unique_node_id)
-                    node = sub_task_node.assign_id_and_return(unique_node_id)
-                    array_job_index[sub_task_node.executable_sdk_object] = (array_job, node)
+                    node = SdkDynamicTask._create_array_node(sub_task_node, unique_node_id, stragglers=array_key[1])
+                    # The outputs bound to the node of the stragglers must not turn it into a sub-task of its own.
+                    visited_nodes.add(node)
+                    packed_inputs = None
+                    if SdkDynamicTask._packs_inputs(task, pack_array_inputs):
+                        # Upload inputs to working directory under /array_job.input_ref/inputs.packed
+                        packed_inputs = _packed_inputs.PackedLiteralMaps()
+                        generated_files[_os.path.join(node.id, _constants.PACKED_INPUTS_FILE_NAME)] = packed_inputs
+                    array_job_index[array_key] = (task, array_job, node, packed_inputs)
 
                 node_index = _six.text_type(array_job.size - 1)
-                for k, node_output in _six.iteritems(sub_task_node.outputs):
-                    if not node_output.sdk_node.id:
-                        node_output.sdk_node.assign_id_and_return(node.id)
-                    node_output.var = "[{}].{}".format(node_index, node_output.var)
-
-                # Upload inputs to working directory under /array_job.input_ref/<index>/inputs.pb
-                input_path = _os.path.join(node.id, node_index, _constants.INPUT_FILE_NAME)
-                generated_files[input_path] = _literal_models.LiteralMap(
-                    literals={binding.var: binding.binding.to_literal_model() for binding in
-                              sub_task_node.inputs})
+                SdkDynamicTask._point_outputs_at(sub_task_node, node, node_index)
+                if packed_inputs is not None:
+                    packed_inputs.append(sub_task_inputs)
+                else:
+                    # Upload inputs to working directory under /array_job.input_ref/<index>/inputs.pb
+                    input_path = _os.path.join(node.id, node_index, _constants.INPUT_FILE_NAME)
+                    SdkDynamicTask._add_inputs_file(generated_files, input_path, sub_task_inputs, spilled_inputs_dir)
             else:
-                node = sub_task_node.assign_id_and_return(unique_node_id)
+                node_index = None
+                node = sub_task_node.assign_id_and_return(_dnsify("{}-{}".format(safe_task_id, new_count)))
 
-                tasks.append(sub_task_node.executable_sdk_object)
+                tasks.append(task)
                 nodes.append(node)
-
-                for k, node_output in _six.iteritems(sub_task_node.outputs):
-                    if not node_output.sdk_node.id:
-                        node_output.sdk_node.assign_id_and_return(node.id)
+                SdkDynamicTask._point_outputs_at(sub_task_node, node)
 
                 # Upload inputs to working directory under /array_job.input_ref/inputs.pb
                 input_path = _os.path.join(node.id, _constants.INPUT_FILE_NAME)
-                generated_files[input_path] = _literal_models.LiteralMap(
-                    literals={binding.var: binding.binding.to_literal_model() for binding in
-                              sub_task_node.inputs})
+                SdkDynamicTask._add_inputs_file(generated_files, input_path, sub_task_inputs, spilled_inputs_dir)
 
-        # assign custom field to the ArrayJob properties computed.
-        for task, (array_job, _) in _six.iteritems(array_job_index):
-            # TODO: Reconstruct task template object instead of modifying an existing one?
-            tasks.append(task.assign_custom_and_return(array_job.to_dict()).assign_type_and_return(
-                _constants.SdkTaskType.CONTAINER_ARRAY_TASK))
+            if invocation is not None:
+                invocations[invocation] = (node, node_index)
+
+        consumed_node_ids = set()
+        for node in nodes:
+            _add_promise_node_ids((b.binding for b in node.inputs), consumed_node_ids)
+        _add_promise_node_ids((b.binding for b in output_bindings), consumed_node_ids)
+        tasks.extend(self._create_array_tasks(array_job_index, planner, effective_failure_ratio, consumed_node_ids))
+        tasks.extend(SdkDynamicTask._sub_workflow_tasks(sub_workflows, tasks))
 
         # min_successes is absolute, it's computed as the reverse of allowed_failure_ratio and multiplied by the
         # total length of tasks to get an absolute count.
-        nodes.extend([array_job_node for (_, array_job_node) in array_job_index.values()])
+        nodes.extend([array_job_node for (_, _, array_job_node, _) in array_job_index.values()])
         dynamic_job_spec = _dynamic_job.DynamicJobSpec(
             min_successes=len(nodes),
             tasks=tasks,
             nodes=nodes,
             outputs=output_bindings,
-            subworkflows=[])
+            subworkflows=list(_six.itervalues(sub_workflows)))
 
         return dynamic_job_spec, generated_files
 
@@ -234,10 +618,11 @@ class SdkDynamicTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _sdk_runnab
             working directory (with the names provided), which will in turn allow Flyte Propeller to push along the
             workflow.  Where as local engine will merely feed the outputs directly into the next node.
         """
-        spec, generated_files = self._produce_dynamic_job_spec(context, inputs)
+        with _tracing.span('produce_dynamic_job_spec'):
+            spec, generated_files = self._produce_dynamic_job_spec(context, inputs)
 
         # If no sub-tasks are requested to run, just produce an outputs file like any other single-step tasks.
-        if len(generated_files) == 0:
+        if len(spec.nodes) == 0:
             return {
                 _constants.OUTPUT_FILE_NAME: _literal_models.LiteralMap(
                     literals={binding.var: binding.binding.to_literal_model() for binding in spec.outputs})
@@ -1,11 +1,17 @@
 from __future__ import absolute_import
 
+import copy as _copy
+import inspect as _inspect
+import os as _os
+import time as _time
+
 from inspect import getargspec as _getargspec
 
 import six as _six
 
 from flytekit import __version__
-from flytekit.common import interface as _interface, constants as _constants, sdk_bases as _sdk_bases
+from flytekit.common import interface as _interface, constants as _constants, profiling as _profiling, \
+    runtime_history as _runtime_history, sdk_bases as _sdk_bases, tracing as _tracing
 from flytekit.common.exceptions import user as _user_exceptions, scopes as _exception_scopes
 from flytekit.common.tasks import task as _base_task, output as _task_output
 from flytekit.common.types import helpers as _type_helpers
@@ -119,6 +125,16 @@ class SdkRunnableContainer(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _task
         """
         return _sdk_config.SDK_PYTHON_VENV.get() + self._args
 
+    def copy_with_env(self, env):
+        """
+        :param dict[Text, Text] env: Environment variables to add to the copy.
+        :rtype: SdkRunnableContainer
+        """
+        container = _copy.copy(self)
+        container._env = dict(self._env)
+        container._env.update(env)
+        return container
+
     @property
     def image(self):
         """
@@ -171,7 +187,8 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
             discoverable,
             timeout,
             environment,
-            custom
+            custom,
+            offload_large_literals=False
     ):
         """
         :param task_function: Function container user code.  This will be executed via the SDK's engine.
@@ -191,8 +208,15 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
         :param datetime.timedelta timeout:
         :param dict[Text, Text] environment:
         :param dict[Text, T] custom:
+        :param bool offload_large_literals: Whether literals larger than sdk.literal_offloading_threshold in the
+            documents written by the task are moved to blob storage.
         """
+        if offload_large_literals and discoverable:
+            raise _user_exceptions.FlyteValidationException(
+                "The outputs of cached tasks can't be offloaded, since the data catalog needs the literals inline."
+            )
         self._task_function = task_function
+        self._offload_large_literals = offload_large_literals
 
         super(SdkRunnableTask, self).__init__(
             task_type,
@@ -236,6 +260,13 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
     def task_function(self):
         return self._task_function
 
+    @property
+    def offload_large_literals(self):
+        """
+        :rtype: bool
+        """
+        return self._offload_large_literals
+
     @property
     def task_function_name(self):
         """
@@ -308,17 +339,26 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
             workflow.  Where as local engine will merely feed the outputs directly into the next node.
         """
 
-        return _exception_scopes.user_entry_point(self.task_function)(
-            ExecutionParameters(
-                execution_date=context.execution_date,
-                # TODO: it might be better to consider passing the full struct
-                execution_id=_six.text_type(WorkflowExecutionIdentifier.promote_from_model(context.execution_id)),
-                stats=context.stats,
-                logging=context.logging,
-                tmp_dir=context.working_directory
-            ),
-            **inputs
+        execution_parameters = ExecutionParameters(
+            execution_date=context.execution_date,
+            # TODO: it might be better to consider passing the full struct
+            execution_id=_six.text_type(WorkflowExecutionIdentifier.promote_from_model(context.execution_id)),
+            stats=context.stats,
+            logging=context.logging,
+            tmp_dir=context.working_directory
+        )
+        profiler = _profiling.UserCodeProfiler.from_config(
+            _os.path.join(context.working_directory.name, _constants.PROFILES_DIR)
         )
+        if profiler is None:
+            return _exception_scopes.user_entry_point(self.task_function)(execution_parameters, **inputs)
+
+        with profiler:
+            result = _exception_scopes.user_entry_point(self.task_function)(execution_parameters, **inputs)
+            # The user code of dynamic tasks is a generator, which only runs as it is iterated.
+            if _inspect.isgenerator(result):
+                result = list(result)
+            return result
 
     @_exception_scopes.system_entry_point
     def execute(self, context, inputs):
@@ -332,16 +372,21 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
             working directory (with the names provided), which will in turn allow Flyte Propeller to push along the
             workflow.  Where as local engine will merely feed the outputs directly into the next node.
         """
-        inputs_dict = _type_helpers.unpack_literal_map_to_sdk_python_std(inputs, {
-            k: _type_helpers.get_sdk_type_from_literal_type(v.type) for k, v in _six.iteritems(self.interface.inputs)
-        })
+        with _tracing.span('unpack_inputs'):
+            inputs_dict = _type_helpers.unpack_literal_map_to_sdk_python_std(inputs, {
+                k: _type_helpers.get_sdk_type_from_literal_type(v.type)
+                for k, v in _six.iteritems(self.interface.inputs)
+            })
         outputs_dict = {
             name: _task_output.OutputReference(_type_helpers.get_sdk_type_from_literal_type(variable.type))
             for name, variable in _six.iteritems(self.interface.outputs)
         }
         inputs_dict.update(outputs_dict)
 
-        self._execute_user_code(context, inputs_dict)
+        start_time = _time.time()
+        with _tracing.span('user_code'):
+            self._execute_user_code(context, inputs_dict)
+        self._record_runtime(inputs, _time.time() - start_time)
 
         return {
             _constants.OUTPUT_FILE_NAME: _literal_models.LiteralMap(
@@ -349,6 +394,16 @@ class SdkRunnableTask(_six.with_metaclass(_sdk_bases.ExtendedSdkType, _base_task
             )
         }
 
+    def _record_runtime(self, inputs, seconds):
+        """
+        Records how long the user code ran, so that dynamic tasks can plan the array jobs of this task.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param float seconds:
+        """
+        history = _runtime_history.get_runtime_history()
+        if history is not None:
+            history.record(_runtime_history.get_task_name(self), self.id.version, inputs, seconds)
+
     def _get_container_definition(
             self,
             storage_request=None,
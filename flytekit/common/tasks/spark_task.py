@@ -6,7 +6,6 @@ import os as _os
 import pyspark as _pyspark
 import sys as _sys
 import six as _six
-from flytekit.bin import spark_executor
 from flytekit.common import constants as _constants
 from flytekit.common.exceptions import scopes as _exception_scopes
 from flytekit.common.tasks import output as _task_output, sdk_runnable as _sdk_runnable
@@ -73,7 +72,9 @@ class SdkSparkTask(_sdk_runnable.SdkRunnableTask):
         :param dict[Text, Text] environment: [optional] environment variables to set when executing this task.
         """
 
-        spark_exec_path = _os.path.abspath(spark_executor.__file__)
+        # The executor imports the whole task execution stack, which declaring a task doesn't need.
+        from flytekit.bin import spark_executor as _spark_executor
+        spark_exec_path = _os.path.abspath(_spark_executor.__file__)
         if spark_exec_path.endswith('.pyc'):
             spark_exec_path = spark_exec_path[:-1]
 
@@ -101,6 +101,18 @@ class SdkTask(
         self._type = new_type
         return self
 
+    def assign_container_and_return(self, container):
+        self._container = container
+        return self
+
+    def assign_id_and_return(self, id):
+        """
+        :param flytekit.common.core.identifier.Identifier id:
+        :rtype: SdkTask
+        """
+        self._id = id
+        return self
+
     @_exception_scopes.system_entry_point
     def __call__(self, *args, **input_map):
         """
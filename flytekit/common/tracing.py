@@ -0,0 +1,275 @@
+from __future__ import absolute_import
+
+import json as _json
+import os as _os
+import re as _re
+import threading as _threading
+import time as _time
+
+_ACTIVE_TRACERS = []
+
+_FORBIDDEN_NAME_CHARACTERS = _re.compile('[^a-zA-Z0-9_-]')
+
+
+class Span(object):
+    """
+    A timed phase of an execution.  Spans nest: a span opened while another is open in the same thread becomes its
+    child.
+    """
+
+    def __init__(self, name):
+        """
+        :param Text name:
+        """
+        self._name = name
+        self._start_time = None
+        self._wall_time = None
+        self._process_time = None
+        self._num_bytes = 0
+        self._children = []
+        self._start_process_time = None
+
+    @property
+    def name(self):
+        """
+        :rtype: Text
+        """
+        return self._name
+
+    @property
+    def start_time(self):
+        """
+        Seconds since the epoch when the span started.
+        :rtype: float
+        """
+        return self._start_time
+
+    @property
+    def wall_time(self):
+        """
+        Seconds the span took or None if it hasn't finished.
+        :rtype: float
+        """
+        return self._wall_time
+
+    @property
+    def process_time(self):
+        """
+        CPU seconds the whole process spent while the span was open or None if it hasn't finished.
+        :rtype: float
+        """
+        return self._process_time
+
+    @property
+    def num_bytes(self):
+        """
+        :rtype: int
+        """
+        return self._num_bytes
+
+    @property
+    def children(self):
+        """
+        :rtype: list[Span]
+        """
+        return self._children
+
+    def add_bytes(self, num_bytes):
+        """
+        :param int num_bytes: Number of bytes moved or produced during the span.
+        """
+        self._num_bytes += num_bytes
+
+    def add_path_bytes(self, path):
+        """
+        Adds the size of a file or of all the files in a directory.
+        :param Text path:
+        """
+        self.add_bytes(_path_size(path))
+
+    def start(self):
+        self._start_time = _time.time()
+        self._start_process_time = _time.clock()
+
+    def finish(self):
+        self._wall_time = _time.time() - self._start_time
+        self._process_time = _time.clock() - self._start_process_time
+
+    def to_dict(self):
+        """
+        :rtype: dict[Text, T]
+        """
+        return {
+            'name': self.name,
+            'start_time': self.start_time,
+            'wall_time': self.wall_time,
+            'process_time': self.process_time,
+            'bytes': self.num_bytes,
+            'children': [c.to_dict() for c in self.children],
+        }
+
+
+class _NullSpan(object):
+    """
+    Stands in for a span when no tracer is active, so that instrumented code costs next to nothing.
+    """
+
+    def add_bytes(self, num_bytes):
+        pass
+
+    def add_path_bytes(self, path):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext(object):
+
+    def __init__(self, tracer, name):
+        """
+        :param Tracer tracer:
+        :param Text name:
+        """
+        self._tracer = tracer
+        self._span = Span(name)
+
+    def __enter__(self):
+        self._tracer._push(self._span)
+        self._span.start()
+        return self._span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._span.finish()
+        self._tracer._pop()
+
+
+class Tracer(object):
+    """
+    Records the spans of an execution.  While a tracer is entered, the span function of this module records spans in
+    it, from any thread.  Spans opened by a thread with no open span become root spans of the tracer.
+    """
+
+    def __init__(self):
+        self._spans = []
+        self._lock = _threading.Lock()
+        self._local = _threading.local()
+
+    @property
+    def spans(self):
+        """
+        :rtype: list[Span]
+        """
+        return self._spans
+
+    def span(self, name):
+        """
+        :param Text name:
+        :rtype: _SpanContext
+        """
+        return _SpanContext(self, name)
+
+    def _push(self, span):
+        """
+        :param Span span:
+        """
+        stack = self._stack()
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self._spans.append(span)
+        stack.append(span)
+
+    def _pop(self):
+        self._stack().pop()
+
+    def _stack(self):
+        """
+        :rtype: list[Span]
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def to_dict(self):
+        """
+        :rtype: dict[Text, T]
+        """
+        with self._lock:
+            return {'spans': [s.to_dict() for s in self._spans]}
+
+    def write(self, path):
+        """
+        Writes the spans to a JSON document.
+        :param Text path:
+        """
+        with open(path, 'w') as f:
+            _json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+    def emit(self, stats):
+        """
+        Emits the wall time of every finished span as a timer and its byte count as a gauge.  Metrics are named after
+        the path of the span, e.g. execute.upload_outputs.
+        :param flytekit.interfaces.stats.taggable.TaggableStats stats:
+        """
+        with self._lock:
+            spans = [([s.name], s) for s in self._spans]
+        while spans:
+            path, span = spans.pop()
+            if span.wall_time is None:
+                continue
+            metric = ".".join(_FORBIDDEN_NAME_CHARACTERS.sub('_', name) for name in path)
+            stats.timing(metric, int(span.wall_time * 1000))
+            if span.num_bytes:
+                stats.gauge(metric + ".bytes", span.num_bytes)
+            spans.extend((path + [c.name], c) for c in span.children)
+
+    def __enter__(self):
+        _ACTIVE_TRACERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _ACTIVE_TRACERS.remove(self)
+
+
+def span(name):
+    """
+    Records a span in the active tracer.  Use as a context manager, which returns the span:
+
+        with span('download_inputs') as s:
+            ...
+            s.add_path_bytes(local_path)
+
+    :param Text name:
+    :rtype: _SpanContext|_NullSpan
+    """
+    if not _ACTIVE_TRACERS:
+        return _NULL_SPAN
+    return _ACTIVE_TRACERS[-1].span(name)
+
+
+def _path_size(path):
+    """
+    :param Text path:
+    :rtype: int
+    """
+    if not _os.path.isdir(path):
+        try:
+            return _os.path.getsize(path)
+        except OSError:
+            return 0
+    size = 0
+    for root, _, file_names in _os.walk(path):
+        for file_name in file_names:
+            try:
+                size += _os.path.getsize(_os.path.join(root, file_name))
+            except OSError:
+                pass
+    return size
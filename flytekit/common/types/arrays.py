@@ -0,0 +1,270 @@
+from __future__ import absolute_import
+
+import json as _json
+
+import numpy as _np
+import six as _six
+
+from flytekit.common.exceptions import user as _user_exceptions
+from flytekit.common.types import base_sdk_types as _base_sdk_types
+from flytekit.models import types as _idl_types, literals as _literals
+
+
+def create_array(dtype, shape=None):
+    """
+    :param T dtype: Anything numpy.dtype can interpret.  i.e. 'float32', numpy.int64, etc.
+    :param tuple[int]|None shape: [Optional] The expected shape of the array.  A dimension specified as None or -1
+        will accept any size.  If not specified, arrays of any shape are accepted.
+    :rtype: ArrayType
+    """
+    try:
+        np_dtype = _np.dtype(dtype)
+    except TypeError:
+        raise _user_exceptions.FlyteTypeException(
+            expected_type=_np.dtype,
+            received_type=type(dtype),
+            received_value=dtype
+        )
+
+    if np_dtype.hasobject or np_dtype.fields is not None or np_dtype.subdtype is not None:
+        raise _user_exceptions.FlyteValueException(
+            dtype,
+            "Only fixed-width numeric dtypes can be packed into an array literal."
+        )
+
+    if shape is not None:
+        shape = tuple(-1 if d is None else int(d) for d in shape)
+
+    class _Array(Array):
+        _dtype = np_dtype
+        _shape = shape
+    return _Array
+
+
+class ArrayType(_base_sdk_types.FlyteSdkType):
+
+    @property
+    def dtype(cls):
+        """
+        :rtype: numpy.dtype
+        """
+        return cls._dtype
+
+    @property
+    def shape(cls):
+        """
+        :rtype: tuple[int]|None
+        """
+        return cls._shape
+
+    @property
+    def descriptor(cls):
+        """
+        The dtype descriptor including byte order.  i.e. '<f8'
+        :rtype: Text
+        """
+        return cls.dtype.str
+
+    def accepts_shape(cls, shape):
+        """
+        :param tuple[int] shape:
+        :rtype: bool
+        """
+        if cls.shape is None:
+            return True
+        if len(shape) != len(cls.shape):
+            return False
+        return all(expected == -1 or expected == actual for expected, actual in zip(cls.shape, shape))
+
+    def __eq__(cls, other):
+        return hasattr(other, 'dtype') and hasattr(other, 'shape') and cls.dtype == other.dtype and \
+            cls.shape == other.shape
+
+    def __hash__(cls):
+        # Python 3 checks complain if hash isn't implemented at the same time as equals
+        return super(ArrayType, cls).__hash__()
+
+
+class Array(_six.with_metaclass(ArrayType, _base_sdk_types.FlyteSdkValue)):
+    """
+    Packs a numpy.ndarray into a single binary scalar literal.  Rather than encoding one literal per element, the
+    contiguous buffer is stored as is and the dtype and shape are recorded in the binary tag.  Unpacking creates a
+    read-only view over the literal bytes without copying the data.
+    """
+
+    DTYPE_FIELD_KEY = "np_dtype"
+    SHAPE_FIELD_KEY = "np_shape"
+    TAG_PREFIX = "np_array="
+    _TAG_SEPARATOR = ";"
+    _dtype = None
+    _shape = None
+
+    def __init__(self, np_array):
+        """
+        :param numpy.ndarray np_array:
+        """
+        np_array = _np.ascontiguousarray(np_array)
+        data = np_array.tobytes()
+        super(Array, self).__init__(
+            scalar=_literals.Scalar(
+                binary=_literals.Binary(
+                    value=bytes(data) if _six.PY2 else data,
+                    tag=type(self).create_tag(np_array.dtype, np_array.shape)
+                )
+            )
+        )
+
+    @staticmethod
+    def format_shape(shape):
+        """
+        :param tuple[int]|None shape:
+        :rtype: Text
+        """
+        if shape is None:
+            return ""
+        return ",".join(_six.text_type(d) for d in shape)
+
+    @staticmethod
+    def parse_shape(shape_string):
+        """
+        :param Text shape_string:
+        :rtype: tuple[int]|None
+        """
+        if not shape_string:
+            return None
+        return tuple(int(d) for d in shape_string.split(","))
+
+    @staticmethod
+    def create_tag(dtype, shape):
+        """
+        :param numpy.dtype dtype:
+        :param tuple[int] shape:
+        :rtype: Text
+        """
+        return "{}{}{}{}".format(Array.TAG_PREFIX, dtype.str, Array._TAG_SEPARATOR, Array.format_shape(shape))
+
+    @staticmethod
+    def parse_tag(tag):
+        """
+        :param Text tag:
+        :rtype: (numpy.dtype, tuple[int])
+        """
+        if not tag.startswith(Array.TAG_PREFIX) or Array._TAG_SEPARATOR not in tag:
+            raise _user_exceptions.FlyteValueException(tag, "Not a valid tag for a packed array literal.")
+        dtype, shape = tag[len(Array.TAG_PREFIX):].split(Array._TAG_SEPARATOR, 1)
+        return _np.dtype(dtype), Array.parse_shape(shape) or ()
+
+    @classmethod
+    def from_string(cls, string_value):
+        """
+        :param Text string_value: JSON formatted (possibly nested) list of numbers.
+        :rtype: Array
+        """
+        try:
+            items = _json.loads(string_value)
+        except ValueError:
+            raise _user_exceptions.FlyteTypeException(
+                _six.text_type, cls, additional_msg='String not parseable to json {}'.format(string_value))
+
+        if type(items) != list:
+            raise _user_exceptions.FlyteTypeException(
+                _six.text_type, cls, additional_msg='String is not a list {}'.format(string_value))
+
+        try:
+            np_array = _np.array(items, dtype=cls.dtype)
+        except (TypeError, ValueError):
+            raise _user_exceptions.FlyteValueException(
+                string_value, "Could not be converted to an array of dtype {}.".format(cls.dtype))
+        return cls.from_python_std(np_array)
+
+    @classmethod
+    def is_castable_from(cls, other):
+        """
+        :param flytekit.common.types.base_literal_types.FlyteSdkType other:
+        :rtype: bool
+        """
+        if not isinstance(other, ArrayType) or other.dtype != cls.dtype:
+            return False
+        return cls.shape is None or (other.shape is not None and cls.accepts_shape(other.shape))
+
+    @classmethod
+    def from_python_std(cls, t_value):
+        """
+        :param T t_value: It is up to each individual object as to whether or not this value can be cast.
+        :rtype: _base_sdk_types.FlyteSdkValue
+        :raises: flytekit.common.exceptions.user.FlyteTypeException
+        """
+        if t_value is None:
+            return _base_sdk_types.Void()
+        elif not isinstance(t_value, _np.ndarray):
+            raise _user_exceptions.FlyteTypeException(type(t_value), _np.ndarray, received_value=t_value)
+        elif t_value.dtype != cls.dtype:
+            raise _user_exceptions.FlyteTypeException(
+                t_value.dtype,
+                cls.dtype,
+                additional_msg="The dtype of the array doesn't match the declared dtype."
+            )
+        elif not cls.accepts_shape(t_value.shape):
+            raise _user_exceptions.FlyteValueException(
+                t_value.shape,
+                "The shape of the array doesn't match the declared shape {}.".format(cls.shape)
+            )
+        return cls(t_value)
+
+    @classmethod
+    def to_flyte_literal_type(cls):
+        """
+        :rtype: flytekit.models.types.LiteralType
+        """
+        metadata = {cls.DTYPE_FIELD_KEY: cls.descriptor}
+        if cls.shape is not None:
+            metadata[cls.SHAPE_FIELD_KEY] = cls.format_shape(cls.shape)
+        return _idl_types.LiteralType(simple=_idl_types.SimpleType.BINARY, metadata=metadata)
+
+    @classmethod
+    def promote_from_model(cls, literal_model):
+        """
+        Creates an object of this type from the model primitive defining it.  The literal bytes are referenced, not
+        copied.
+        :param flytekit.models.literals.Literal literal_model:
+        :rtype: Array
+        """
+        dtype, shape = cls.parse_tag(literal_model.scalar.binary.tag)
+        if dtype != cls.dtype or not cls.accepts_shape(shape):
+            raise _user_exceptions.FlyteTypeException(
+                literal_model.scalar.binary.tag,
+                cls.short_class_string(),
+                additional_msg="Can not deserialize as the array dtype or shape doesn't match."
+            )
+        obj = cls.__new__(cls)
+        _base_sdk_types.FlyteSdkValue.__init__(obj, scalar=literal_model.scalar)
+        return obj
+
+    @classmethod
+    def short_class_string(cls):
+        """
+        :rtype: Text
+        """
+        if cls.shape is None:
+            return "Types.Array({})".format(cls.dtype.name)
+        return "Types.Array({}, shape={})".format(cls.dtype.name, cls.shape)
+
+    @property
+    def array_shape(self):
+        """
+        :rtype: tuple[int]
+        """
+        return type(self).parse_tag(self.scalar.binary.tag)[1]
+
+    def to_python_std(self):
+        """
+        :returns: A read-only numpy array backed by the literal's bytes.
+        :rtype: numpy.ndarray
+        """
+        return _np.frombuffer(self.scalar.binary.value, dtype=type(self).dtype).reshape(self.array_shape)
+
+    def short_string(self):
+        """
+        :rtype: Text
+        """
+        return "{}(shape={})".format(type(self).short_class_string(), self.array_shape)
@@ -1,10 +1,14 @@
 from __future__ import absolute_import
 
 import six as _six
+from flyteidl.core import literals_pb2 as _literals_pb2
 from flytekit.models import literals as _literal_models
+from flytekit.models.core import types as _core_types
+from flytekit.common import constants as _constants, utils as _common_utils
 from flytekit.common.exceptions import user as _user_exceptions, scopes as _exception_scopes
 from flytekit.configuration import sdk as _sdk_config
 import importlib as _importlib
+import os as _os
 
 
 class _TypeEngineLoader(object):
@@ -88,6 +92,7 @@ def get_sdk_value_from_literal(literal, sdk_type=None):
     :param flytekit.models.types.LiteralType sdk_type:
     :rtype: flytekit.common.types.base_sdk_types.FlyteSdkValue
     """
+    literal = hydrate_literal(literal)
     # The spec states everything must be nullable, so if we receive a null value, swap to the null type behavior.
     if sdk_type is None:
         sdk_type = infer_sdk_type_from_literal(literal)
@@ -131,3 +136,68 @@ def pack_python_std_map_to_literal_map(std_map, type_map):
             k: v.from_python_std(std_map[k]) for k, v in _six.iteritems(type_map)
         }
     )
+
+
+def is_offloaded_literal(literal):
+    """
+    :param flytekit.models.literals.Literal literal:
+    :rtype: bool
+    """
+    return literal.scalar is not None and literal.scalar.blob is not None and \
+        literal.scalar.blob.metadata.type.format == _constants.OFFLOADED_LITERAL_FORMAT
+
+
+def hydrate_literal(literal):
+    """
+    If the literal is a reference to a literal that was offloaded to blob storage, download and return the original
+    literal.  Otherwise, the literal is returned as is.
+    :param flytekit.models.literals.Literal literal:
+    :rtype: flytekit.models.literals.Literal
+    """
+    if not is_offloaded_literal(literal):
+        return literal
+    # The data proxy imports the stack of every storage backend, which is only paid for when a literal was offloaded.
+    from flytekit.interfaces.data import data_proxy as _data_proxy
+    with _common_utils.AutoDeletingTempDir("offloaded") as t:
+        local_path = t.get_named_tempfile("literal.pb")
+        _data_proxy.Data.get_data(literal.scalar.blob.uri, local_path)
+        return _literal_models.Literal.from_flyte_idl(
+            _common_utils.load_proto_from_file(_literals_pb2.Literal, local_path)
+        )
+
+
+def offload_large_literals(literal_map, threshold, local_dir, remote_dir):
+    """
+    Writes each literal whose serialized size is larger than the threshold to its own file under local_dir and
+    replaces it in the returned map with a reference to the same file under remote_dir.  It is up to the caller to
+    upload local_dir to remote_dir.
+
+    :param flytekit.models.literals.LiteralMap literal_map:
+    :param int threshold: Size in bytes.
+    :param Text local_dir:
+    :param Text remote_dir:
+    :rtype: flytekit.models.literals.LiteralMap
+    """
+    literals = {}
+    for k, v in _six.iteritems(literal_map.literals):
+        pb = v.to_flyte_idl()
+        if is_offloaded_literal(v) or pb.ByteSize() <= threshold:
+            literals[k] = v
+            continue
+
+        file_name = "{}.pb".format(k)
+        _common_utils.write_proto_to_file(pb, _os.path.join(local_dir, file_name))
+        literals[k] = _literal_models.Literal(
+            scalar=_literal_models.Scalar(
+                blob=_literal_models.Blob(
+                    metadata=_literal_models.BlobMetadata(
+                        type=_core_types.BlobType(
+                            format=_constants.OFFLOADED_LITERAL_FORMAT,
+                            dimensionality=_core_types.BlobType.BlobDimensionality.SINGLE
+                        )
+                    ),
+                    uri=_os.path.join(remote_dir, file_name)
+                )
+            )
+        )
+    return _literal_models.LiteralMap(literals=literals)
@@ -4,9 +4,9 @@ from pytimeparse import parse as _parse_duration_string
 
 from flytekit.common.exceptions import user as _user_exceptions
 from flytekit.common.types import base_sdk_types as _base_sdk_types
-from flytekit.models import types as _idl_types, literals as _literals
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.models import types as _idl_types, literals as _literals, common as _common_models
 from dateutil import parser as _parser
-from google.protobuf import json_format as _json_format, struct_pb2 as _struct
 
 import json as _json
 import six as _six
@@ -500,6 +500,8 @@ class Timedelta(_base_sdk_types.FlyteSdkValue):
 
 class Generic(_base_sdk_types.FlyteSdkValue):
 
+    BINARY_TAG = "generic=json"
+
     @classmethod
     def from_string(cls, string_value):
         """
@@ -507,13 +509,18 @@ class Generic(_base_sdk_types.FlyteSdkValue):
         :rtype: Generic
         """
         try:
-            t = _json_format.Parse(string_value, _struct.Struct())
+            t = _json.loads(string_value)
         except:
             raise _user_exceptions.FlyteValueException(
                 string_value,
                 "Could not be parsed from JSON."
             )
-        return cls(t)
+        if not isinstance(t, dict):
+            raise _user_exceptions.FlyteValueException(
+                string_value,
+                "Must be a JSON object."
+            )
+        return cls.from_python_std(t)
 
     @classmethod
     def is_castable_from(cls, other):
@@ -526,6 +533,10 @@ class Generic(_base_sdk_types.FlyteSdkValue):
     @classmethod
     def from_python_std(cls, t_value):
         """
+        The dictionary is converted to a Struct directly.  If binary encoding is enabled via the sdk configuration
+        and the JSON encoding of the value exceeds the threshold, the JSON bytes are stored as a binary literal
+        instead.
+
         :param T t_value: It is up to each individual object as to whether or not this value can be cast.
         :rtype: FlyteSdkValue
         :raises: flytekit.common.exceptions.user.FlyteTypeException
@@ -536,15 +547,18 @@ class Generic(_base_sdk_types.FlyteSdkValue):
             raise _user_exceptions.FlyteTypeException(type(t_value), dict, t_value)
 
         try:
-            t = _json.dumps(t_value)
-        except:
+            threshold = _sdk_config.GENERIC_BINARY_ENCODING_THRESHOLD.get()
+            if threshold > 0:
+                encoded = _json.dumps(t_value, separators=(',', ':')).encode('utf-8')
+                if len(encoded) > threshold:
+                    return cls(_literals.Binary(value=encoded, tag=cls.BINARY_TAG))
+            return cls(_common_models.dict_to_struct(t_value))
+        except (TypeError, ValueError):
             raise _user_exceptions.FlyteValueException(
                 t_value,
                 "Is not JSON serializable."
             )
 
-        return cls(_json_format.Parse(t, _struct.Struct()))
-
     @classmethod
     def to_flyte_literal_type(cls):
         """
@@ -559,6 +573,14 @@ class Generic(_base_sdk_types.FlyteSdkValue):
         :param flytekit.models.literals.Literal literal_model:
         :rtype: Generic
         """
+        if literal_model.scalar.binary is not None:
+            if literal_model.scalar.binary.tag != cls.BINARY_TAG:
+                raise _user_exceptions.FlyteTypeException(
+                    literal_model.scalar.binary.tag,
+                    cls.BINARY_TAG,
+                    additional_msg="Can not deserialize as the binary literal is not an encoded generic."
+                )
+            return cls(literal_model.scalar.binary)
         return cls(literal_model.scalar.generic)
 
     @classmethod
@@ -570,15 +592,21 @@ class Generic(_base_sdk_types.FlyteSdkValue):
 
     def __init__(self, value):
         """
-        :param _struct.Struct value: value to wrap
+        :param google.protobuf.struct_pb2.Struct|flytekit.models.literals.Binary value: value to wrap
         """
-        super(Generic, self).__init__(scalar=_literals.Scalar(generic=value))
+        if isinstance(value, _literals.Binary):
+            super(Generic, self).__init__(scalar=_literals.Scalar(binary=value))
+        else:
+            super(Generic, self).__init__(scalar=_literals.Scalar(generic=value))
 
     def to_python_std(self):
         """
+        Numbers are returned as floats when the value is stored as a Struct.
         :rtype: dict[Text, T]
         """
-        return _json.loads(_json_format.MessageToJson(self.scalar.generic))
+        if self.scalar.binary is not None:
+            return _json.loads(self.scalar.binary.value.decode('utf-8'))
+        return _common_models.struct_to_dict(self.scalar.generic)
 
     def short_string(self):
         """
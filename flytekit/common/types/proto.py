@@ -8,6 +8,10 @@ from google.protobuf import reflection as _proto_reflection
 import base64 as _base64
 import six as _six
 
+# Interns one SDK type per protobuf message class so repeated resolution of the same type is cheap and yields the same
+# class object.
+_PROTOBUF_SDK_TYPES = {}
+
 
 def create_protobuf(pb_type):
     """
@@ -21,9 +25,14 @@ def create_protobuf(pb_type):
             received_value=pb_type
         )
 
+    sdk_type = _PROTOBUF_SDK_TYPES.get(pb_type)
+    if sdk_type is not None:
+        return sdk_type
+
     class _Protobuf(Protobuf):
         _pb_type = pb_type
-    return _Protobuf
+
+    return _PROTOBUF_SDK_TYPES.setdefault(pb_type, _Protobuf)
 
 
 class ProtobufType(_base_sdk_types.FlyteSdkType):
@@ -69,6 +78,18 @@ class Protobuf(_six.with_metaclass(ProtobufType, _base_sdk_types.FlyteSdkValue))
             )
         )
 
+    @classmethod
+    def from_serialized(cls, binary):
+        """
+        Wraps an already serialized message.  The bytes are kept as is and are only parsed when the message is
+        requested via to_python_std.
+        :param flytekit.models.literals.Binary binary:
+        :rtype: Protobuf
+        """
+        obj = cls.__new__(cls)
+        super(Protobuf, obj).__init__(scalar=_literals.Scalar(binary=binary))
+        return obj
+
     @classmethod
     def from_string(cls, string_value):
         """
@@ -135,9 +156,7 @@ class Protobuf(_six.with_metaclass(ProtobufType, _base_sdk_types.FlyteSdkValue))
                 received_value=_base64.b64encode(literal_model.scalar.binary.value),
                 additional_msg="Can not deserialize as proto tags don't match."
             )
-        pb_obj = cls.pb_type()
-        pb_obj.ParseFromString(literal_model.scalar.binary.value)
-        return cls(pb_obj)
+        return cls.from_serialized(literal_model.scalar.binary)
 
     @classmethod
     def short_class_string(cls):
@@ -148,6 +167,8 @@ class Protobuf(_six.with_metaclass(ProtobufType, _base_sdk_types.FlyteSdkValue))
 
     def to_python_std(self):
         """
+        Parses the serialized message.  A new object is returned on each call, so mutating it will not affect this
+        value.
         :returns: The protobuf object as defined by the user.
         :rtype: T
         """
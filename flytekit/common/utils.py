@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import logging as _logging
 import os as _os
+import re as _re
 import shutil as _shutil
 from hashlib import sha224 as _sha224
 import tempfile as _tempfile
@@ -16,6 +17,8 @@ try:
 except ImportError:
     from pathlib2 import Path  # python 2 backport
 
+_DNS_LABEL = _re.compile(r'[a-z0-9]([-a-z0-9]*[a-z0-9])?\Z')
+
 
 def _dnsify(value):
     # type: (Text) -> Text
@@ -30,6 +33,9 @@ def _dnsify(value):
     res = ""
     MAX = 63
     HASH_LEN = 10
+    if len(value) < MAX and _DNS_LABEL.match(value):
+        # The value is already compliant, which is the case for ids that have been converted before.
+        return value
     if len(value) >= MAX:
         h = _sha224(value.encode('utf-8')).hexdigest()[:HASH_LEN]
         value = "{}-{}".format(h, value[-(MAX - HASH_LEN - 1):])
@@ -1,12 +1,12 @@
 from __future__ import absolute_import
 
+import datetime as _datetime
 import uuid as _uuid
 
 import six as _six
 from six.moves import queue as _queue
 
-from flytekit.common import interface as _interface, nodes as _nodes, sdk_bases as _sdk_bases, \
-    launch_plan as _launch_plan, promise as _promise
+from flytekit.common import interface as _interface, nodes as _nodes, sdk_bases as _sdk_bases, promise as _promise
 from flytekit.common.core import identifier as _identifier
 from flytekit.common.exceptions import scopes as _exception_scopes, user as _user_exceptions
 from flytekit.common.mixins import registerable as _registerable, hash as _hash_mixin
@@ -271,6 +271,9 @@ class SdkWorkflow(
         auth = _launch_plan_models.Auth(assumable_iam_role=assumable_iam_role,
                                         kubernetes_service_account=kubernetes_service_account)
 
+        # Launch plans, and the workflow execution types they depend on, are only imported by workflows that create
+        # them, which keeps them off the import path of modules that only declare workflows.
+        from flytekit.common import launch_plan as _launch_plan
         return (cls or _launch_plan.SdkRunnableLaunchPlan)(
             sdk_workflow=self,
             default_inputs={
@@ -286,10 +289,51 @@ class SdkWorkflow(
         )
 
     @_exception_scopes.system_entry_point
-    def __call__(self, *args, **kwargs):
-        # TODO: Create a workflow node
-        raise NotImplementedError("Embedding a workflow as a node is not supported currently.  Please use launch "
-                                  "plans.")
+    def local_execute(self, **input_map):
+        """
+        Executes every node of this workflow on the local machine.  Independent nodes are executed concurrently.
+        :param dict[Text, T] input_map: Python Std input from users.  We will cast these to the appropriate Flyte
+            literals.  Inputs with a default value may be omitted.
+        :rtype: dict[Text, T]
+        :returns: The outputs produced by this workflow in Python standard format.
+        """
+        inputs = {i.name: i.sdk_default for i in self._user_inputs if not i.sdk_required}
+        inputs.update(input_map)
+        return _engine_loader.get_engine('local').get_workflow(self).execute(
+            _type_helpers.pack_python_std_map_to_literal_map(inputs, {
+                k: _type_helpers.get_sdk_type_from_literal_type(v.type)
+                for k, v in _six.iteritems(self.interface.inputs)
+            })
+        )
+
+    @_exception_scopes.system_entry_point
+    def __call__(self, *args, **input_map):
+        """
+        Creates a node that runs this workflow as a sub-workflow.  Dynamic tasks add the workflow of the node to the
+        sub-workflows of their dynamic job.  Workflows that run another workflow should use a launch plan instead.
+        :param list[T] args: Do not specify.  Kwargs only are supported for this function.
+        :param dict[Text,T] input_map: Map of inputs.  Can be statically defined or OutputReference links.  Inputs
+            with a default value may be omitted.
+        :rtype: flytekit.common.nodes.SdkNode
+        """
+        if len(args) > 0:
+            raise _user_exceptions.FlyteAssertion(
+                "When adding a workflow as a node, all inputs must be specified with kwargs only.  We detected {} "
+                "positional args.".format(len(args))
+            )
+
+        inputs = {i.name: i.sdk_default for i in self._user_inputs if not i.sdk_required}
+        inputs.update(input_map)
+        bindings, upstream_nodes = self.interface.create_bindings_for_inputs(inputs)
+
+        # TODO: Remove DEADBEEF
+        return _nodes.SdkNode(
+            id=None,
+            metadata=_workflow_models.NodeMetadata("DEADBEEF", _datetime.timedelta(), _literal_models.RetryStrategy(0)),
+            bindings=sorted(bindings, key=lambda b: b.var),
+            upstream_nodes=upstream_nodes,
+            sdk_workflow=self
+        )
 
 
 def _assign_indexed_attribute_name(attribute_name, index):
@@ -72,11 +72,164 @@ we fall back to the configuration for :py:attr:`flytekit.configuration.sdk.NAME_
 LOGGING_LEVEL = _config_common.FlyteIntegerConfigurationEntry('sdk', 'logging_level', default=20)
 """
 This is the default logging level for the Python logging library and will be set before user code runs.
-Note that this configuration is special in that it is a runtime setting, not a compile time setting.  This is the only
-runtime option in this file.
+Note that this configuration is special in that it is a runtime setting, not a compile time setting.
 """
 
 PARQUET_ENGINE = _config_common.FlyteStringConfigurationEntry('sdk', 'parquet_engine', default='pyarrow')
 """
 This is the parquet engine to use when reading data from parquet files.
 """
+
+LITERAL_OFFLOADING_THRESHOLD = _config_common.FlyteIntegerConfigurationEntry(
+    'sdk', 'literal_offloading_threshold', default=0
+)
+"""
+This is the size in bytes above which a serialized literal in an inputs or outputs document written by the engine is
+moved to its own file in blob storage and replaced by a reference.  Only tasks declared with
+offload_large_literals=True offload literals.  The platform and the data catalog see a reference as a blob rather than
+the type declared by the interface, so the documents of such tasks must only be consumed by flytekit tasks.
+References are re-hydrated in full when the literal map is unpacked by the SDK, so offloading keeps the documents
+small but doesn't bound the memory of the consumers.  A value of 0 disables offloading.  Like the logging level, this
+is a runtime setting.
+"""
+
+GENERIC_BINARY_ENCODING_THRESHOLD = _config_common.FlyteIntegerConfigurationEntry(
+    'sdk', 'generic_binary_encoding_threshold', default=0
+)
+"""
+This is the size in bytes of the JSON encoding of a Generic value above which it is stored as a compact binary literal
+rather than a protobuf Struct.  Binary-encoded generics are faster to produce and consume and preserve the distinction
+between integers and floats.  A value of 0 disables the binary encoding.
+"""
+
+LOCAL_EXECUTION_PARALLELISM = _config_common.FlyteIntegerConfigurationEntry(
+    'sdk', 'local_execution_parallelism', default=0
+)
+"""
+This is the maximum number of tasks the local engine executes concurrently, each in its own worker process.  A value of
+0 uses one worker process per CPU.  A value of 1 executes every task in the calling process, which is convenient for
+debugging.
+"""
+
+UNIT_TEST_EXECUTOR = _config_common.FlyteStringConfigurationEntry('sdk', 'unit_test_executor', default='serial')
+"""
+This selects how the unit test engine runs the sub-tasks yielded by dynamic tasks.  'serial' runs them one after another
+in the calling thread.  'thread' and 'process' run independent sub-tasks and the sub-tasks of array jobs concurrently in
+a pool of threads or worker processes respectively.
+"""
+
+UNIT_TEST_PARALLELISM = _config_common.FlyteIntegerConfigurationEntry('sdk', 'unit_test_parallelism', default=0)
+"""
+This is the maximum number of sub-tasks the unit test engine runs concurrently when a 'thread' or 'process' executor is
+configured.  A value of 0 uses one worker per CPU.
+"""
+
+LOCAL_CACHE_ENABLED = _config_common.FlyteBoolConfigurationEntry('sdk', 'local_cache_enabled', default=False)
+"""
+If this is set to True, the outputs of discoverable tasks executed by the local and unit test engines are memoized in an
+on-disk store.  A task whose discovery version and inputs match a previous execution isn't executed again, instead its
+outputs are read from the store.
+"""
+
+LOCAL_CACHE_DIRECTORY = _config_common.FlyteStringConfigurationEntry('sdk', 'local_cache_directory', default=None)
+"""
+This is the directory of the local memo store.  If not specified, the store is kept under the local sandbox.
+"""
+
+LOCAL_CACHE_MAX_SIZE = _config_common.FlyteIntegerConfigurationEntry(
+    'sdk', 'local_cache_max_size', default=10 * 1024 ** 3
+)
+"""
+This is the size in bytes above which the least recently used entries of the local memo store are evicted, until the
+store is back to 80% of this size.  A value of 0 means the store is never evicted.
+"""
+
+RUNTIME_HISTORY_ENABLED = _config_common.FlyteBoolConfigurationEntry('sdk', 'runtime_history_enabled', default=False)
+"""
+If this is set to True, python tasks record how long their user code ran in an on-disk history, and dynamic tasks plan
+their array jobs from the history.  Sub-tasks that ran much longer than is typical for their task are moved to an array
+job of their own, and the parallelism of array jobs is set to the lowest that is expected to complete them in the time
+their longest sub-task takes.  The parallelism is never above the max_concurrency of the dynamic task.
+"""
+
+RUNTIME_HISTORY_DIRECTORY = _config_common.FlyteStringConfigurationEntry(
+    'sdk', 'runtime_history_directory', default=None
+)
+"""
+This is the directory of the runtime history.  If not specified, the history is kept under the local sandbox.
+"""
+
+ARRAY_BATCH_PARALLELISM = _config_common.FlyteIntegerConfigurationEntry('sdk', 'array_batch_parallelism', default=1)
+"""
+This is the number of worker processes a container of an array job uses to execute its sub-tasks when the dynamic task
+declared an array batch size.  A value of 1 executes the sub-tasks one after another in the container's process.
+"""
+
+PACK_ARRAY_INPUTS = _config_common.FlyteBoolConfigurationEntry('sdk', 'pack_array_inputs', default=False)
+"""
+If this is set to True, dynamic tasks write the inputs of all the sub-tasks of an array job to a single inputs.packed
+file rather than to an inputs.pb file per sub-task.  Each container of the array job reads only its own inputs from the
+file, with a ranged read.  This saves one object store request per sub-task for large fan-outs.
+"""
+
+PACKED_INDEX_LOOKUP = _config_common.FlyteBoolConfigurationEntry('sdk', 'packed_index_lookup', default=False)
+"""
+Set this to True if the platform writes the index lookup of discoverable array jobs as an indexlookup.bin file of
+fixed-width indices.  Each container then reads its own index with a single ranged read rather than downloading the
+whole indexlookup.pb.  Containers fall back to indexlookup.pb if indexlookup.bin doesn't exist.
+"""
+
+STREAM_DYNAMIC_JOB_SPEC = _config_common.FlyteBoolConfigurationEntry('sdk', 'stream_dynamic_job_spec', default=False)
+"""
+If this is set to True, dynamic tasks process the sub-tasks their user code yields one at a time and write the inputs of
+each sub-task to a local file right away, rather than holding the inputs of all the sub-tasks in memory until the task
+completes.  This bounds the memory of dynamic tasks with large fan-outs.
+"""
+
+UPLOAD_PARALLELISM = _config_common.FlyteIntegerConfigurationEntry('sdk', 'upload_parallelism', default=1)
+"""
+This is the number of threads pyflyte-execute uses to write the outputs and generated files of a task, like the inputs
+of the sub-tasks of a dynamic task.  The files are split between as many directories, which are uploaded concurrently.
+"""
+
+UPLOAD_RETRIES = _config_common.FlyteIntegerConfigurationEntry('sdk', 'upload_retries', default=0)
+"""
+This is the number of times pyflyte-execute retries a failed upload of the outputs and generated files of a task.  The
+remote path of every file only depends on its name, so a retry overwrites anything a failed attempt uploaded.
+"""
+
+OUTPUT_CACHE_PREFIX = _config_common.FlyteStringConfigurationEntry('sdk', 'output_cache_prefix', default=None)
+"""
+If this is set, pyflyte-execute caches the outputs of the sub-tasks of array jobs under this prefix, e.g.
+s3://my-bucket/flyte-output-cache.  Outputs are keyed by the task, its cache version and a hash of the contents of its
+inputs, and only the outputs of tasks declared with cache=True are cached.  A sub-task whose outputs are in the cache
+copies them rather than running its user code again, so re-running an array job only recomputes the sub-tasks that
+didn't succeed before.
+"""
+
+WRITE_TIMINGS = _config_common.FlyteBoolConfigurationEntry('sdk', 'write_timings', default=False)
+"""
+If this is set to True, pyflyte-execute writes the timings of the phases of a task execution to a timings.json document
+next to the outputs of the task.  The timings are emitted as stats regardless of this setting.
+"""
+
+PROFILE_CPU = _config_common.FlyteBoolConfigurationEntry('sdk', 'profile_cpu', default=False)
+"""
+If this is set to True, the user code of python tasks is profiled with cProfile.  The profile is uploaded to a profiles
+directory next to the outputs of the task.  To profile a single task, set FLYTE_SDK_PROFILE_CPU in the environment
+argument of its decorator.
+"""
+
+PROFILE_MEMORY = _config_common.FlyteBoolConfigurationEntry('sdk', 'profile_memory', default=False)
+"""
+If this is set to True, the memory allocations of the user code of python tasks are tracked with tracemalloc.  The peak
+allocated memory and the lines holding the most memory are uploaded to a profiles directory next to the outputs of the
+task.  To profile a single task, set FLYTE_SDK_PROFILE_MEMORY in the environment argument of its decorator.
+"""
+
+FORK_SERVER_ENABLED = _config_common.FlyteBoolConfigurationEntry('sdk', 'fork_server_enabled', default=True)
+"""
+If this is set to True, the local and unit test engines execute tasks in worker processes forked from a server process,
+which imports the workflow packages and the installed plugins once.  Otherwise, they use a regular process pool whose
+workers import them on first use.  Platforms without fork always use a process pool.
+"""
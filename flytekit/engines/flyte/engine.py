@@ -2,17 +2,20 @@ from __future__ import absolute_import
 
 import logging as _logging
 import os as _os
+import shutil as _shutil
 import traceback as _traceback
 from datetime import datetime as _datetime
 
 import six as _six
+from concurrent import futures as _futures
 
 from flytekit.clients.helpers import iterate_node_executions as _iterate_node_executions, iterate_task_executions as \
     _iterate_task_executions
 from flytekit import __version__ as _api_version
-from flytekit.clients.friendly import SynchronousFlyteClient as _SynchronousFlyteClient
-from flytekit.common import utils as _common_utils, constants as _constants
+from flytekit.common import utils as _common_utils, constants as _constants, packed_inputs as _packed_inputs, \
+    spilled_inputs as _spilled_inputs, tracing as _tracing
 from flytekit.common.exceptions import user as _user_exceptions, scopes as _exception_scopes
+from flytekit.common.types import helpers as _type_helpers
 from flytekit.configuration import platform as _platform_config, internal as _internal_config, sdk as _sdk_config
 from flytekit.engines import common as _common_engine
 from flytekit.interfaces.data import data_proxy as _data_proxy
@@ -25,6 +28,87 @@ from flytekit.models.core.identifier import WorkflowExecutionIdentifier
 from flyteidl.core import literals_pb2 as _literals_pb2
 
 
+def get_task_stats(scope):
+    """
+    Returns a stats client for the task executing in this container.  Metric paths are:
+    registration_project.registration_domain.app.module.task_name.<scope>
+    and metrics are tagged with execution-level values for project/domain/wf/lp.
+
+    :param Text scope:
+    :rtype: flytekit.interfaces.stats.taggable.TaggableStats
+    """
+    return _get_stats(
+        "{}.{}.{}.{}".format(
+            _internal_config.TASK_PROJECT.get() or _internal_config.PROJECT.get(),
+            _internal_config.TASK_DOMAIN.get() or _internal_config.DOMAIN.get(),
+            _internal_config.TASK_NAME.get() or _internal_config.NAME.get(),
+            scope
+        ),
+        tags={
+            'exec_project': _internal_config.EXECUTION_PROJECT.get(),
+            'exec_domain': _internal_config.EXECUTION_DOMAIN.get(),
+            'exec_workflow': _internal_config.EXECUTION_WORKFLOW.get(),
+            'exec_launchplan': _internal_config.EXECUTION_LAUNCHPLAN.get(),
+            'api_version': _api_version
+        }
+    )
+
+
+def _write_output_files(output_file_dict, local_dirs, output_prefix, offloading_threshold):
+    """
+    Serializes the files generated by a task, spread evenly over local_dirs, with a thread per directory.
+    :param dict[Text, T] output_file_dict:
+    :param list[Text] local_dirs:
+    :param Text output_prefix: Where the files will be uploaded.
+    :param int offloading_threshold: The size above which literals are offloaded, or 0 to keep them inline.
+    """
+
+    def _write(item):
+        i, (name, value) = item
+        _write_output_file(name, value, local_dirs[i % len(local_dirs)], output_prefix, offloading_threshold)
+
+    items = enumerate(_six.iteritems(output_file_dict))
+    if len(local_dirs) == 1:
+        for item in items:
+            _write(item)
+        return
+    with _futures.ThreadPoolExecutor(max_workers=len(local_dirs)) as executor:
+        for _ in executor.map(_write, items):
+            pass
+
+
+def _write_output_file(name, value, local_dir, output_prefix, offloading_threshold):
+    """
+    :param Text name: The path of the file relative to local_dir and output_prefix.
+    :param T value:
+    :param Text local_dir:
+    :param Text output_prefix:
+    :param int offloading_threshold:
+    """
+    path = _os.path.join(local_dir, name)
+    if isinstance(value, _packed_inputs.PackedLiteralMaps):
+        value.write(path)
+        return
+    if isinstance(value, _spilled_inputs.SpilledLiteralMap):
+        if offloading_threshold <= 0:
+            value.write(path)
+            return
+        value = value.load()
+    if offloading_threshold > 0 and isinstance(value, _literals.LiteralMap):
+        offloaded_dir = _os.path.join(
+            _os.path.dirname(name),
+            _constants.OFFLOADED_LITERALS_DIR,
+            _os.path.splitext(_os.path.basename(name))[0]
+        )
+        value = _type_helpers.offload_large_literals(
+            value,
+            offloading_threshold,
+            _os.path.join(local_dir, offloaded_dir),
+            _os.path.join(output_prefix, offloaded_dir)
+        )
+    _common_utils.write_proto_to_file(value.to_flyte_idl(), path)
+
+
 class _FlyteClientManager(object):
 
     _CLIENT = None
@@ -33,6 +117,8 @@ class _FlyteClientManager(object):
         # TODO: React to changing configs.  For now this is frozen for the lifetime of the process, which covers most
         # TODO: use cases.
         if type(self)._CLIENT is None:
+            # The gRPC client stack is only imported when a client is needed, since executing tasks doesn't use one.
+            from flytekit.clients.friendly import SynchronousFlyteClient as _SynchronousFlyteClient
             type(self)._CLIENT = _SynchronousFlyteClient(*args, **kwargs)
 
     @property
@@ -247,36 +333,21 @@ class FlyteTask(_common_engine.BaseTaskExecutor):
                         _logging.getLogger().setLevel(log_level)
 
                         try:
-                            output_file_dict = self.sdk_task.execute(
-                                _common_engine.EngineContext(
-                                    execution_id=WorkflowExecutionIdentifier(
-                                        project=_internal_config.EXECUTION_PROJECT.get(),
-                                        domain=_internal_config.EXECUTION_DOMAIN.get(),
-                                        name=_internal_config.EXECUTION_NAME.get()
-                                    ),
-                                    execution_date=_datetime.utcnow(),
-                                    stats=_get_stats(
-                                        # Stats metric path will be:
-                                        # registration_project.registration_domain.app.module.task_name.user_stats
-                                        # and it will be tagged with execution-level values for project/domain/wf/lp
-                                        "{}.{}.{}.user_stats".format(
-                                            _internal_config.TASK_PROJECT.get() or _internal_config.PROJECT.get(),
-                                            _internal_config.TASK_DOMAIN.get() or _internal_config.DOMAIN.get(),
-                                            _internal_config.TASK_NAME.get() or _internal_config.NAME.get()
+                            with _tracing.span('run_task'):
+                                output_file_dict = self.sdk_task.execute(
+                                    _common_engine.EngineContext(
+                                        execution_id=WorkflowExecutionIdentifier(
+                                            project=_internal_config.EXECUTION_PROJECT.get(),
+                                            domain=_internal_config.EXECUTION_DOMAIN.get(),
+                                            name=_internal_config.EXECUTION_NAME.get()
                                         ),
-                                        tags={
-                                            'exec_project': _internal_config.EXECUTION_PROJECT.get(),
-                                            'exec_domain': _internal_config.EXECUTION_DOMAIN.get(),
-                                            'exec_workflow': _internal_config.EXECUTION_WORKFLOW.get(),
-                                            'exec_launchplan': _internal_config.EXECUTION_LAUNCHPLAN.get(),
-                                            'api_version': _api_version
-                                        }
+                                        execution_date=_datetime.utcnow(),
+                                        stats=get_task_stats('user_stats'),
+                                        logging=_logging,
+                                        tmp_dir=task_dir
                                     ),
-                                    logging=_logging,
-                                    tmp_dir=task_dir
-                                ),
-                                inputs
-                            )
+                                    inputs
+                                )
                         except _exception_scopes.FlyteScopedException as e:
                             _logging.error("!!! Begin Error Captured by Flyte !!!")
                             output_file_dict[_constants.ERROR_FILE_NAME] = _error_models.ErrorDocument(
@@ -301,12 +372,30 @@ class FlyteTask(_common_engine.BaseTaskExecutor):
                             _logging.error(exc_str)
                             _logging.error("!!! End Error Captured by Flyte !!!")
                         finally:
-                            for k, v in _six.iteritems(output_file_dict):
-                                _common_utils.write_proto_to_file(
-                                    v.to_flyte_idl(),
-                                    _os.path.join(temp_dir.name, k)
+                            # The files are written to as many directories as there are threads to upload them with.
+                            parallelism = max(1, _sdk_config.UPLOAD_PARALLELISM.get())
+                            local_dirs = [temp_dir.name] if parallelism == 1 else [
+                                _os.path.join(temp_dir.name, _six.text_type(i)) for i in _six.moves.range(parallelism)
+                            ]
+                            # Offloaded literals are typed as blobs, so only tasks that opt in get them.
+                            offloading_threshold = _sdk_config.LITERAL_OFFLOADING_THRESHOLD.get() \
+                                if self.sdk_task.offload_large_literals else 0
+                            with _tracing.span('serialize_outputs') as span:
+                                _write_output_files(
+                                    output_file_dict, local_dirs, context['output_prefix'], offloading_threshold
+                                )
+                                span.add_path_bytes(temp_dir.name)
+                            # Profiles of the user code are uploaded along with the outputs.
+                            profiles_dir = _os.path.join(task_dir.name, _constants.PROFILES_DIR)
+                            if _os.path.exists(profiles_dir):
+                                _shutil.move(profiles_dir, _os.path.join(local_dirs[0], _constants.PROFILES_DIR))
+                            with _tracing.span('upload_outputs'):
+                                _data_proxy.Data.put_directories(
+                                    [d for d in local_dirs if _os.path.exists(d)],
+                                    context['output_prefix'],
+                                    max_workers=parallelism,
+                                    retries=_sdk_config.UPLOAD_RETRIES.get()
                                 )
-                            _data_proxy.Data.put_data(temp_dir.name, context['output_prefix'], is_multipart=True)
 
 
 class FlyteWorkflowExecution(_common_engine.BaseWorkflowExecution):
@@ -0,0 +1,259 @@
+from __future__ import absolute_import
+
+import collections as _collections
+import importlib as _importlib
+import logging as _logging
+import multiprocessing as _multiprocessing
+import os as _os
+import pkgutil as _pkgutil
+import select as _select
+import sys as _sys
+import threading as _threading
+import traceback as _traceback
+
+import six as _six
+from concurrent import futures as _futures
+from six.moves import cPickle as _pickle
+
+from flytekit import plugins as _plugins
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.tools import lazy_loader as _lazy_loader
+
+
+class ForkServer(_futures.Executor):
+    """
+    Executes functions in worker processes forked from a server process, which imports the configured workflow
+    packages and the installed plugins once when it starts.  Every function call gets a fresh copy-on-write fork of
+    the server, so workers start in milliseconds no matter how expensive the imports are, and calls don't share state
+    with each other.
+
+    The server is forked from the process creating the executor, so it should be created before that process starts
+    threads.  Like with a process pool, functions, their arguments and their results must be picklable.
+    """
+
+    def __init__(self, max_workers, preload=None):
+        """
+        :param int max_workers: The maximum number of workers executing at the same time.
+        :param list[Text] preload: Modules to import in the server on top of the configured workflow packages.
+        """
+        self._connection, server_connection = _multiprocessing.Pipe()
+        self._server = _multiprocessing.Process(
+            target=_serve,
+            args=(
+                server_connection,
+                self._connection,
+                max_workers,
+                list(_sdk_config.WORKFLOW_PACKAGES.get()) + list(preload or [])
+            )
+        )
+        self._server.daemon = True
+        self._server.start()
+        server_connection.close()
+
+        self._lock = _threading.Lock()
+        self._futures = {}
+        self._next_request_id = 0
+        self._shutdown = False
+        self._receiver = _threading.Thread(target=self._receive)
+        self._receiver.daemon = True
+        self._receiver.start()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        :param (...) -> T fn: Must be defined at the top level of a module.
+        :rtype: concurrent.futures.Future
+        """
+        call = _pickle.dumps((fn, args, kwargs), _pickle.HIGHEST_PROTOCOL)
+        future = _futures.Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit new calls after the fork server was shut down.")
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            self._futures[request_id] = future
+            self._connection.send((request_id, call))
+        return future
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            # The server exits once the calls it was sent complete.
+            self._connection.send(None)
+        if wait:
+            self._receiver.join()
+            self._server.join()
+
+    def _receive(self):
+        while True:
+            try:
+                message = self._connection.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            request_id, result = message
+            with self._lock:
+                future = self._futures.pop(request_id)
+            try:
+                succeeded, value = _pickle.loads(result)
+            except Exception:
+                succeeded, value = False, _system_exceptions.FlyteSystemAssertion(
+                    "The result of the call could not be loaded:\n{}".format(_traceback.format_exc()))
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+        with self._lock:
+            lost, self._futures = self._futures, {}
+        for future in _six.itervalues(lost):
+            future.set_exception(_system_exceptions.FlyteSystemAssertion("The fork server exited unexpectedly."))
+
+
+def create_process_pool(max_workers, preload=None):
+    """
+    Creates a fork server if it is enabled and the platform supports it, or a regular process pool otherwise.
+
+    :param int max_workers:
+    :param list[Text] preload: Modules the fork server imports on top of the configured workflow packages.
+    :rtype: concurrent.futures.Executor
+    """
+    if _sdk_config.FORK_SERVER_ENABLED.get() and hasattr(_os, 'fork'):
+        return ForkServer(max_workers, preload=preload)
+    return _futures.ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _preload(modules):
+    """
+    Imports modules and plugins so that forked workers don't have to.  This is only an optimization, so failures are
+    logged and otherwise ignored.
+
+    :param list[Text] modules: Modules to import.  Sub-modules of packages are imported too.
+    """
+    for plugin in _six.itervalues(vars(_plugins)):
+        if isinstance(plugin, _lazy_loader.LazyLoadPlugin):
+            try:
+                plugin.load()
+            except ImportError:
+                # The plugin isn't installed.
+                pass
+
+    for name in modules:
+        try:
+            module = _importlib.import_module(name)
+            if hasattr(module, '__path__'):
+                for _, sub_module, _ in _pkgutil.walk_packages(module.__path__, prefix='{}.'.format(name)):
+                    _importlib.import_module(sub_module)
+        except Exception:
+            _logging.warning("The fork server could not preload {}:\n{}".format(name, _traceback.format_exc()))
+
+
+def _serve(connection, client_connection, max_workers, preload):
+    """
+    The main loop of the server process.  It forks a worker for every call it receives, up to max_workers at a time,
+    and sends back the results as workers complete.
+
+    :param multiprocessing.connection.Connection connection:
+    :param multiprocessing.connection.Connection client_connection: The other end of the connection, which is closed
+        so that the server notices when the client goes away.
+    :param int max_workers:
+    :param list[Text] preload:
+    """
+    client_connection.close()
+    _preload(preload)
+
+    pending = _collections.deque()
+    running = {}
+    shutting_down = False
+    while not shutting_down or pending or running:
+        while pending and len(running) < max_workers:
+            request_id, call = pending.popleft()
+            result_connection, pid = _fork_worker(call, connection)
+            running[result_connection] = (request_id, pid)
+
+        waiting = list(running) + ([] if shutting_down else [connection])
+        readable, _, _ = _select.select(waiting, [], [])
+        for ready in readable:
+            if ready is connection:
+                try:
+                    request = connection.recv()
+                except EOFError:
+                    request = None
+                if request is None:
+                    shutting_down = True
+                else:
+                    pending.append(request)
+                continue
+
+            request_id, pid = running.pop(ready)
+            try:
+                result = ready.recv_bytes()
+            except EOFError:
+                result = None
+            ready.close()
+            _, status = _os.waitpid(pid, 0)
+            if result is None:
+                result = _pickle.dumps((False, _system_exceptions.FlyteSystemAssertion(
+                    "The worker process executing the call exited with status {}.".format(status))))
+            _send(connection, (request_id, result))
+
+    _send(connection, None)
+    connection.close()
+
+
+def _send(connection, message):
+    """
+    :param multiprocessing.connection.Connection connection:
+    :param T message:
+    """
+    try:
+        connection.send(message)
+    except (IOError, OSError):
+        # The client went away, which isn't a reason to leave workers behind.
+        pass
+
+
+def _fork_worker(call, server_connection):
+    """
+    :param bytes call: The pickled function and its arguments.
+    :param multiprocessing.connection.Connection server_connection: The connection of the server to its client, which
+        workers don't use.
+    :returns: The connection the worker sends its result to and the pid of the worker.
+    :rtype: (multiprocessing.connection.Connection, int)
+    """
+    result_connection, worker_connection = _multiprocessing.Pipe(duplex=False)
+    pid = _os.fork()
+    if pid != 0:
+        worker_connection.close()
+        return result_connection, pid
+
+    status = 0
+    try:
+        result_connection.close()
+        server_connection.close()
+        error = None
+        try:
+            fn, args, kwargs = _pickle.loads(call)
+            message = (True, fn(*args, **kwargs))
+        except Exception as e:
+            message = (False, e)
+            error = _traceback.format_exc()
+        try:
+            result = _pickle.dumps(message, _pickle.HIGHEST_PROTOCOL)
+            # Exceptions in particular often pickle fine but can't be unpickled.
+            _pickle.loads(result)
+        except Exception:
+            result = _pickle.dumps((False, _system_exceptions.FlyteSystemAssertion(
+                "The result of the call could not be sent back from the worker process:\n{}".format(
+                    error or _traceback.format_exc()))))
+        worker_connection.send_bytes(result)
+    except BaseException:
+        status = 1
+    finally:
+        _sys.stdout.flush()
+        _sys.stderr.flush()
+        # Skip the exit handlers of the server, which belong to the process that created the fork server.
+        _os._exit(status)
@@ -7,7 +7,7 @@ import importlib as _importlib
 _ENGINE_NAME_TO_MODULES_CACHE = {
     'flyte': ('flytekit.engines.flyte.engine', 'FlyteEngineFactory', None),
     'unit': ('flytekit.engines.unit.engine', 'UnitTestEngineFactory', None),
-    # 'local': ('flytekit.engines.local.engine', 'EngineObjectFactory', None)
+    'local': ('flytekit.engines.local.engine', 'LocalEngineFactory', None),
 }
 
 
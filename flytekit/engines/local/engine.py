@@ -0,0 +1,631 @@
+from __future__ import absolute_import
+
+import importlib as _importlib
+import logging as _logging
+import multiprocessing as _multiprocessing
+import os as _os
+import random as _random
+import traceback as _traceback
+from datetime import datetime as _datetime
+
+import six as _six
+from concurrent import futures as _futures
+from flyteidl.core import literals_pb2 as _literals_pb2, dynamic_job_pb2 as _dynamic_job_pb2, \
+    errors_pb2 as _errors_pb2
+
+from flytekit.common import constants as _constants, utils as _common_utils, nodes as _nodes, \
+    launch_plan as _launch_plan, workflow as _workflow, local_cache as _local_cache, packed_inputs as _packed_inputs, \
+    spilled_inputs as _spilled_inputs
+from flytekit.common.exceptions import user as _user_exceptions, system as _system_exceptions, \
+    scopes as _exception_scopes
+from flytekit.common.types import helpers as _type_helpers
+from flytekit.configuration import TemporaryConfiguration as _TemporaryConfiguration, sdk as _sdk_config, \
+    internal as _internal_config
+from flytekit.engines import common as _common_engine, fork_server as _fork_server
+from flytekit.engines.unit.mock_stats import MockStats
+from flytekit.interfaces import random as _flyte_random
+from flytekit.interfaces.data import data_proxy as _data_proxy
+from flytekit.models import literals as _literals, array_job as _array_job, dynamic_job as _dynamic_job, \
+    task as _task_models
+from flytekit.models.core import errors as _error_models
+from flytekit.models.core.identifier import WorkflowExecutionIdentifier
+
+
+class LocalEngineFactory(_common_engine.BaseExecutionEngineFactory):
+
+    def get_task(self, sdk_task):
+        """
+        :param flytekit.common.tasks.task.SdkTask sdk_task:
+        :rtype: LocalTask
+        """
+        return LocalTask(sdk_task)
+
+    def get_workflow(self, sdk_workflow):
+        """
+        :param flytekit.common.workflow.SdkWorkflow sdk_workflow:
+        :rtype: LocalWorkflow
+        """
+        return LocalWorkflow(sdk_workflow)
+
+    def get_launch_plan(self, _):
+        raise _user_exceptions.FlyteAssertion(
+            "Launch plans can only be executed locally as nodes of a workflow.  Please execute the workflow instead."
+        )
+
+    def get_task_execution(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not return execution handles.")
+
+    def get_node_execution(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not return execution handles.")
+
+    def get_workflow_execution(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not return execution handles.")
+
+    def fetch_workflow_execution(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not fetch execution handles.")
+
+    def fetch_task(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not fetch remote tasks.")
+
+    def fetch_launch_plan(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not fetch remote launch plans.")
+
+    def fetch_workflow(self, _):
+        raise _user_exceptions.FlyteAssertion("Local executions do not fetch remote workflows.")
+
+
+class LocalWorkflow(_common_engine.BaseWorkflowExecutor):
+
+    def execute(self, inputs):
+        """
+        Runs every node of the workflow on this machine and returns the outputs of the workflow.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: dict[Text, T]
+        """
+        with _LocalExecution() as execution:
+            outputs = execution.execute_workflow(self.sdk_workflow, inputs)
+            return _unpack_outputs(outputs, self.sdk_workflow.interface.outputs)
+
+    def register(self, identifier):
+        raise _user_exceptions.FlyteAssertion("You cannot register local workflows.")
+
+
+class LocalTask(_common_engine.BaseTaskExecutor):
+
+    def execute(self, inputs, context=None):
+        """
+        If an output prefix is provided in the context, the task is executed in this process and the files it
+        produces are written under the prefix, exactly as pyflyte-execute would do it.  Otherwise, the task is
+        scheduled like a single node workflow, including any sub-tasks it yields, and its outputs are returned as a
+        user-readable dictionary.
+
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param dict[Text, Text] context:
+        :rtype: dict[Text, T]
+        """
+        if context and 'output_prefix' in context:
+            return self._execute_and_write_outputs(inputs, context['output_prefix'])
+
+        with _LocalExecution() as execution:
+            outputs = execution.execute_task(self.sdk_task, inputs)
+            return _unpack_outputs(outputs, self.sdk_task.interface.outputs)
+
+    def _execute_and_write_outputs(self, inputs, output_prefix):
+        """
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param Text output_prefix:
+        """
+        with _common_utils.AutoDeletingTempDir("engine_dir") as temp_dir:
+            with _common_utils.AutoDeletingTempDir("task_dir") as task_dir:
+                with _data_proxy.LocalWorkingDirectoryContext(task_dir):
+                    with _data_proxy.LocalDataContext(_sdk_config.LOCAL_SANDBOX.get()):
+                        output_file_dict = dict()
+                        try:
+                            output_file_dict = self.sdk_task.execute(
+                                _common_engine.EngineContext(
+                                    execution_id=WorkflowExecutionIdentifier(
+                                        project='local',
+                                        domain='local',
+                                        name=_os.path.basename(_os.path.normpath(output_prefix))
+                                    ),
+                                    execution_date=_datetime.utcnow(),
+                                    stats=MockStats(),
+                                    logging=_logging,
+                                    tmp_dir=task_dir
+                                ),
+                                inputs
+                            )
+                        except _exception_scopes.FlyteScopedException as e:
+                            output_file_dict[_constants.ERROR_FILE_NAME] = _error_models.ErrorDocument(
+                                _error_models.ContainerError(
+                                    e.error_code,
+                                    e.verbose_message,
+                                    e.kind
+                                )
+                            )
+                        except Exception:
+                            output_file_dict[_constants.ERROR_FILE_NAME] = _error_models.ErrorDocument(
+                                _error_models.ContainerError(
+                                    "SYSTEM:Unknown",
+                                    _traceback.format_exc(),
+                                    _error_models.ContainerError.Kind.RECOVERABLE
+                                )
+                            )
+                        finally:
+                            for k, v in _six.iteritems(output_file_dict):
+                                if isinstance(v, (_packed_inputs.PackedLiteralMaps, _spilled_inputs.SpilledLiteralMap)):
+                                    v.write(_os.path.join(temp_dir.name, k))
+                                    continue
+                                _common_utils.write_proto_to_file(
+                                    v.to_flyte_idl(),
+                                    _os.path.join(temp_dir.name, k)
+                                )
+                            _data_proxy.Data.put_data(temp_dir.name, output_prefix, is_multipart=True)
+
+    def register(self, identifier):
+        raise _user_exceptions.FlyteAssertion("You cannot register local tasks.")
+
+
+def _unpack_outputs(outputs, output_variables):
+    """
+    :param dict[Text, flytekit.models.literals.Literal] outputs:
+    :param dict[Text, flytekit.models.interface.Variable] output_variables:
+    :rtype: dict[Text, T]
+    """
+    return _type_helpers.unpack_literal_map_to_sdk_python_std(
+        _literals.LiteralMap(literals=outputs),
+        {k: _type_helpers.get_sdk_type_from_literal_type(v.type) for k, v in _six.iteritems(output_variables)}
+    )
+
+
+def _launch_plan_inputs(sdk_launch_plan, inputs):
+    """
+    Completes the inputs of a launch plan node with the fixed and default inputs of the launch plan.
+    :param flytekit.common.launch_plan.SdkRunnableLaunchPlan sdk_launch_plan:
+    :param dict[Text, flytekit.models.literals.Literal] inputs:
+    :rtype: dict[Text, flytekit.models.literals.Literal]
+    """
+    literals = {
+        k: p.default
+        for k, p in _six.iteritems(sdk_launch_plan.default_inputs.parameters) if p.default is not None
+    }
+    literals.update(sdk_launch_plan.fixed_inputs.literals)
+    literals.update(inputs)
+    return literals
+
+
+def _entity_key(identifier):
+    """
+    :param flytekit.models.core.identifier.Identifier identifier:
+    :rtype: tuple
+    """
+    return identifier.resource_type, identifier.project, identifier.domain, identifier.name, identifier.version
+
+
+def _task_entrypoint(task):
+    """
+    Finds the module and name of the Python code a task runs from the pyflyte-execute arguments of its container.
+    :param flytekit.models.task.TaskTemplate task:
+    :rtype: (Text, Text)
+    """
+    args = list(task.container.args) if task.container is not None else []
+    try:
+        return args[args.index('--task-module') + 1], args[args.index('--task-name') + 1]
+    except (ValueError, IndexError):
+        raise _user_exceptions.FlyteAssertion(
+            "The local engine can only execute tasks that run Python code with pyflyte-execute.  Task {} of type {} "
+            "is not supported.".format(task.id, task.type)
+        )
+
+
+def _execute_task_in_worker(task_module, task_name, inputs_path, output_prefix):
+    """
+    The entrypoint of a task executed by the local engine.  Like pyflyte-execute, the task is loaded from its module,
+    so this can run in a separate process.
+
+    :param Text task_module:
+    :param Text task_name:
+    :param Text inputs_path:
+    :param Text output_prefix:
+    """
+    # Forked worker processes share the random state of their parent, which would lead to colliding output paths.
+    _flyte_random.seed_flyte_random("{} {} {}".format(_random.random(), _datetime.utcnow(), _os.getpid()))
+    task_def = getattr(_importlib.import_module(task_module), task_name)
+    LocalTask(task_def).execute(
+        _literals.LiteralMap.from_flyte_idl(_common_utils.load_proto_from_file(_literals_pb2.LiteralMap, inputs_path)),
+        context={'output_prefix': output_prefix}
+    )
+
+
+class _LocalExecution(object):
+    """
+    Executes workflows on the local machine.  Nodes are scheduled as soon as all of their upstream nodes have
+    completed, so independent nodes run concurrently.  Each task runs in a worker process and passes its outputs to
+    downstream nodes through files in the local sandbox.
+    """
+
+    def __init__(self):
+        parallelism = _sdk_config.LOCAL_EXECUTION_PARALLELISM.get()
+        self._parallelism = parallelism if parallelism > 0 else _multiprocessing.cpu_count()
+        self._working_directory = None
+        self._process_pool = None
+        self._memo_store = _local_cache.get_memo_store()
+        self._temporary_configuration = None
+
+    def __enter__(self):
+        # Task templates are serialized to be passed between nodes, which requires an image to be configured even though
+        # no container is ever started.
+        try:
+            _internal_config.IMAGE.get()
+        except _user_exceptions.FlyteAssertion:
+            self._temporary_configuration = _TemporaryConfiguration(
+                _internal_config.CONFIGURATION_PATH.get(),
+                internal_overrides={'image': 'local_image'}
+            )
+            self._temporary_configuration.__enter__()
+
+        # The files nodes pass to each other are only needed for the duration of the execution.
+        executions_directory = _os.path.join(_sdk_config.LOCAL_SANDBOX.get(), 'local_executions')
+        if not _os.path.exists(executions_directory):
+            _os.makedirs(executions_directory)
+        self._working_directory = _common_utils.AutoDeletingTempDir(tmp_dir=executions_directory)
+        self._working_directory.__enter__()
+
+        if self._parallelism > 1:
+            self._process_pool = _fork_server.create_process_pool(self._parallelism)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+        finally:
+            self._working_directory.__exit__(exc_type, exc_val, exc_tb)
+            if self._temporary_configuration is not None:
+                self._temporary_configuration.__exit__(exc_type, exc_val, exc_tb)
+                self._temporary_configuration = None
+
+    @property
+    def working_directory(self):
+        """
+        :rtype: Text
+        """
+        return self._working_directory.name
+
+    def execute_workflow(self, sdk_workflow, inputs):
+        """
+        :param flytekit.common.workflow.SdkWorkflow sdk_workflow:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        return self._execute_graph(
+            sdk_workflow.nodes,
+            sdk_workflow.outputs,
+            inputs.literals,
+            self.working_directory,
+            {},
+            {}
+        )
+
+    def execute_task(self, sdk_task, inputs):
+        """
+        :param flytekit.common.tasks.task.SdkTask sdk_task:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        return self._execute_task_node(
+            _task_models.TaskTemplate.from_flyte_idl(sdk_task.to_flyte_idl()),
+            inputs.literals,
+            _os.path.join(self.working_directory, _common_utils._dnsify(sdk_task.id.name)),
+            {},
+            {}
+        )
+
+    def _execute_graph(self, nodes, output_bindings, inputs, working_directory, tasks, workflows):
+        """
+        :param list[flytekit.models.core.workflow.Node] nodes:
+        :param list[flytekit.models.literals.Binding] output_bindings:
+        :param dict[Text, flytekit.models.literals.Literal] inputs:
+        :param Text working_directory:
+        :param dict[tuple, flytekit.models.task.TaskTemplate] tasks: Tasks referenced by generated nodes.
+        :param dict[tuple, flytekit.models.core.workflow.WorkflowTemplate] workflows: Sub-workflows referenced by
+            generated nodes.
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        node_outputs = {_constants.GLOBAL_INPUT_NODE_ID: inputs}
+        remaining = list(nodes)
+        running = {}
+
+        # Threads only orchestrate nodes, the actual work is bounded by the size of the process pool.
+        with _futures.ThreadPoolExecutor(max_workers=max(1, min(len(remaining), self._parallelism))) as executor:
+            while remaining or running:
+                blocked = []
+                for node in remaining:
+                    if not all(d in node_outputs for d in _node_dependencies(node)):
+                        blocked.append(node)
+                        continue
+                    node_inputs = {b.var: _fulfil_binding(b.binding, node_outputs) for b in node.inputs}
+                    future = executor.submit(self._execute_node, node, node_inputs, working_directory, tasks,
+                                             workflows)
+                    running[future] = node
+                remaining = blocked
+
+                if not running:
+                    raise _user_exceptions.FlyteAssertion(
+                        "The nodes {} can never be scheduled because they depend on nodes that do not exist.".format(
+                            [n.id for n in remaining]
+                        )
+                    )
+
+                done, _ = _futures.wait(running, return_when=_futures.FIRST_COMPLETED)
+                for future in done:
+                    node_outputs[running.pop(future).id] = future.result()
+
+        return {b.var: _fulfil_binding(b.binding, node_outputs) for b in output_bindings}
+
+    def _execute_node(self, node, inputs, working_directory, tasks, workflows):
+        """
+        :param flytekit.models.core.workflow.Node node:
+        :param dict[Text, flytekit.models.literals.Literal] inputs:
+        :param Text working_directory:
+        :param dict[tuple, flytekit.models.task.TaskTemplate] tasks:
+        :param dict[tuple, flytekit.models.core.workflow.WorkflowTemplate] workflows:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        node_directory = _os.path.join(working_directory, node.id)
+        if isinstance(node, _nodes.SdkNode):
+            # Nodes declared in Python reference their entities directly since they might not be registered yet.
+            entity = node.executable_sdk_object
+            if isinstance(entity, _launch_plan.SdkRunnableLaunchPlan):
+                sub_workflow = entity.sdk_workflow
+                inputs = _launch_plan_inputs(entity, inputs)
+            elif isinstance(entity, _workflow.SdkWorkflow):
+                sub_workflow = entity
+            elif node.task_node is not None:
+                # Copy the template, since generating dynamic jobs in this process can modify tasks in place.
+                task = _task_models.TaskTemplate.from_flyte_idl(entity.to_flyte_idl())
+                return self._execute_task_node(task, inputs, node_directory, tasks, workflows)
+            else:
+                raise _user_exceptions.FlyteAssertion(
+                    "The local engine can not execute node {}.  Only task, sub-workflow and launch plan nodes are "
+                    "supported.".format(node.id)
+                )
+        elif node.task_node is not None:
+            task = tasks[_entity_key(node.task_node.reference_id)]
+            if task.type == _constants.SdkTaskType.CONTAINER_ARRAY_TASK:
+                return self._execute_array_task_node(task, node_directory)
+            return self._execute_task_node(task, inputs, node_directory, tasks, workflows)
+        elif node.workflow_node is not None and node.workflow_node.sub_workflow_ref is not None:
+            sub_workflow = workflows[_entity_key(node.workflow_node.sub_workflow_ref)]
+        else:
+            raise _user_exceptions.FlyteAssertion(
+                "The local engine can not execute node {}.  Only task and sub-workflow nodes are supported in "
+                "dynamic jobs.".format(node.id)
+            )
+        return self._execute_graph(sub_workflow.nodes, sub_workflow.outputs, inputs, node_directory, tasks, workflows)
+
+    def _execute_task_node(self, task, inputs, node_directory, tasks, workflows):
+        """
+        Executes a task, unless it is discoverable and the memo store holds the outputs of an earlier execution with
+        the same inputs.
+
+        :param flytekit.models.task.TaskTemplate task:
+        :param dict[Text, flytekit.models.literals.Literal] inputs:
+        :param Text node_directory:
+        :param dict[tuple, flytekit.models.task.TaskTemplate] tasks:
+        :param dict[tuple, flytekit.models.core.workflow.WorkflowTemplate] workflows:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        memo_key = self._memo_key(task)
+        if memo_key is None:
+            return self._run_task_node(task, inputs, node_directory, tasks, workflows)
+
+        inputs_map = _literals.LiteralMap(literals=inputs)
+        outputs = self._memo_store.get(memo_key[0], memo_key[1], inputs_map)
+        if outputs is not None:
+            return outputs.literals
+
+        outputs = self._run_task_node(task, inputs, node_directory, tasks, workflows)
+        self._memo_store.put(memo_key[0], memo_key[1], inputs_map, _literals.LiteralMap(literals=outputs))
+        return outputs
+
+    def _run_task_node(self, task, inputs, node_directory, tasks, workflows):
+        """
+        :param flytekit.models.task.TaskTemplate task:
+        :param dict[Text, flytekit.models.literals.Literal] inputs:
+        :param Text node_directory:
+        :param dict[tuple, flytekit.models.task.TaskTemplate] tasks:
+        :param dict[tuple, flytekit.models.core.workflow.WorkflowTemplate] workflows:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        inputs_path = _os.path.join(node_directory, _constants.INPUT_FILE_NAME)
+        _common_utils.write_proto_to_file(_literals.LiteralMap(literals=inputs).to_flyte_idl(), inputs_path)
+        self._submit(task, inputs_path, node_directory).result()
+
+        futures_path = _os.path.join(node_directory, _constants.FUTURES_FILE_NAME)
+        if not _os.path.exists(futures_path):
+            return self._read_outputs(node_directory)
+
+        # The node generated a dynamic job, the outputs of the node are produced by the nodes it yielded.
+        spec = _dynamic_job.DynamicJobSpec.from_flyte_idl(
+            _common_utils.load_proto_from_file(_dynamic_job_pb2.DynamicJobSpec, futures_path)
+        )
+        sub_tasks = dict(tasks)
+        sub_tasks.update({_entity_key(t.id): t for t in spec.tasks})
+        sub_workflows = dict(workflows)
+        sub_workflows.update({_entity_key(w.id): w for w in spec.subworkflows})
+        return self._execute_graph(spec.nodes, spec.outputs, {}, node_directory, sub_tasks, sub_workflows)
+
+    def _execute_array_task_node(self, task, node_directory):
+        """
+        The inputs of each sub-task of an array job have already been written by the dynamic task that generated it,
+        either to a file of their own or to the packed inputs file of the array job.
+        :param flytekit.models.task.TaskTemplate task:
+        :param Text node_directory:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        memo_key = self._memo_key(task)
+        sub_task_outputs = {}
+        submitted = {}
+        sub_task_inputs = {}
+        packed_inputs_file = task.container.env.get(_constants.ARRAY_PACKED_INPUTS_ENV_VAR)
+        packed_inputs = None
+        if packed_inputs_file:
+            packed_inputs = _packed_inputs.PackedLiteralMaps.read(_os.path.join(node_directory, packed_inputs_file))
+        for i in _six.moves.range(_array_sub_task_count(task)):
+            sub_task_directory = _os.path.join(node_directory, _six.text_type(i))
+            inputs_path = _os.path.join(sub_task_directory, _constants.INPUT_FILE_NAME)
+            if packed_inputs is not None:
+                # Tasks are executed from an inputs file, like every container of an unpacked array job.
+                _common_utils.write_proto_to_file(packed_inputs.literal_maps[i].to_flyte_idl(), inputs_path)
+            if memo_key is not None:
+                sub_task_inputs[i] = _literals.LiteralMap.from_flyte_idl(
+                    _common_utils.load_proto_from_file(_literals_pb2.LiteralMap, inputs_path)
+                )
+                cached = self._memo_store.get(memo_key[0], memo_key[1], sub_task_inputs[i])
+                if cached is not None:
+                    sub_task_outputs[i] = cached.literals
+                    continue
+            submitted[i] = (self._submit(task, inputs_path, sub_task_directory), sub_task_directory)
+
+        for i, (future, sub_task_directory) in _six.iteritems(submitted):
+            future.result()
+            sub_task_outputs[i] = self._read_outputs(sub_task_directory)
+            if memo_key is not None:
+                self._memo_store.put(
+                    memo_key[0],
+                    memo_key[1],
+                    sub_task_inputs[i],
+                    _literals.LiteralMap(literals=sub_task_outputs[i])
+                )
+
+        outputs = {}
+        for i, sub_task_output in _six.iteritems(sub_task_outputs):
+            for var, literal in _six.iteritems(sub_task_output):
+                outputs["[{}].{}".format(i, var)] = literal
+        return outputs
+
+    def _memo_key(self, task):
+        """
+        :param flytekit.models.task.TaskTemplate task:
+        :returns: The task name and discovery version the outputs of the task are memoized under, or None if the
+            outputs of the task aren't memoized.
+        :rtype: (Text, Text)|None
+        """
+        if self._memo_store is None or not task.metadata.discoverable:
+            return None
+        return "{}.{}".format(*_task_entrypoint(task)), task.metadata.discovery_version
+
+    def _submit(self, task, inputs_path, output_prefix):
+        """
+        :param flytekit.models.task.TaskTemplate task:
+        :param Text inputs_path:
+        :param Text output_prefix:
+        :rtype: concurrent.futures.Future
+        """
+        task_module, task_name = _task_entrypoint(task)
+        if self._process_pool is not None:
+            return self._process_pool.submit(_execute_task_in_worker, task_module, task_name, inputs_path,
+                                             output_prefix)
+
+        future = _futures.Future()
+        try:
+            _execute_task_in_worker(task_module, task_name, inputs_path, output_prefix)
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @staticmethod
+    def _read_outputs(output_prefix):
+        """
+        :param Text output_prefix:
+        :rtype: dict[Text, flytekit.models.literals.Literal]
+        """
+        error_path = _os.path.join(output_prefix, _constants.ERROR_FILE_NAME)
+        if _os.path.exists(error_path):
+            error = _error_models.ErrorDocument.from_flyte_idl(
+                _common_utils.load_proto_from_file(_errors_pb2.ErrorDocument, error_path)
+            ).error
+            raise _user_exceptions.FlyteAssertion(
+                "The task executed in {} failed with error code {}:\n{}".format(
+                    output_prefix,
+                    error.code,
+                    error.message
+                )
+            )
+
+        outputs_path = _os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME)
+        if not _os.path.exists(outputs_path):
+            return {}
+        return _literals.LiteralMap.from_flyte_idl(
+            _common_utils.load_proto_from_file(_literals_pb2.LiteralMap, outputs_path)
+        ).literals
+
+
+def _array_sub_task_count(task):
+    """
+    The number of sub-tasks of an array job.  When the dynamic task packs several sub-tasks into each container, this is
+    larger than the size of the array job.
+    :param flytekit.models.task.TaskTemplate task:
+    :rtype: int
+    """
+    sub_task_count = task.container.env.get(_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR)
+    if sub_task_count is not None:
+        return int(sub_task_count)
+    return _array_job.ArrayJob.from_dict(task.custom).size
+
+
+def _node_dependencies(node):
+    """
+    :param flytekit.models.core.workflow.Node node:
+    :rtype: set[Text]
+    """
+    dependencies = set(node.upstream_node_ids)
+    for binding in node.inputs:
+        dependencies.update(_promised_node_ids(binding.binding))
+    dependencies.discard(_constants.GLOBAL_INPUT_NODE_ID)
+    return dependencies
+
+
+def _promised_node_ids(binding_data):
+    """
+    :param flytekit.models.literals.BindingData binding_data:
+    :rtype: list[Text]
+    """
+    if binding_data.promise is not None:
+        return [binding_data.promise.node_id]
+    elif binding_data.collection is not None:
+        return [i for b in binding_data.collection.bindings for i in _promised_node_ids(b)]
+    elif binding_data.map is not None:
+        return [i for b in _six.itervalues(binding_data.map.bindings) for i in _promised_node_ids(b)]
+    return []
+
+
+def _fulfil_binding(binding_data, node_outputs):
+    """
+    Substitutes the promises in binding_data with the literals produced by upstream nodes.
+    :param flytekit.models.literals.BindingData binding_data:
+    :param dict[Text, dict[Text, flytekit.models.literals.Literal]] node_outputs:
+    :rtype: flytekit.models.literals.Literal
+    """
+    if binding_data.scalar is not None:
+        return _literals.Literal(scalar=binding_data.scalar)
+    elif binding_data.collection is not None:
+        return _literals.Literal(collection=_literals.LiteralCollection(
+            [_fulfil_binding(b, node_outputs) for b in binding_data.collection.bindings]
+        ))
+    elif binding_data.map is not None:
+        return _literals.Literal(map=_literals.LiteralMap(
+            {k: _fulfil_binding(b, node_outputs) for k, b in _six.iteritems(binding_data.map.bindings)}
+        ))
+
+    promise = binding_data.promise
+    if promise.node_id not in node_outputs:
+        raise _system_exceptions.FlyteSystemAssertion(
+            "Expecting output of node [{}] but that hasn't been produced.".format(promise.node_id))
+    if promise.var not in node_outputs[promise.node_id]:
+        raise _system_exceptions.FlyteSystemAssertion(
+            "Expecting output [{}] of node [{}] but that hasn't been produced.".format(promise.var, promise.node_id))
+    return node_outputs[promise.node_id][promise.var]
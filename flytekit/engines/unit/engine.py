@@ -1,24 +1,37 @@
 from __future__ import absolute_import
 
+import importlib as _importlib
 import logging as _logging
+import multiprocessing as _multiprocessing
 import os as _os
+import traceback as _traceback
 
 import six as _six
+from concurrent import futures as _futures
 from datetime import datetime as _datetime
 from six import moves as _six_moves
 
 from google.protobuf.json_format import ParseDict as _ParseDict
+from flyteidl.core import literals_pb2 as _literals_pb2
 from flyteidl.plugins import qubole_pb2 as _qubole_pb2
-from flytekit.common import constants as _sdk_constants, utils as _common_utils
-from flytekit.common.exceptions import user as _user_exceptions, system as _system_exception
+from flytekit.common import constants as _sdk_constants, local_cache as _local_cache, \
+    spilled_inputs as _spilled_inputs, utils as _common_utils
+from flytekit.common.exceptions import scopes as _exception_scopes, user as _user_exceptions, \
+    system as _system_exception
 from flytekit.common.types import helpers as _type_helpers
-from flytekit.configuration import TemporaryConfiguration as _TemporaryConfiguration
-from flytekit.engines import common as _common_engine
+from flytekit.configuration import TemporaryConfiguration as _TemporaryConfiguration, sdk as _sdk_config
+from flytekit.engines import common as _common_engine, fork_server as _fork_server
 from flytekit.engines.unit.mock_stats import MockStats
 from flytekit.interfaces.data import data_proxy as _data_proxy
 from flytekit.models import literals as _literals, array_job as _array_job, qubole as _qubole_models
 from flytekit.models.core.identifier import WorkflowExecutionIdentifier
 
+_UNIT_TEST_CONFIG_PATH = _os.path.join(_os.path.dirname(__file__), 'unit.config')
+
+# Set in worker processes so that dynamic tasks executed there run their own sub-tasks serially instead of starting yet
+# another pool of processes.
+_IN_WORKER_PROCESS = False
+
 
 class UnitTestEngineFactory(_common_engine.BaseExecutionEngineFactory):
 
@@ -76,6 +89,10 @@ class UnitTestEngineFactory(_common_engine.BaseExecutionEngineFactory):
 
 
 class UnitTestEngineTask(_common_engine.BaseTaskExecutor):
+
+    # Whether the task can be satisfied by outputs from the local memo store.
+    _MEMOIZABLE = False
+
     def execute(self, inputs, context=None):
         """
         Just execute the function and return the outputs as a user-readable dictionary.
@@ -83,13 +100,41 @@ class UnitTestEngineTask(_common_engine.BaseTaskExecutor):
         :param context:
         :rtype: dict[Text,flytekit.models.common.FlyteIdlEntity]
         """
-        with _TemporaryConfiguration(
-            _os.path.join(_os.path.dirname(__file__), 'unit.config'),
-            internal_overrides={'image': 'unit_image'}
-        ):
-            with _common_utils.AutoDeletingTempDir("unit_test_dir") as working_directory:
-                with _data_proxy.LocalWorkingDirectoryContext(working_directory):
-                    return self._transform_for_user_output(self._execute_user_code(inputs))
+        with _TemporaryConfiguration(_UNIT_TEST_CONFIG_PATH, internal_overrides={'image': 'unit_image'}):
+            return self._execute_in_working_directory(inputs)
+
+    def _execute_in_working_directory(self, inputs):
+        """
+        Executes the task in a working directory of its own.  The unit test configuration must already be active.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: T
+        """
+        with _common_utils.AutoDeletingTempDir("unit_test_dir") as working_directory:
+            with _data_proxy.LocalWorkingDirectoryContext(working_directory):
+                return self._transform_for_user_output(self._execute_memoized(inputs))
+
+    def _execute_memoized(self, inputs):
+        """
+        Executes the user code, unless the task is discoverable and the local memo store holds the outputs of an earlier
+        execution with the same inputs.
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: dict[Text,flytekit.models.common.FlyteIdlEntity]
+        """
+        memo_store = _local_cache.get_memo_store() if self._MEMOIZABLE else None
+        task_module = getattr(self.sdk_task, 'task_module', None)
+        if memo_store is None or task_module is None or not self.sdk_task.metadata.discoverable:
+            return self._execute_user_code(inputs)
+
+        task_name = "{}.{}".format(task_module, self.sdk_task.task_function_name)
+        discovery_version = self.sdk_task.metadata.discovery_version
+        outputs = memo_store.get(task_name, discovery_version, inputs)
+        if outputs is not None:
+            return {_sdk_constants.OUTPUT_FILE_NAME: outputs}
+
+        results = self._execute_user_code(inputs)
+        if _sdk_constants.OUTPUT_FILE_NAME in results:
+            memo_store.put(task_name, discovery_version, inputs, results[_sdk_constants.OUTPUT_FILE_NAME])
+        return results
 
     def _execute_user_code(self, inputs):
         """
@@ -97,20 +142,28 @@ class UnitTestEngineTask(_common_engine.BaseTaskExecutor):
         :rtype: dict[Text,flytekit.models.common.FlyteIdlEntity]
         """
         with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
-            return self.sdk_task.execute(
-                _common_engine.EngineContext(
-                    execution_id=WorkflowExecutionIdentifier(
-                        project='unit_test',
-                        domain='unit_test',
-                        name='unit_test'
-                    ),
-                    execution_date=_datetime.utcnow(),
-                    stats=MockStats(),
-                    logging=_logging,  # TODO: A mock logging object that we can read later.
-                    tmp_dir=user_working_directory
+            return self._execute_user_code_in(inputs, user_working_directory)
+
+    def _execute_user_code_in(self, inputs, user_working_directory):
+        """
+        :param flytekit.models.literals.LiteralMap inputs:
+        :param flytekit.common.utils.AutoDeletingTempDir user_working_directory:
+        :rtype: dict[Text,flytekit.models.common.FlyteIdlEntity]
+        """
+        return self.sdk_task.execute(
+            _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(
+                    project='unit_test',
+                    domain='unit_test',
+                    name='unit_test'
                 ),
-                inputs
-            )
+                execution_date=_datetime.utcnow(),
+                stats=MockStats(),
+                logging=_logging,  # TODO: A mock logging object that we can read later.
+                tmp_dir=user_working_directory
+            ),
+            inputs
+        )
 
     def _transform_for_user_output(self, outputs):
         """
@@ -126,6 +179,9 @@ class UnitTestEngineTask(_common_engine.BaseTaskExecutor):
 
 
 class ReturnOutputsTask(UnitTestEngineTask):
+
+    _MEMOIZABLE = True
+
     def _transform_for_user_output(self, outputs):
         """
         Just return the outputs as a user-readable dictionary.
@@ -145,21 +201,69 @@ class ReturnOutputsTask(UnitTestEngineTask):
 
 class DynamicTask(ReturnOutputsTask):
 
-    def _execute_user_code(self, inputs):
+    def _execute_user_code_in(self, inputs, user_working_directory):
         """
+        The sub-tasks are executed before the working directory is deleted, since the dynamic task may have written
+        their inputs there.
+
         :param flytekit.models.literals.LiteralMap inputs:
+        :param flytekit.common.utils.AutoDeletingTempDir user_working_directory:
         :rtype: dict[Text,flytekit.models.common.FlyteIdlEntity]
         """
-        results = super(DynamicTask, self)._execute_user_code(inputs)
+        results = super(DynamicTask, self)._execute_user_code_in(inputs, user_working_directory)
         if _sdk_constants.FUTURES_FILE_NAME in results:
             futures = results[_sdk_constants.FUTURES_FILE_NAME]
-            sub_task_outputs = {}
-            tasks_map = {task.id: task for task in futures.tasks}
+            with _create_sub_task_executor() as executor:
+                sub_task_outputs = DynamicTask._execute_future_nodes(futures, results, executor)
+
+            # Every node has completed at this point, so all the promises in the output bindings can be resolved.
+            results[_sdk_constants.OUTPUT_FILE_NAME] = _literals.LiteralMap(
+                literals={
+                    binding.var: DynamicTask.fulfil_bindings(binding.binding, sub_task_outputs)
+                    for binding in futures.outputs
+                }
+            )
+        return results
 
-            for future_node in futures.nodes:
+    @staticmethod
+    def _execute_future_nodes(futures, generated_files, executor):
+        """
+        Executes the nodes of a dynamic job.  A node is submitted to the executor as soon as all the nodes it depends on
+        have completed, so independent nodes, as well as the sub-tasks of array jobs, run concurrently when the executor
+        allows it.
+
+        :param flytekit.models.dynamic_job.DynamicJobSpec futures:
+        :param dict[Text,flytekit.models.common.FlyteIdlEntity] generated_files:
+        :param concurrent.futures.Executor executor:
+        :rtype: dict[Text,T]
+        """
+        tasks_map = {task.id: task for task in futures.tasks}
+        node_ids = {node.id for node in futures.nodes}
+        sub_task_outputs = {}
+        array_outputs = {}
+        array_pending = {}
+        running = {}
+        remaining = list(futures.nodes)
+
+        while remaining or running:
+            blocked = []
+            for future_node in remaining:
+                # Only nodes of this dynamic job can hold up a node, anything else upstream has completed already.
+                if any(n in node_ids and n not in sub_task_outputs for n in future_node.upstream_node_ids):
+                    blocked.append(future_node)
+                    continue
+
+                if future_node.task_node is None:
+                    raise _user_exceptions.FlyteAssertion(
+                        "Unit testing of dynamic tasks that yield workflows or launch plans is not currently "
+                        "supported, node {} does not run a task.".format(future_node.id))
                 task = tasks_map[future_node.task_node.reference_id]
                 if task.type == _sdk_constants.SdkTaskType.CONTAINER_ARRAY_TASK:
-                    sub_task_output = DynamicTask.execute_array_task(future_node.id, task, results)
+                    submitted = DynamicTask._submit_array_task(future_node.id, task, generated_files, executor)
+                    array_outputs[future_node.id] = {}
+                    array_pending[future_node.id] = len(submitted)
+                    for job_index, sub_task_future in submitted:
+                        running[sub_task_future] = (future_node.id, job_index)
                 elif task.type == _sdk_constants.SdkTaskType.HIVE_JOB:
                     # TODO: futures.outputs should have the Schema instances.
                     # After schema is implemented, fill out random data into the random locations
@@ -167,45 +271,87 @@ class DynamicTask(ReturnOutputsTask):
                     # Even though we recommend people use typed schemas, they might not always do so...
                     # in which case it'll be impossible to predict the actual schema, we should support a
                     # way for unit test authors to provide fake data regardless
-                    sub_task_output = None
+                    sub_task_outputs[future_node.id] = None
                 else:
                     inputs_path = _os.path.join(future_node.id, _sdk_constants.INPUT_FILE_NAME)
-                    if inputs_path not in results:
+                    if inputs_path not in generated_files:
                         raise _system_exception.FlyteSystemAssertion(
                             "dynamic task hasn't generated expected inputs document [{}] found {}".format(
-                                future_node.id, list(results.keys())))
-                    sub_task_output = UnitTestEngineFactory().get_task(task).execute(results[inputs_path])
-                sub_task_outputs[future_node.id] = sub_task_output
+                                future_node.id, list(generated_files.keys())))
+                    submitted = executor.submit(
+                        UnitTestEngineFactory().get_task(task), _load_inputs(generated_files[inputs_path]))
+                    running[submitted] = (future_node.id, None)
 
-            results[_sdk_constants.OUTPUT_FILE_NAME] = _literals.LiteralMap(
-                literals={
-                    binding.var: DynamicTask.fulfil_bindings(binding.binding, sub_task_outputs)
-                    for binding in futures.outputs
-                }
-            )
-        return results
+            # Array jobs of size zero complete without running anything.
+            for node_id in [n for n, count in _six.iteritems(array_pending) if count == 0]:
+                del array_pending[node_id]
+                sub_task_outputs[node_id] = array_outputs.pop(node_id)
+
+            if len(blocked) == len(remaining) and not running:
+                raise _system_exception.FlyteSystemAssertion(
+                    "dynamic task generated nodes {} that depend on nodes which are never executed.".format(
+                        [n.id for n in blocked]))
+            remaining = blocked
+            if not running:
+                continue
+
+            done, _ = _futures.wait(running, return_when=_futures.FIRST_COMPLETED)
+            for completed in done:
+                node_id, job_index = running.pop(completed)
+                if job_index is None:
+                    sub_task_outputs[node_id] = completed.result()
+                    continue
+
+                # All outputs generated by the same array job will have the same key in sub_task_outputs,
+                # they will, however, differ in the var names; they will be on the format [<job_index>].<var_name>
+                # e.g. [1].out1
+                for key, val in _six.iteritems(completed.result()):
+                    array_outputs[node_id]["[{}].{}".format(job_index, key)] = val
+                array_pending[node_id] -= 1
+                if array_pending[node_id] == 0:
+                    del array_pending[node_id]
+                    sub_task_outputs[node_id] = array_outputs.pop(node_id)
+        return sub_task_outputs
 
     @staticmethod
-    def execute_array_task(root_input_path, task, array_inputs):
-        array_job = _array_job.ArrayJob.from_dict(task.custom)
-        outputs = {}
-        for job_index in _six_moves.range(0, array_job.size):
+    def _submit_array_task(root_input_path, task, array_inputs, executor):
+        """
+        Submits every sub-task of an array job to the executor on its own.
+        :param Text root_input_path:
+        :param flytekit.common.tasks.task.SdkTask task:
+        :param dict[Text,flytekit.models.common.FlyteIdlEntity] array_inputs:
+        :param concurrent.futures.Executor executor:
+        :rtype: list[(int, concurrent.futures.Future)]
+        """
+        # When the dynamic task packs several sub-tasks into each container, the array job is smaller than the number
+        # of sub-tasks.
+        sub_task_count = task.container.env.get(_sdk_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR)
+        if sub_task_count is None:
+            sub_task_count = _array_job.ArrayJob.from_dict(task.custom).size
+        # The array task is a copy of the user's task, so it's safe to turn it back into a plain python task.
+        sub_task = ReturnOutputsTask(
+            task.assign_type_and_return(_sdk_constants.SdkTaskType.PYTHON_TASK)  # TODO: This is weird
+        )
+        packed_inputs_file = task.container.env.get(_sdk_constants.ARRAY_PACKED_INPUTS_ENV_VAR)
+        if packed_inputs_file:
+            packed_inputs_path = _os.path.join(root_input_path, packed_inputs_file)
+            if packed_inputs_path not in array_inputs or \
+                    len(array_inputs[packed_inputs_path]) != int(sub_task_count):
+                raise _system_exception.FlyteSystemAssertion(
+                    "dynamic task hasn't generated expected packed inputs document [{}].".format(packed_inputs_path))
+            return [
+                (job_index, executor.submit(sub_task, inputs))
+                for job_index, inputs in enumerate(array_inputs[packed_inputs_path].literal_maps)
+            ]
+
+        submitted = []
+        for job_index in _six_moves.range(0, int(sub_task_count)):
             inputs_path = _os.path.join(root_input_path, _six.text_type(job_index), _sdk_constants.INPUT_FILE_NAME)
             if inputs_path not in array_inputs:
                 raise _system_exception.FlyteSystemAssertion(
                     "dynamic task hasn't generated expected inputs document [{}].".format(inputs_path))
-
-            input_proto = array_inputs[inputs_path]
-            # All outputs generated by the same array job will have the same key in sub_task_outputs,
-            # they will, however, differ in the var names; they will be on the format [<job_index>].<var_name>
-            # e.g. [1].out1
-            for key, val in _six.iteritems(
-                    ReturnOutputsTask(
-                        task.assign_type_and_return(_sdk_constants.SdkTaskType.PYTHON_TASK)  # TODO: This is weird
-                    ).execute(input_proto)
-            ):
-                outputs["[{}].{}".format(job_index, key)] = val
-        return outputs
+            submitted.append((job_index, executor.submit(sub_task, _load_inputs(array_inputs[inputs_path]))))
+        return submitted
 
     @staticmethod
     def fulfil_bindings(binding_data, fulfilled_promises):
@@ -244,6 +390,10 @@ class DynamicTask(ReturnOutputsTask):
 
 
 class HiveTask(DynamicTask):
+
+    # The unit test outputs of hive tasks are the generated queries, which aren't kept in the memo store.
+    _MEMOIZABLE = False
+
     def _transform_for_user_output(self, outputs):
         """
         Just execute the function and return the list of Hive queries returned.
@@ -264,3 +414,196 @@ class HiveTask(DynamicTask):
             ]
         else:
             return []
+
+
+def _load_inputs(inputs):
+    """
+    :param flytekit.models.literals.LiteralMap|flytekit.common.spilled_inputs.SpilledLiteralMap inputs:
+    :rtype: flytekit.models.literals.LiteralMap
+    """
+    if isinstance(inputs, _spilled_inputs.SpilledLiteralMap):
+        return inputs.load()
+    return inputs
+
+
+def _completed_future(result=None, exception=None):
+    """
+    :param T result:
+    :param Exception exception:
+    :rtype: concurrent.futures.Future
+    """
+    future = _futures.Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+class _SerialExecutor(object):
+    """
+    Executes sub-tasks in the calling thread as they are submitted.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def submit(self, unit_task, inputs):
+        """
+        :param UnitTestEngineTask unit_task:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: concurrent.futures.Future
+        """
+        try:
+            return _completed_future(unit_task._execute_in_working_directory(inputs))
+        except Exception as e:
+            return _completed_future(exception=e)
+
+
+class _ThreadExecutor(object):
+    """
+    Executes sub-tasks concurrently in a pool of threads.  The unit test configuration of the parent task is shared.
+    """
+
+    def __init__(self, parallelism):
+        """
+        :param int parallelism:
+        """
+        self._pool = _futures.ThreadPoolExecutor(max_workers=parallelism)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._pool.shutdown()
+
+    def submit(self, unit_task, inputs):
+        """
+        :param UnitTestEngineTask unit_task:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: concurrent.futures.Future
+        """
+        # The contexts of the parent task are shared with the sub-task, but the contexts the sub-task enters aren't
+        # seen by the sub-tasks running alongside it.
+        return self._pool.submit(
+            _execute_in_thread, _data_proxy.ThreadContexts(), _exception_scopes.ThreadScopes(), unit_task, inputs)
+
+
+def _execute_in_thread(thread_contexts, thread_scopes, unit_task, inputs):
+    """
+    :param flytekit.interfaces.data.data_proxy.ThreadContexts thread_contexts:
+    :param flytekit.common.exceptions.scopes.ThreadScopes thread_scopes:
+    :param UnitTestEngineTask unit_task:
+    :param flytekit.models.literals.LiteralMap inputs:
+    :rtype: T
+    """
+    with thread_contexts, thread_scopes:
+        return unit_task._execute_in_working_directory(inputs)
+
+
+class _ProcessExecutor(object):
+    """
+    Executes sub-tasks concurrently in a pool of worker processes.  Like pyflyte-execute, workers load the tasks from
+    their modules, so sub-tasks must be defined at the top level of a module.  Inputs and outputs are passed to and
+    from the workers as serialized literals.
+    """
+
+    def __init__(self, parallelism):
+        """
+        :param int parallelism:
+        """
+        self._pool = _fork_server.create_process_pool(parallelism)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._pool.shutdown()
+
+    def submit(self, unit_task, inputs):
+        """
+        :param UnitTestEngineTask unit_task:
+        :param flytekit.models.literals.LiteralMap inputs:
+        :rtype: concurrent.futures.Future
+        """
+        sdk_task = unit_task.sdk_task
+        task_module = getattr(sdk_task, 'task_module', None)
+        task_name = getattr(sdk_task, 'task_function_name', None)
+        if task_module is None or task_name is None:
+            return _completed_future(exception=_user_exceptions.FlyteAssertion(
+                "Only python tasks can be executed in worker processes, task {} is of type {}.".format(
+                    sdk_task.id, sdk_task.type)))
+
+        submitted = self._pool.submit(
+            _execute_sub_task_in_worker,
+            task_module,
+            task_name,
+            inputs.to_flyte_idl().SerializeToString()
+        )
+        result = _futures.Future()
+
+        def _transform(f):
+            try:
+                outputs = _literals.LiteralMap.from_flyte_idl(_literals_pb2.LiteralMap.FromString(f.result()))
+                result.set_result(unit_task._transform_for_user_output({_sdk_constants.OUTPUT_FILE_NAME: outputs}))
+            except Exception as e:
+                result.set_exception(e)
+
+        submitted.add_done_callback(_transform)
+        return result
+
+
+def _execute_sub_task_in_worker(task_module, task_name, serialized_inputs):
+    """
+    The entrypoint of a sub-task executed in a worker process.
+
+    :param Text task_module:
+    :param Text task_name:
+    :param bytes serialized_inputs:
+    :rtype: bytes
+    """
+    global _IN_WORKER_PROCESS
+    _IN_WORKER_PROCESS = True
+    try:
+        sdk_task = getattr(_importlib.import_module(task_module), task_name, None)
+        if sdk_task is None:
+            raise _user_exceptions.FlyteAssertion(
+                "Could not find task {} in module {}.  Sub-tasks must be defined at the top level of a module to be "
+                "executed in worker processes.".format(task_name, task_module))
+
+        # The sub-tasks of array jobs are loaded as the plain python tasks they were declared as.
+        unit_task = UnitTestEngineFactory().get_task(sdk_task)
+        inputs = _literals.LiteralMap.from_flyte_idl(_literals_pb2.LiteralMap.FromString(serialized_inputs))
+        with _TemporaryConfiguration(_UNIT_TEST_CONFIG_PATH, internal_overrides={'image': 'unit_image'}):
+            with _common_utils.AutoDeletingTempDir("unit_test_dir") as working_directory:
+                with _data_proxy.LocalWorkingDirectoryContext(working_directory):
+                    results = unit_task._execute_memoized(inputs)
+        return results[_sdk_constants.OUTPUT_FILE_NAME].to_flyte_idl().SerializeToString()
+    except _user_exceptions.FlyteAssertion:
+        raise
+    except Exception:
+        # Exceptions raised by user code might not survive being passed back to the parent process.
+        raise _user_exceptions.FlyteAssertion(
+            "Sub-task {}.{} failed in a worker process:\n{}".format(task_module, task_name, _traceback.format_exc()))
+
+
+def _create_sub_task_executor():
+    """
+    Creates the executor for the sub-tasks of a dynamic task from the unit test configuration.
+    :rtype: _SerialExecutor|_ThreadExecutor|_ProcessExecutor
+    """
+    executor_type = _sdk_config.UNIT_TEST_EXECUTOR.get()
+    if executor_type not in {'serial', 'thread', 'process'}:
+        raise _user_exceptions.FlyteAssertion(
+            "Unknown unit test executor '{}', expected one of 'serial', 'thread' or 'process'.".format(executor_type))
+
+    parallelism = _sdk_config.UNIT_TEST_PARALLELISM.get()
+    parallelism = parallelism if parallelism > 0 else _multiprocessing.cpu_count()
+    if executor_type == 'serial' or parallelism == 1 or _IN_WORKER_PROCESS:
+        return _SerialExecutor()
+    elif executor_type == 'thread':
+        return _ThreadExecutor(parallelism)
+    return _ProcessExecutor(parallelism)
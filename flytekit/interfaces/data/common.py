@@ -25,6 +25,16 @@ class DataProxy(_six.with_metaclass(_abc.ABCMeta, object)):
         """
         pass
 
+    def download_range(self, remote_path, local_path, start, end):
+        """
+        Downloads the bytes of a file from start up to, but not including, end.
+        :param Text remote_path:
+        :param Text local_path:
+        :param int start:
+        :param int end:
+        """
+        pass
+
     def upload(self, file_path, to_path):
         """
         :param Text file_path:
@@ -4,48 +4,79 @@ from flytekit.configuration import sdk as _sdk_config
 from flytekit.interfaces.data.s3 import s3proxy as _s3proxy
 from flytekit.interfaces.data.local import local_file_proxy as _local_file_proxy
 from flytekit.common.exceptions import user as _user_exception
-from flytekit.common import utils as _common_utils
+from flytekit.common import tracing as _tracing, utils as _common_utils
+from concurrent import futures as _futures
+import logging as _logging
 import six as _six
+import threading as _threading
+import time as _time
+
+# Seconds to wait before the first retry of a failed upload.  The wait doubles with every retry.
+_RETRY_DELAY = 1.0
+
+
+class _ContextStack(object):
+    """
+    A stack of contexts shared by every thread of the process, so that threads started by user code see the contexts
+    of the task that started them.  A thread that executes a task concurrently with others can be given a stack of its
+    own with ThreadContexts.
+    """
+
+    def __init__(self, *defaults):
+        self._shared = list(defaults)
+        self._local = _threading.local()
+
+    @property
+    def contexts(self):
+        """
+        :rtype: list[T]
+        """
+        contexts = getattr(self._local, 'contexts', None)
+        return self._shared if contexts is None else contexts
+
+    @contexts.setter
+    def contexts(self, value):
+        self._local.contexts = value
 
 
 class LocalWorkingDirectoryContext(object):
 
-    _CONTEXTS = []
+    _CONTEXTS = _ContextStack()
 
     def __init__(self, directory):
         self._directory = directory
 
     def __enter__(self):
-        self._CONTEXTS.append(self._directory)
+        self._CONTEXTS.contexts.append(self._directory)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._CONTEXTS.pop()
+        self._CONTEXTS.contexts.pop()
 
     @classmethod
     def get(cls):
-        return cls._CONTEXTS[-1] if cls._CONTEXTS else None
+        return cls._CONTEXTS.contexts[-1] if cls._CONTEXTS.contexts else None
 
 
 class _OutputDataContext(object):
 
-    _CONTEXTS = [_local_file_proxy.LocalFileProxy(_sdk_config.LOCAL_SANDBOX.get())]
+    _CONTEXTS = _ContextStack(_local_file_proxy.LocalFileProxy(_sdk_config.LOCAL_SANDBOX.get()))
 
     def __init__(self, context):
         self._context = context
 
     def __enter__(self):
-        self._CONTEXTS.append(self._context)
+        self._CONTEXTS.contexts.append(self._context)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._CONTEXTS.pop()
+        self._CONTEXTS.contexts.pop()
 
     @classmethod
     def get_active_proxy(cls):
-        return cls._CONTEXTS[-1]
+        return cls._CONTEXTS.contexts[-1]
 
     @classmethod
     def get_default_proxy(cls):
-        return cls._CONTEXTS[0]
+        return cls._CONTEXTS.contexts[0]
 
 
 class LocalDataContext(_OutputDataContext):
@@ -61,6 +92,27 @@ class RemoteDataContext(_OutputDataContext):
         super(RemoteDataContext, self).__init__(_s3proxy.AwsS3Proxy())
 
 
+class ThreadContexts(object):
+    """
+    Gives the thread that enters it its own working directory and data proxy stacks, holding the contexts the stacks
+    held in the thread that created it.  Threads that execute tasks concurrently use it so that they don't see the
+    contexts of each other's tasks.
+    """
+
+    _STACKS = (LocalWorkingDirectoryContext._CONTEXTS, _OutputDataContext._CONTEXTS)
+
+    def __init__(self):
+        self._contexts = [list(stack.contexts) for stack in self._STACKS]
+
+    def __enter__(self):
+        for stack, contexts in zip(self._STACKS, self._contexts):
+            stack.contexts = list(contexts)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for stack in self._STACKS:
+            stack.contexts = None
+
+
 class Data(object):
     # TODO: More proxies for more environments.
     _DATA_PROXIES = {
@@ -93,12 +145,14 @@ class Data(object):
         :param bool is_multipart:
         """
         try:
-            with _common_utils.PerformanceTimer("Copying ({} -> {})".format(remote_path, local_path)):
+            with _common_utils.PerformanceTimer("Copying ({} -> {})".format(remote_path, local_path)), \
+                    _tracing.span('download') as span:
                 proxy = cls._load_data_proxy_by_path(remote_path)
                 if is_multipart:
                     proxy.download_directory(remote_path, local_path)
                 else:
                     proxy.download(remote_path, local_path)
+                span.add_path_bytes(local_path)
         except Exception as ex:
             raise _user_exception.FlyteAssertion(
                 "Failed to get data from {remote_path} to {local_path} (recursive={is_multipart}).\n\n"
@@ -110,6 +164,32 @@ class Data(object):
                 )
             )
 
+    @classmethod
+    def get_data_range(cls, remote_path, local_path, start, end):
+        """
+        Downloads the bytes of a file from start up to, but not including, end.
+        :param Text remote_path:
+        :param Text local_path:
+        :param int start:
+        :param int end:
+        """
+        try:
+            with _common_utils.PerformanceTimer("Copying bytes {}-{} ({} -> {})".format(
+                    start, end, remote_path, local_path)), _tracing.span('download') as span:
+                cls._load_data_proxy_by_path(remote_path).download_range(remote_path, local_path, start, end)
+                span.add_path_bytes(local_path)
+        except Exception as ex:
+            raise _user_exception.FlyteAssertion(
+                "Failed to get bytes {start}-{end} of {remote_path} to {local_path}.\n\n"
+                "Original exception: {error_string}".format(
+                    remote_path=remote_path,
+                    local_path=local_path,
+                    start=start,
+                    end=end,
+                    error_string=_six.text_type(ex)
+                )
+            )
+
     @classmethod
     def put_data(cls, local_path, remote_path, is_multipart=False):
         """
@@ -118,7 +198,9 @@ class Data(object):
         :param bool is_multipart:
         """
         try:
-            with _common_utils.PerformanceTimer("Writing ({} -> {})".format(local_path, remote_path)):
+            with _common_utils.PerformanceTimer("Writing ({} -> {})".format(local_path, remote_path)), \
+                    _tracing.span('upload') as span:
+                span.add_path_bytes(local_path)
                 proxy = cls._load_data_proxy_by_path(remote_path)
                 if is_multipart:
                     proxy.upload_directory(local_path, remote_path)
@@ -135,6 +217,36 @@ class Data(object):
                 )
             )
 
+    @classmethod
+    def put_directories(cls, local_paths, remote_path, max_workers=1, retries=0):
+        """
+        Uploads the contents of several local directories to the same remote directory, up to max_workers at a time.
+        Failed uploads are retried, which is safe because the remote path of a file only depends on its local path.
+
+        :param list[Text] local_paths:
+        :param Text remote_path:
+        :param int max_workers:
+        :param int retries: The number of times each upload is retried.
+        """
+        def _put(local_path):
+            for attempt in _six.moves.range(retries + 1):
+                try:
+                    return cls.put_data(local_path, remote_path, is_multipart=True)
+                except _user_exception.FlyteAssertion as ex:
+                    if attempt == retries:
+                        raise
+                    delay = _RETRY_DELAY * 2 ** attempt
+                    _logging.warning("Retrying the upload of {} in {} seconds: {}".format(local_path, delay, ex))
+                    _time.sleep(delay)
+
+        if max_workers <= 1 or len(local_paths) <= 1:
+            for local_path in local_paths:
+                _put(local_path)
+            return
+        with _futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(_put, local_paths):
+                pass
+
     @classmethod
     def get_remote_path(cls):
         """
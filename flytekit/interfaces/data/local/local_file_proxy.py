@@ -2,11 +2,12 @@ from __future__ import absolute_import
 
 import os as _os
 import uuid as _uuid
-from distutils import dir_util as _dir_util
 from shutil import copyfile as _copyfile
 from flytekit.interfaces.data import common as _common_data
 from flytekit.interfaces import random as _flyte_random
 
+_RANGE_CHUNK_SIZE = 1024 * 1024
+
 
 def _make_local_path(path):
     if not _os.path.exists(path):
@@ -38,6 +39,8 @@ class LocalFileProxy(_common_data.DataProxy):
         :param Text to_path:
         """
         if from_path != to_path:
+            # distutils is slow to import and only needed to copy directories.
+            from distutils import dir_util as _dir_util
             _dir_util.copy_tree(from_path, to_path)
 
     def download(self, from_path, to_path):
@@ -47,6 +50,24 @@ class LocalFileProxy(_common_data.DataProxy):
         """
         _copyfile(from_path, to_path)
 
+    def download_range(self, from_path, to_path, start, end):
+        """
+        :param Text from_path:
+        :param Text to_path:
+        :param int start:
+        :param int end:
+        """
+        with open(from_path, 'rb') as r, open(to_path, 'wb') as w:
+            r.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = r.read(min(remaining, _RANGE_CHUNK_SIZE))
+                if not chunk:
+                    # Like object stores, stop at the end of the file.
+                    break
+                w.write(chunk)
+                remaining -= len(chunk)
+
     def upload(self, from_path, to_path):
         """
         :param Text from_path:
@@ -108,6 +108,25 @@ class AwsS3Proxy(_common_data.DataProxy):
         cmd = [AwsS3Proxy._AWS_CLI, "s3", "cp", remote_path, local_path]
         return _update_cmd_config_and_execute(cmd)
 
+    def download_range(self, remote_path, local_path, start, end):
+        """
+        :param Text remote_path: remote s3:// path
+        :param Text local_path: file to copy to
+        :param int start: first byte to download
+        :param int end: byte to stop the download at, which is not downloaded
+        """
+        if not remote_path.startswith("s3://"):
+            raise ValueError("Not an S3 ARN. Please use FQN (S3 ARN) of the format s3://...")
+
+        AwsS3Proxy._check_binary()
+        bucket, file_path = self._split_s3_path_to_bucket_and_key(remote_path)
+        # HTTP byte ranges are inclusive.
+        cmd = [
+            AwsS3Proxy._AWS_CLI, "s3api", "get-object", "--bucket", bucket, "--key", file_path,
+            "--range", "bytes={}-{}".format(start, end - 1), local_path
+        ]
+        return _update_cmd_config_and_execute(cmd)
+
     def upload(self, file_path, to_path):
         """
         :param Text file_path:
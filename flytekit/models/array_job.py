@@ -32,6 +32,10 @@ class ArrayJob(_common.FlyteCustomIdlEntity):
         """
         return self._parallelism
 
+    @parallelism.setter
+    def parallelism(self, value):
+        self._parallelism = value
+
     @property
     def size(self):
         """
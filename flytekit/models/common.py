@@ -5,7 +5,90 @@ import json as _json
 
 import six as _six
 from flyteidl.admin import common_pb2 as _common_pb2
-from google.protobuf import json_format as _json_format, struct_pb2 as _struct
+from google.protobuf import struct_pb2 as _struct
+
+
+def _set_struct_value(value_pb, value):
+    """
+    :param google.protobuf.struct_pb2.Value value_pb:
+    :param T value:
+    """
+    if value is None:
+        value_pb.null_value = _struct.NULL_VALUE
+    elif isinstance(value, bool):
+        value_pb.bool_value = value
+    elif isinstance(value, _six.string_types):
+        value_pb.string_value = value
+    elif isinstance(value, _six.integer_types + (float,)):
+        value_pb.number_value = value
+    elif isinstance(value, dict):
+        _update_struct(value_pb.struct_value, value)
+    elif isinstance(value, (list, tuple)):
+        list_pb = value_pb.list_value
+        list_pb.SetInParent()
+        for v in value:
+            _set_struct_value(list_pb.values.add(), v)
+    else:
+        raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+def _update_struct(struct_pb, d):
+    """
+    :param google.protobuf.struct_pb2.Struct struct_pb:
+    :param dict[Text, T] d:
+    """
+    struct_pb.SetInParent()
+    fields = struct_pb.fields
+    for k, v in _six.iteritems(d):
+        if not isinstance(k, _six.string_types):
+            # Mirror the json module, which coerces scalar keys to their JSON representation.
+            if k is not None and not isinstance(k, _six.integer_types + (float,)):
+                raise TypeError("Keys must be strings, received {} of type {}".format(k, type(k).__name__))
+            k = _json.dumps(k)
+        _set_struct_value(fields[k], v)
+
+
+def _struct_value_to_python(value_pb):
+    """
+    :param google.protobuf.struct_pb2.Value value_pb:
+    :rtype: T
+    """
+    kind = value_pb.WhichOneof('kind')
+    if kind == 'number_value':
+        return value_pb.number_value
+    elif kind == 'string_value':
+        return value_pb.string_value
+    elif kind == 'bool_value':
+        return value_pb.bool_value
+    elif kind == 'struct_value':
+        return struct_to_dict(value_pb.struct_value)
+    elif kind == 'list_value':
+        return [_struct_value_to_python(v) for v in value_pb.list_value.values]
+    return None
+
+
+def dict_to_struct(d):
+    """
+    Builds a Struct directly from a JSON-like Python dictionary.  This is equivalent to, but much faster than,
+    serializing the dictionary to JSON text and parsing it with json_format.
+
+    :param dict[Text, T] d:
+    :rtype: google.protobuf.struct_pb2.Struct
+    :raises: TypeError if a value is not JSON serializable.
+    """
+    struct_pb = _struct.Struct()
+    _update_struct(struct_pb, d)
+    return struct_pb
+
+
+def struct_to_dict(struct_pb):
+    """
+    The inverse of dict_to_struct.  As a Struct stores every number as a double, all numbers are returned as floats.
+
+    :param google.protobuf.struct_pb2.Struct struct_pb:
+    :rtype: dict[Text, T]
+    """
+    return {k: _struct_value_to_python(v) for k, v in _six.iteritems(struct_pb.fields)}
 
 
 class FlyteABCMeta(_abc.ABCMeta):
@@ -84,10 +167,10 @@ class FlyteCustomIdlEntity(FlyteIdlEntity):
         :param _struct.Struct idl_object:
         :return: FlyteCustomIdlEntity
         """
-        return cls.from_dict(idl_dict=_json_format.MessageToDict(idl_object))
+        return cls.from_dict(idl_dict=struct_to_dict(idl_object))
 
     def to_flyte_idl(self):
-        return _json_format.Parse(_json.dumps(self.to_dict()), _struct.Struct())
+        return dict_to_struct(self.to_dict())
 
     @_abc.abstractmethod
     def from_dict(self, idl_dict):
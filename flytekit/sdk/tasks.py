@@ -3,10 +3,9 @@ from __future__ import absolute_import
 import datetime as _datetime
 import six as _six
 
-from flytekit.common import constants as _common_constants
+from flytekit.common import constants as _common_constants, nodes as _nodes
 from flytekit.common.exceptions import user as _user_exceptions
-from flytekit.common.tasks import sdk_runnable as _sdk_runnable_tasks, sdk_dynamic as _sdk_dynamic, \
-    spark_task as _sdk_spark_tasks, hive_task as _sdk_hive_tasks, sidecar_task as _sdk_sidecar_tasks
+from flytekit.common.tasks import sdk_runnable as _sdk_runnable_tasks, sdk_dynamic as _sdk_dynamic
 from flytekit.common.types import helpers as _type_helpers
 from flytekit.models import interface as _interface_model
 
@@ -126,6 +125,7 @@ def python_task(
         cache=False,
         timeout=None,
         environment=None,
+        offload_large_literals=False,
         cls=None,
 ):
     """
@@ -211,6 +211,16 @@ def python_task(
 
     :param dict[Text,Text] environment: [optional] environment variables to set when executing this task.
 
+    :param bool offload_large_literals: [optional] boolean describing whether outputs whose serialized literal is
+        larger than the sdk.literal_offloading_threshold configuration are written to blob storage of their own, with
+        references to them kept in the outputs document.  Defaults to False.
+
+        .. note::
+
+            The platform sees an offloaded output as a blob, not as the type declared by the interface, so only
+            enable this for tasks whose outputs are consumed by other flytekit tasks.  Offloaded values are loaded in
+            full when they are read.  Cached tasks can't offload their outputs.
+
     :param cls: This can be used to override the task implementation with a user-defined extension. The class
         provided must be a subclass of flytekit.common.tasks.sdk_runnable.SdkRunnableTask.  A user can use this to
         inject bespoke logic into the base Flyte programming model.
@@ -235,7 +245,8 @@ def python_task(
             discoverable=cache,
             timeout=timeout or _datetime.timedelta(seconds=0),
             environment=environment,
-            custom={})
+            custom={},
+            offload_large_literals=offload_large_literals)
 
     if _task_function:
         return wrapper(_task_function)
@@ -261,6 +272,9 @@ def dynamic_task(
         allowed_failure_ratio=None,
         max_concurrency=None,
         environment=None,
+        array_batch_size=None,
+        deduplicate_sub_tasks=False,
+        offload_large_literals=False,
         cls=None
 ):
     """
@@ -356,6 +370,20 @@ def dynamic_task(
         This is a stand-in pending better concurrency controls for special use-cases.  The existence of this parameter
         is not guaranteed between versions and therefore it is NOT recommended that it be used.
     :param dict[Text,Text] environment: [optional] environment variables to set when executing this task.
+    :param int array_batch_size: [optional] integer value describing how many sub-tasks of an array job each container
+        executes.  Packing many short sub-tasks into one container saves the cost of scheduling and starting a container
+        for each of them.  The sub-tasks of a container run one after another, or in as many worker processes as the
+        sdk.array_batch_parallelism configuration allows.  By default, every sub-task runs in a container of its own.
+        Array jobs whose outputs are used, and array jobs of discoverable tasks, are never batched.
+    :param bool deduplicate_sub_tasks: [optional] boolean describing whether invocations of the same task with the same
+        inputs should run only once.  The outputs of the duplicate invocations are the outputs of the first one.  Only
+        enable this for tasks whose outputs depend on nothing but their inputs.  Defaults to False.
+    :param bool offload_large_literals: [optional] boolean describing whether outputs and sub-task inputs whose
+        serialized literal is larger than the sdk.literal_offloading_threshold configuration are written to blob
+        storage of their own, with references to them kept in the documents.  The platform sees an offloaded literal as
+        a blob, not as the declared type, so only enable this when the sub-tasks and the consumers of the outputs are
+        flytekit tasks.  Offloaded values are loaded in full when they are read.  Cached tasks can't offload literals.
+        Defaults to False.
     :param cls: This can be used to override the task implementation with a user-defined extension. The class
         provided must be a subclass of flytekit.common.tasks.sdk_runnable.SdkRunnableTask.  Generally, it should be a
         subclass of flytekit.common.tasks.sdk_dynamic.SdkDynamicTask.  A user can use this parameter to inject bespoke
@@ -384,6 +412,9 @@ def dynamic_task(
             max_concurrency=max_concurrency,
             environment=environment or {},
             custom={},
+            array_batch_size=array_batch_size,
+            deduplicate_sub_tasks=deduplicate_sub_tasks,
+            offload_large_literals=offload_large_literals,
         )
 
     if _task_function:
@@ -392,6 +423,38 @@ def dynamic_task(
         return wrapper
 
 
+def map_task(task, over, **inputs):
+    """
+    Maps a task over a list of values in a dynamic task.  The task runs once for every value, in a single array job,
+    and each output of the returned node is the list of the outputs of the sub-tasks, in the order of the values.
+
+    .. code-block:: python
+
+        @inputs(value=Types.Integer, power=Types.Integer)
+        @outputs(out=Types.Integer)
+        @python_task
+        def my_sub_task(wf_params, value, power, out):
+            out.set(value ** power)
+
+        @inputs(values=[Types.Integer])
+        @outputs(out=[Types.Integer])
+        @dynamic_task
+        def my_task(wf_params, values, out):
+            squares = map_task(my_sub_task, over=values, power=2)
+            yield squares
+            out.set(squares.outputs.out)
+
+    Unlike yielding a node for every value, this doesn't create a node, promises and bindings in the dynamic task for
+    every value, so it scales to much larger lists.
+
+    :param flytekit.common.tasks.sdk_runnable.SdkRunnableTask task: The python task to map.
+    :param list[T] over: The values of the only input of the task that isn't bound by kwargs.
+    :param dict[Text, T] inputs: The values of the other inputs of the task, which are the same for every sub-task.
+    :rtype: flytekit.common.nodes.SdkMapNode
+    """
+    return _nodes.SdkMapNode(task, over, inputs)
+
+
 def spark_task(
         _task_function=None,
         cache_version='',
@@ -458,6 +521,8 @@ def spark_task(
     """
 
     def wrapper(fn):
+        # Plugin task types are imported on first use to keep importing this module cheap.
+        from flytekit.common.tasks import spark_task as _sdk_spark_tasks
         return (cls or _sdk_spark_tasks.SdkSparkTask)(
             task_function=fn,
             task_type=_common_constants.SdkTaskType.SPARK_TASK,
@@ -592,7 +657,7 @@ def hive_task(
     :rtype: flytekit.common.tasks.sdk_runnable.SdkHiveTask
     """
     def wrapper(fn):
-
+        from flytekit.common.tasks import hive_task as _sdk_hive_tasks
         return (cls or _sdk_hive_tasks.SdkHiveTask)(
             task_function=fn,
             task_type=_common_constants.SdkTaskType.BATCH_HIVE_TASK,
@@ -733,7 +798,7 @@ def qubole_hive_task(
     :rtype: flytekit.common.tasks.sdk_runnable.SdkHiveTask
     """
     def wrapper(fn):
-
+        from flytekit.common.tasks import hive_task as _sdk_hive_tasks
         return (cls or _sdk_hive_tasks.SdkHiveTask)(
             task_function=fn,
             task_type=_common_constants.SdkTaskType.BATCH_HIVE_TASK,
@@ -912,7 +977,7 @@ def sidecar_task(
 
     """
     def wrapper(fn):
-
+        from flytekit.common.tasks import sidecar_task as _sdk_sidecar_tasks
         return (cls or _sdk_sidecar_tasks.SdkSidecarTask)(
             task_function=fn,
             task_type=_common_constants.SdkTaskType.SIDECAR_TASK,
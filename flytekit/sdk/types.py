@@ -1,6 +1,6 @@
 from __future__ import absolute_import
 from flytekit.common.types import primitives as _primitives, blobs as _blobs, schema as _schema, helpers as _helpers, \
-    proto as _proto, containers as _containers
+    proto as _proto, containers as _containers, arrays as _arrays
 
 
 class Types(object):
@@ -392,6 +392,40 @@ class Types(object):
             )
     """
 
+    Array = staticmethod(_arrays.create_array)
+    """
+    Use this to specify a packed numeric array backed by a numpy.ndarray.  Unlike `Types.List(Types.Float)`, which
+    encodes each element as its own literal, the contiguous buffer is stored in a single binary literal.  This is the
+    preferred way to pass large numeric vectors and matrices between tasks.
+
+    When used with an SDK-decorated method, expect this behavior from the default type engine:
+
+        Cast behavior:
+            1) The dtype must match exactly.  No implicit casting between dtypes is performed.
+            2) If a shape is declared, the array must have the same number of dimensions and each dimension declared
+               as an integer must match.  Dimensions declared as None accept any size.
+
+        As input:
+            1) If set, a read-only numpy.ndarray that references the literal bytes directly (no copy is made).  Use
+               `.copy()` if the array must be modified in place.
+            2) If not set, a None value.
+
+        As output:
+            1) A numpy.ndarray of the declared dtype and shape.
+            2) Set None to null the output.
+
+        From command-line:
+            Specify a valid JSON list string, nested for multi-dimensional arrays.
+
+    .. code-block:: python
+
+        @inputs(a=Types.Array(numpy.float64, shape=(None, 3)))
+        @outputs(b=Types.Array(numpy.float64))
+        @python_task
+        def row_norms(wf_params, a, b):
+            b.set(numpy.linalg.norm(a, axis=1))
+    """
+
     List = staticmethod(_containers.List)
     """
     Use this to specify a list of any type--including nested lists.
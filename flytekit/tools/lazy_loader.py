@@ -27,6 +27,15 @@ class LazyLoadPlugin(object):
             self._lazy_modules = []
         type(self).LAZY_LOADING_PLUGINS[plugin_name] = plugin_requirements
 
+    def load(self):
+        """
+        Imports the modules of the plugin now rather than on first use.
+        :raises ImportError: If the plugin isn't installed.
+        """
+        for module in self._lazy_modules:
+            # Accessing an attribute that lazy modules don't fake imports the module.
+            getattr(module, '__file__', None)
+
     @classmethod
     def get_extras_require(cls):
         """
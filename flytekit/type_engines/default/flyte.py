@@ -2,19 +2,25 @@ from __future__ import absolute_import
 
 from flytekit.common.exceptions import system as _system_exceptions, user as _user_exceptions
 from flytekit.common.types import primitives as _primitive_types, base_sdk_types as _base_sdk_types, containers as \
-    _container_types, schema as _schema, blobs as _blobs, proto as _proto
+    _container_types, schema as _schema, blobs as _blobs, proto as _proto, arrays as _arrays
 from flytekit.models import types as _literal_type_models
 from flytekit.models.core import types as _core_types
 import importlib as _importer
 
 from flytekit.common.types import helpers as _helpers
 
+_PROTO_SDK_TYPES_BY_TAG = {}
+
 
 def _proto_sdk_type_from_tag(tag):
     """
     :param Text tag:
     :rtype: _proto.Protobuf
     """
+    sdk_type = _PROTO_SDK_TYPES_BY_TAG.get(tag)
+    if sdk_type is not None:
+        return sdk_type
+
     if '.' not in tag:
         raise _user_exceptions.FlyteValueException(
             tag,
@@ -36,7 +42,8 @@ def _proto_sdk_type_from_tag(tag):
             "Could not find the protobuf named: {} @ {}.".format(name, module)
         )
 
-    return _proto.create_protobuf(getattr(pb_module, name))
+    sdk_type = _PROTO_SDK_TYPES_BY_TAG[tag] = _proto.create_protobuf(getattr(pb_module, name))
+    return sdk_type
 
 
 class FlyteDefaultTypeEngine(object):
@@ -94,6 +101,12 @@ class FlyteDefaultTypeEngine(object):
             if literal_type.simple == _literal_type_models.SimpleType.BINARY and _proto.Protobuf.PB_FIELD_KEY in \
                     literal_type.metadata:
                 return _proto_sdk_type_from_tag(literal_type.metadata[_proto.Protobuf.PB_FIELD_KEY])
+            if literal_type.simple == _literal_type_models.SimpleType.BINARY and _arrays.Array.DTYPE_FIELD_KEY in \
+                    literal_type.metadata:
+                return _arrays.create_array(
+                    literal_type.metadata[_arrays.Array.DTYPE_FIELD_KEY],
+                    shape=_arrays.Array.parse_shape(literal_type.metadata.get(_arrays.Array.SHAPE_FIELD_KEY))
+                )
             sdk_type = self._SIMPLE_TYPE_LOOKUP_TABLE.get(literal_type.simple)
             if sdk_type is None:
                 raise NotImplementedError(
@@ -130,8 +143,15 @@ class FlyteDefaultTypeEngine(object):
         elif literal.scalar.binary is not None:
             if literal.scalar.binary.tag.startswith(_proto.Protobuf.TAG_PREFIX):
                 sdk_type = _proto_sdk_type_from_tag(literal.scalar.binary.tag[len(_proto.Protobuf.TAG_PREFIX):])
+            elif literal.scalar.binary.tag.startswith(_arrays.Array.TAG_PREFIX):
+                dtype, shape = _arrays.Array.parse_tag(literal.scalar.binary.tag)
+                sdk_type = _arrays.create_array(dtype, shape=shape)
+            elif literal.scalar.binary.tag == _primitive_types.Generic.BINARY_TAG:
+                sdk_type = _primitive_types.Generic
             else:
-                raise NotImplementedError("TODO: Binary is only supported for protobuf types currently")
+                raise NotImplementedError(
+                    "TODO: Binary is only supported for protobuf, array and generic types currently"
+                )
         elif literal.scalar.primitive.boolean is not None:
             sdk_type = _primitive_types.Boolean
         elif literal.scalar.primitive.datetime is not None:
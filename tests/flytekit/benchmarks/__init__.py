@@ -0,0 +1,11 @@
+"""
+Benchmarks for the type engine and literal serialization hot paths.
+
+These are not collected as part of the unit test suite.  Run them with pytest-benchmark installed:
+
+    make benchmark
+
+Results are written to benchmark.json, which can be compared between revisions with:
+
+    pytest-benchmark compare benchmark.json <other>.json
+"""
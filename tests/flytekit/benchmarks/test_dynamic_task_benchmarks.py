@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+import logging as _logging
+import os as _os
+from datetime import datetime as _datetime
+
+import pytest as _pytest
+from mock import patch as _patch
+from six import moves as _six_moves
+
+from flytekit.common import utils as _utils
+from flytekit.configuration import internal as _internal_config, sdk as _sdk_config
+from flytekit.engines import common as _common_engine
+from flytekit.models import literals as _literal_models
+from flytekit.models.core.identifier import WorkflowExecutionIdentifier
+from flytekit.sdk.tasks import inputs, outputs, dynamic_task, map_task, python_task
+from flytekit.sdk.types import Types
+from tests.flytekit.benchmarks.utils import run_scaled
+
+_pytest.importorskip("pytest_benchmark")
+
+# Number of sub-tasks yielded by the dynamic task.
+FAN_OUT_SIZES = [1000, 10000, 100000]
+
+_MAX_BYTES_PER_SUB_TASK = 16 * 1024
+_MAX_STREAMED_BYTES_PER_SUB_TASK = 2 * 1024
+_MAX_MAPPED_BYTES_PER_SUB_TASK = 4 * 1024
+
+
+@inputs(a=Types.Integer, s=Types.String)
+@outputs(b=Types.Integer)
+@python_task
+def _sub_task(wf_params, a, s, b):
+    b.set(a)
+
+
+@inputs(n=Types.Integer)
+@outputs(out=[Types.Integer])
+@dynamic_task
+def _fan_out(wf_params, n, out):
+    res = []
+    for i in _six_moves.range(n):
+        t = _sub_task(a=i, s='abc')
+        yield t
+        res.append(t.outputs.b)
+    out.set(res)
+
+
+@inputs(n=Types.Integer)
+@outputs(out=[Types.Integer])
+@dynamic_task
+def _mapped_fan_out(wf_params, n, out):
+    mapped = map_task(_sub_task, over=_six_moves.range(n), s='abc')
+    yield mapped
+    out.set(mapped.outputs.b)
+
+
+@_pytest.fixture(scope='module')
+def context():
+    with _patch.dict(_os.environ, {_internal_config.IMAGE.env_var: 'flyteimage:0.0.1'}):
+        with _utils.AutoDeletingTempDir("user_dir") as user_dir:
+            yield _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(project='benchmark', domain='benchmark', name='benchmark'),
+                execution_date=_datetime.utcnow(),
+                stats=None,
+                logging=_logging,
+                tmp_dir=user_dir
+            )
+
+
+def _produce_dynamic_job_spec(context, size, task=_fan_out):
+    return task._produce_dynamic_job_spec(
+        context,
+        _literal_models.LiteralMap(literals={'n': _literal_models.Literal(
+            scalar=_literal_models.Scalar(primitive=_literal_models.Primitive(integer=size)))})
+    )
+
+
+@_pytest.mark.parametrize("size", FAN_OUT_SIZES)
+def test_produce_dynamic_job_spec(benchmark, context, size):
+    spec, generated_files = run_scaled(benchmark, _produce_dynamic_job_spec, size, context, size)
+    assert len(generated_files) == size
+    assert len(spec.outputs[0].binding.collection.bindings) == size
+
+
+@_pytest.mark.parametrize("size", FAN_OUT_SIZES)
+def test_produce_mapped_dynamic_job_spec(benchmark, context, size):
+    spec, generated_files = run_scaled(benchmark, _produce_dynamic_job_spec, size, context, size, _mapped_fan_out)
+    assert len(generated_files) == size
+    assert len(spec.outputs[0].binding.collection.bindings) == size
+
+
+def _peak_memory(context, size, task=_fan_out):
+    tracemalloc = _pytest.importorskip("tracemalloc")
+    tracemalloc.start()
+    try:
+        _produce_dynamic_job_spec(context, size, task)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@_pytest.mark.parametrize("size", FAN_OUT_SIZES)
+def test_dynamic_job_spec_memory(context, size):
+    # Around 7KB are held per sub-task, regardless of the fan-out.
+    assert _peak_memory(context, size) // size < _MAX_BYTES_PER_SUB_TASK
+
+
+@_pytest.mark.parametrize("size", FAN_OUT_SIZES)
+def test_streamed_dynamic_job_spec_memory(context, size):
+    with _patch.dict(_os.environ, {_sdk_config.STREAM_DYNAMIC_JOB_SPEC.env_var: 'true'}):
+        # Around 1KB is held per sub-task, mostly by the promises the user code collects.
+        assert _peak_memory(context, size) // size < _MAX_STREAMED_BYTES_PER_SUB_TASK
+
+
+@_pytest.mark.parametrize("size", FAN_OUT_SIZES)
+def test_mapped_dynamic_job_spec_memory(context, size):
+    # Around 1.7KB are held per sub-task, mostly by its inputs and the binding of its outputs.
+    assert _peak_memory(context, size, _mapped_fan_out) // size < _MAX_MAPPED_BYTES_PER_SUB_TASK
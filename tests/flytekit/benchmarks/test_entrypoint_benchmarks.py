@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import json as _json
+import os as _os
+import subprocess as _subprocess
+import sys as _sys
+
+import pytest as _pytest
+
+from flytekit.common import utils as _utils
+from flytekit.common.types import helpers as _type_helpers
+from flytekit.sdk.types import Types
+from tests.flytekit.common import task_definitions as _task_defs
+
+_pytest.importorskip("pytest_benchmark")
+
+_ROUNDS = 10
+
+_ENTRYPOINT = "from flytekit.bin.entrypoint import {cmd}; {cmd}()"
+
+
+@_pytest.fixture(scope='module')
+def task_environment():
+    env = dict(_os.environ)
+    env.update({
+        'FLYTE_INTERNAL_CONFIGURATION_PATH': _os.path.join(
+            _os.path.dirname(__file__), '..', 'unit', 'bin', 'fake.config'),
+        'FLYTE_INTERNAL_PROJECT': 'test',
+        'FLYTE_INTERNAL_DOMAIN': 'development',
+    })
+    with _utils.AutoDeletingTempDir("benchmark") as d:
+        inputs = _os.path.join(d.name, "inputs.pb")
+        _utils.write_proto_to_file(
+            _type_helpers.pack_python_std_map_to_literal_map({'a': 1}, {'a': Types.Integer}).to_flyte_idl(),
+            inputs
+        )
+        yield env, inputs, d.name
+
+
+def test_cold_task_latency(benchmark, task_environment):
+    env, inputs, output_prefix = task_environment
+
+    def _execute():
+        with open(_os.devnull, 'w') as devnull:
+            _subprocess.check_call(
+                [
+                    _sys.executable, "-c", _ENTRYPOINT.format(cmd="execute_task_cmd"),
+                    "--task-module", _task_defs.add_one.task_module,
+                    "--task-name", _task_defs.add_one.task_function_name,
+                    "--inputs", inputs,
+                    "--output-prefix", output_prefix,
+                ],
+                env=env,
+                stdout=devnull,
+            )
+
+    benchmark.pedantic(_execute, rounds=_ROUNDS, iterations=1, warmup_rounds=0)
+
+
+def test_warm_task_latency(benchmark, task_environment):
+    env, inputs, output_prefix = task_environment
+    request = _json.dumps({
+        'task_module': _task_defs.add_one.task_module,
+        'task_name': _task_defs.add_one.task_function_name,
+        'inputs': inputs,
+        'output_prefix': output_prefix,
+    }) + "\n"
+
+    worker = _subprocess.Popen(
+        [_sys.executable, "-c", _ENTRYPOINT.format(cmd="execute_task_server_cmd")],
+        env=env,
+        stdin=_subprocess.PIPE,
+        stdout=_subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    def _execute():
+        worker.stdin.write(request)
+        worker.stdin.flush()
+        assert _json.loads(worker.stdout.readline())['status'] == 'ok'
+
+    try:
+        # The first request imports the task module, like every request of a cold worker does.
+        _execute()
+        benchmark.pedantic(_execute, rounds=_ROUNDS, iterations=1, warmup_rounds=0)
+    finally:
+        worker.stdin.close()
+        worker.wait()
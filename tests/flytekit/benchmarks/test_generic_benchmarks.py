@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+
+import json as _json
+import os as _os
+
+import pytest as _pytest
+from google.protobuf import json_format as _json_format, struct_pb2 as _struct
+from mock import patch as _patch
+
+from flytekit.common.types import primitives as _primitives
+from flytekit.configuration import sdk as _sdk_config
+from tests.flytekit.benchmarks.utils import run_scaled
+
+_pytest.importorskip("pytest_benchmark")
+
+GENERIC_SIZES = [10000, 100000, 1000000]
+
+
+def _nested_dict(size):
+    """
+    :param int size: Total number of leaf keys, spread over groups of 100.
+    :rtype: dict[Text, T]
+    """
+    return {
+        'group_{}'.format(g): {
+            'key_{}'.format(i): {'int': i, 'float': i * 0.5, 'str': 'v{}'.format(i), 'list': [i, i + 1]}
+            for i in range(g * 100, min(size, (g + 1) * 100))
+        }
+        for g in range((size + 99) // 100)
+    }
+
+
+def _json_hop_from_python_std(d):
+    return _json_format.Parse(_json.dumps(d), _struct.Struct())
+
+
+def _json_hop_to_python_std(s):
+    return _json.loads(_json_format.MessageToJson(s))
+
+
+def _binary_from_python_std(d):
+    with _patch.dict(_os.environ, {_sdk_config.GENERIC_BINARY_ENCODING_THRESHOLD.env_var: '1'}):
+        return _primitives.Generic.from_python_std(d)
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_json_hop_encode(benchmark, size):
+    run_scaled(benchmark, _json_hop_from_python_std, size, _nested_dict(size))
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_struct_encode(benchmark, size):
+    run_scaled(benchmark, _primitives.Generic.from_python_std, size, _nested_dict(size))
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_binary_encode(benchmark, size):
+    run_scaled(benchmark, _binary_from_python_std, size, _nested_dict(size))
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_json_hop_decode(benchmark, size):
+    run_scaled(benchmark, _json_hop_to_python_std, size, _json_hop_from_python_std(_nested_dict(size)))
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_struct_decode(benchmark, size):
+    run_scaled(benchmark, _primitives.Generic.from_python_std(_nested_dict(size)).to_python_std, size)
+
+
+@_pytest.mark.parametrize("size", GENERIC_SIZES)
+def test_generic_binary_decode(benchmark, size):
+    run_scaled(benchmark, _binary_from_python_std(_nested_dict(size)).to_python_std, size)
@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+
+import pytest as _pytest
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+from flytekit.common.types import helpers as _type_helpers
+from flytekit.models import literals as _literal_models
+from flytekit.sdk.types import Types
+from tests.flytekit.benchmarks.utils import COLLECTION_SIZES, run_scaled
+
+_pytest.importorskip("pytest_benchmark")
+
+
+def _integer_list_map(size):
+    return _type_helpers.pack_python_std_map_to_literal_map(
+        {'a': list(range(size))},
+        {'a': Types.List(Types.Integer)}
+    )
+
+
+def _string_map(size):
+    return _type_helpers.pack_python_std_map_to_literal_map(
+        {'key_{}'.format(i): 'value_{}'.format(i) for i in range(size)},
+        {'key_{}'.format(i): Types.String for i in range(size)}
+    )
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_literal_map_to_flyte_idl(benchmark, size):
+    run_scaled(benchmark, _integer_list_map(size).to_flyte_idl, size)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_literal_map_from_flyte_idl(benchmark, size):
+    run_scaled(benchmark, _literal_models.LiteralMap.from_flyte_idl, size, _integer_list_map(size).to_flyte_idl())
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_literal_map_serialize(benchmark, size):
+    pb = _integer_list_map(size).to_flyte_idl()
+    run_scaled(benchmark, pb.SerializeToString, size)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_literal_map_parse(benchmark, size):
+    data = _integer_list_map(size).to_flyte_idl().SerializeToString()
+    run_scaled(benchmark, _literals_pb2.LiteralMap.FromString, size, data)
+
+
+@_pytest.mark.parametrize("size", [100, 10000])
+def test_wide_literal_map_round_trip(benchmark, size):
+    literal_map = _string_map(size)
+
+    def _round_trip():
+        return _literal_models.LiteralMap.from_flyte_idl(
+            _literals_pb2.LiteralMap.FromString(literal_map.to_flyte_idl().SerializeToString())
+        )
+
+    run_scaled(benchmark, _round_trip, size)
@@ -0,0 +1,142 @@
+from __future__ import absolute_import
+
+import numpy as _np
+import pytest as _pytest
+from flyteidl.core import errors_pb2 as _errors_pb2
+
+from flytekit.common import interface as _interface
+from flytekit.common.types import helpers as _type_helpers
+from flytekit.models import literals as _literal_models
+from flytekit.sdk.types import Types
+from tests.flytekit.benchmarks.utils import COLLECTION_SIZES, run_scaled
+
+_pytest.importorskip("pytest_benchmark")
+
+_PRIMITIVE_TYPE_MAP = {
+    'int_{}'.format(i): Types.Integer for i in range(25)
+}
+_PRIMITIVE_TYPE_MAP.update({'float_{}'.format(i): Types.Float for i in range(25)})
+_PRIMITIVE_TYPE_MAP.update({'string_{}'.format(i): Types.String for i in range(25)})
+_PRIMITIVE_TYPE_MAP.update({'bool_{}'.format(i): Types.Boolean for i in range(25)})
+
+_PRIMITIVE_VALUES = {
+    k: {Types.Integer: 1, Types.Float: 1.0, Types.String: 'abc', Types.Boolean: True}[v]
+    for k, v in _PRIMITIVE_TYPE_MAP.items()
+}
+
+
+def _nested_list(size):
+    width = int(size ** 0.5)
+    return [list(range(width)) for _ in range(size // width)]
+
+
+def test_pack_primitives(benchmark):
+    benchmark(_type_helpers.pack_python_std_map_to_literal_map, _PRIMITIVE_VALUES, _PRIMITIVE_TYPE_MAP)
+
+
+def test_unpack_primitives(benchmark):
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(_PRIMITIVE_VALUES, _PRIMITIVE_TYPE_MAP)
+    benchmark(_type_helpers.unpack_literal_map_to_sdk_python_std, literal_map, _PRIMITIVE_TYPE_MAP)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_pack_integer_list(benchmark, size):
+    type_map = {'a': Types.List(Types.Integer)}
+    run_scaled(benchmark, _type_helpers.pack_python_std_map_to_literal_map, size, {'a': list(range(size))}, type_map)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_unpack_integer_list(benchmark, size):
+    type_map = {'a': Types.List(Types.Integer)}
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map({'a': list(range(size))}, type_map)
+    run_scaled(benchmark, _type_helpers.unpack_literal_map_to_sdk_python_std, size, literal_map, type_map)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_pack_nested_list(benchmark, size):
+    type_map = {'a': Types.List(Types.List(Types.Integer))}
+    run_scaled(benchmark, _type_helpers.pack_python_std_map_to_literal_map, size, {'a': _nested_list(size)}, type_map)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_unpack_nested_list(benchmark, size):
+    type_map = {'a': Types.List(Types.List(Types.Integer))}
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map({'a': _nested_list(size)}, type_map)
+    run_scaled(benchmark, _type_helpers.unpack_literal_map_to_sdk_python_std, size, literal_map, type_map)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_pack_unpack_array(benchmark, size):
+    type_map = {'a': Types.Array(_np.int64)}
+
+    def _round_trip(value):
+        return _type_helpers.unpack_literal_map_to_sdk_python_std(
+            _type_helpers.pack_python_std_map_to_literal_map(value, type_map),
+            type_map
+        )
+
+    run_scaled(benchmark, _round_trip, size, {'a': _np.arange(size, dtype=_np.int64)})
+
+
+@_pytest.mark.parametrize("size", [100, 10000, 100000])
+def test_pack_generic(benchmark, size):
+    type_map = {'a': Types.Generic}
+    value = {'a': {'key_{}'.format(i): {'value': i, 'name': 'abc', 'nested': [1, 2, 3]} for i in range(size)}}
+    run_scaled(benchmark, _type_helpers.pack_python_std_map_to_literal_map, size, value, type_map)
+
+
+@_pytest.mark.parametrize("size", [100, 10000, 100000])
+def test_unpack_generic(benchmark, size):
+    type_map = {'a': Types.Generic}
+    value = {'a': {'key_{}'.format(i): {'value': i, 'name': 'abc', 'nested': [1, 2, 3]} for i in range(size)}}
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(value, type_map)
+    run_scaled(benchmark, _type_helpers.unpack_literal_map_to_sdk_python_std, size, literal_map, type_map)
+
+
+def test_pack_unpack_protobuf(benchmark):
+    type_map = {'a': Types.Proto(_errors_pb2.ContainerError)}
+    value = {'a': _errors_pb2.ContainerError(code='code', message='x' * 100000)}
+
+    def _round_trip():
+        return _type_helpers.unpack_literal_map_to_sdk_python_std(
+            _literal_models.LiteralMap.from_flyte_idl(
+                _type_helpers.pack_python_std_map_to_literal_map(value, type_map).to_flyte_idl()
+            ),
+            type_map
+        )
+
+    benchmark(_round_trip)
+
+
+def test_unpack_schema_reference(benchmark):
+    schema_type = Types.Schema([('a', Types.Integer), ('b', Types.String), ('c', Types.Float)])
+    type_map = {'schema_{}'.format(i): schema_type for i in range(100)}
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+        {k: 's3://bucket/schema_{}/'.format(k) for k in type_map},
+        type_map
+    )
+    benchmark(_type_helpers.unpack_literal_map_to_sdk_object, literal_map, type_map)
+
+
+def test_infer_schema_reference(benchmark):
+    schema_type = Types.Schema([('a', Types.Integer), ('b', Types.String), ('c', Types.Float)])
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+        {'schema_{}'.format(i): 's3://bucket/schema_{}/'.format(i) for i in range(100)},
+        {'schema_{}'.format(i): schema_type for i in range(100)}
+    )
+    benchmark(_type_helpers.unpack_literal_map_to_sdk_object, literal_map)
+
+
+def test_unpack_blob_reference(benchmark):
+    type_map = {'blob_{}'.format(i): Types.Blob for i in range(100)}
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+        {k: 's3://bucket/{}'.format(k) for k in type_map},
+        type_map
+    )
+    benchmark(_type_helpers.unpack_literal_map_to_sdk_object, literal_map, type_map)
+
+
+@_pytest.mark.parametrize("size", COLLECTION_SIZES)
+def test_binding_data_from_python_std(benchmark, size):
+    literal_type = Types.List(Types.Integer).to_flyte_literal_type()
+    run_scaled(benchmark, _interface.BindingData.from_python_std, size, literal_type, list(range(size)))
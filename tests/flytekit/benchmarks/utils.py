@@ -0,0 +1,19 @@
+from __future__ import absolute_import
+
+# Element counts used for collection benchmarks.
+COLLECTION_SIZES = [1000, 100000, 1000000]
+
+
+def run_scaled(benchmark, fn, size, *args):
+    """
+    Large inputs take seconds per call, so the number of rounds is scaled down with the size of the input to keep the
+    runtime of the suite bounded.
+
+    :param benchmark: The pytest-benchmark fixture.
+    :param fn: The function to benchmark.
+    :param int size: Number of elements processed per call.
+    :rtype: T
+    """
+    benchmark.extra_info['size'] = size
+    rounds = max(1, min(20, 1000000 // (size * 10)))
+    return benchmark.pedantic(fn, args=args, rounds=rounds, iterations=1, warmup_rounds=0)
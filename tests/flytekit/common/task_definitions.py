@@ -1,5 +1,5 @@
 from __future__ import absolute_import
-from flytekit.sdk.tasks import python_task, inputs, outputs
+from flytekit.sdk.tasks import python_task, dynamic_task, inputs, outputs
 from flytekit.sdk.types import Types
 
 
@@ -8,3 +8,24 @@ from flytekit.sdk.types import Types
 @python_task
 def add_one(wf_params, a, b):
     b.set(a + 1)
+
+
+@inputs(n=Types.Integer)
+@outputs(b=[Types.Integer])
+@dynamic_task
+def add_ones(wf_params, n, b):
+    res = []
+    for i in range(n):
+        t = add_one(a=i)
+        yield t
+        res.append(t.outputs.b)
+    b.set(res)
+
+
+@inputs(a=Types.Integer, log=Types.String)
+@outputs(b=Types.Integer)
+@python_task(cache=True, cache_version='1')
+def cached_add_one(wf_params, a, log, b):
+    with open(log, 'a') as f:
+        f.write("{}\n".format(a))
+    b.set(a + 1)
@@ -1,16 +1,23 @@
 from __future__ import absolute_import
 
+import json
 import os
+import socket
+import tempfile
+import threading
 
+import mock
+import pytest
 import six
 from click.testing import CliRunner
 from flyteidl.core import literals_pb2 as _literals_pb2
 
-from flytekit.bin.entrypoint import execute_task_cmd, execute_task
-from flytekit.common import utils as _utils, constants as _constants
+from flytekit.bin.entrypoint import execute_task_cmd, execute_task, _serve, _serve_socket
+from flytekit.common import utils as _utils, constants as _constants, packed_inputs as _packed_inputs
 from flytekit.common.types import helpers as _type_helpers
 from flytekit.models import literals as _literals
-from flytekit.configuration import TemporaryConfiguration as _TemporaryConfiguration
+from flytekit.configuration import TemporaryConfiguration as _TemporaryConfiguration, sdk as _sdk_config
+from flytekit.interfaces.data import data_proxy as _data_proxy
 from flytekit.models import literals as _literal_models
 from tests.flytekit.common import task_definitions as _task_defs
 
@@ -139,5 +146,380 @@ def test_arrayjob_entrypoint_in_proc():
             # reset the env vars
             if orig_env_index_var_name:
                 os.environ['BATCH_JOB_ARRAY_INDEX_VAR_NAME'] = orig_env_index_var_name
+            else:
+                os.environ.pop('BATCH_JOB_ARRAY_INDEX_VAR_NAME')
             if orig_env_array_index:
                 os.environ['AWS_BATCH_JOB_ARRAY_INDEX'] = orig_env_array_index
+            else:
+                os.environ.pop('AWS_BATCH_JOB_ARRAY_INDEX')
+
+
+def _write_add_one_inputs(directory, a):
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+        {'a': a}, _type_map_from_variable_map(_task_defs.add_one.interface.inputs))
+    input_file = os.path.join(directory, "inputs_{}.pb".format(a))
+    _utils.write_proto_to_file(literal_map.to_flyte_idl(), input_file)
+    return input_file
+
+
+def _read_add_one_outputs(output_prefix):
+    return _type_helpers.unpack_literal_map_to_sdk_python_std(
+        _literal_models.LiteralMap.from_flyte_idl(
+            _utils.load_proto_from_file(
+                _literals_pb2.LiteralMap,
+                os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME)
+            )
+        ),
+        _type_map_from_variable_map(_task_defs.add_one.interface.outputs)
+    )
+
+
+def _add_one_request(input_dir, a, **kwargs):
+    request = {
+        'task_module': _task_defs.add_one.task_module,
+        'task_name': _task_defs.add_one.task_function_name,
+        'inputs': _write_add_one_inputs(input_dir, a),
+        'output_prefix': os.path.join(input_dir, "out_{}".format(a)),
+    }
+    request.update(kwargs)
+    return json.dumps(request)
+
+
+def test_serve_requests():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            tempdir = tempfile.gettempdir()
+            requests = [
+                _add_one_request(d.name, 1, id=1),
+                "",
+                json.dumps({'id': 2, 'task_module': 'not.a.module', 'task_name': 'nothing', 'inputs': 'none',
+                            'output_prefix': d.name}),
+                _add_one_request(d.name, 2, env={'FLYTE_TEST_WARM_WORKER': 'request'}),
+                "not json",
+            ]
+            responses = []
+            _serve(requests, lambda r: responses.append(json.loads(r)))
+
+            assert len(responses) == 4
+            assert responses[0] == {'id': 1, 'status': 'ok'}
+            assert responses[1]['id'] == 2
+            assert responses[1]['status'] == 'error'
+            assert 'No module named' in responses[1]['error']
+            assert responses[2] == {'status': 'ok'}
+            assert responses[3]['status'] == 'error'
+
+            assert _read_add_one_outputs(os.path.join(d.name, "out_1")) == {'b': 2}
+            assert _read_add_one_outputs(os.path.join(d.name, "out_2")) == {'b': 3}
+            assert 'FLYTE_TEST_WARM_WORKER' not in os.environ
+            assert tempfile.gettempdir() == tempdir
+
+
+def test_serve_socket():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            socket_path = os.path.join(d.name, "worker.sock")
+            server = threading.Thread(target=_serve_socket, args=(socket_path,))
+            server.daemon = True
+            server.start()
+            while not os.path.exists(socket_path):
+                pass
+
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(socket_path)
+            stream = client.makefile('rw')
+            for a in range(3):
+                stream.write(_add_one_request(d.name, a, id=a) + "\n")
+                stream.flush()
+                assert json.loads(stream.readline()) == {'id': a, 'status': 'ok'}
+                assert _read_add_one_outputs(os.path.join(d.name, "out_{}".format(a))) == {'b': a + 1}
+            client.close()
+
+
+@pytest.mark.parametrize('parallelism', ['1', '2'])
+def test_batched_arrayjob_entrypoint_in_proc(parallelism):
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            for i in range(5):
+                sub_task_dir = os.path.join(d.name, str(i))
+                os.mkdir(sub_task_dir)
+                os.rename(_write_add_one_inputs(d.name, i), os.path.join(sub_task_dir, "inputs.pb"))
+
+            # The second container of an array job that packs two sub-tasks into each container.
+            with mock.patch.dict(os.environ, {
+                'BATCH_JOB_ARRAY_INDEX_VAR_NAME': 'AWS_BATCH_JOB_ARRAY_INDEX',
+                'AWS_BATCH_JOB_ARRAY_INDEX': '1',
+                _constants.ARRAY_BATCH_SIZE_ENV_VAR: '2',
+                _constants.ARRAY_SUB_TASK_COUNT_ENV_VAR: '5',
+                _sdk_config.ARRAY_BATCH_PARALLELISM.env_var: parallelism,
+            }):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    d.name,
+                    d.name,
+                    False
+                )
+
+                assert _read_add_one_outputs(os.path.join(d.name, "2")) == {'b': 3}
+                assert _read_add_one_outputs(os.path.join(d.name, "3")) == {'b': 4}
+                for i in (0, 1, 4):
+                    assert not os.path.exists(os.path.join(d.name, str(i), _constants.OUTPUT_FILE_NAME))
+
+                # The last container gets the remainder of the sub-tasks.
+                os.environ['AWS_BATCH_JOB_ARRAY_INDEX'] = '2'
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    d.name,
+                    d.name,
+                    False
+                )
+                assert _read_add_one_outputs(os.path.join(d.name, "4")) == {'b': 5}
+
+
+@pytest.mark.parametrize('batch_size', [None, '2'])
+def test_packed_arrayjob_entrypoint_in_proc(batch_size):
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            _packed_inputs.PackedLiteralMaps([
+                _type_helpers.pack_python_std_map_to_literal_map(
+                    {'a': i}, _type_map_from_variable_map(_task_defs.add_one.interface.inputs))
+                for i in range(5)
+            ]).write(os.path.join(d.name, _constants.PACKED_INPUTS_FILE_NAME))
+
+            env = {
+                'BATCH_JOB_ARRAY_INDEX_VAR_NAME': 'AWS_BATCH_JOB_ARRAY_INDEX',
+                'AWS_BATCH_JOB_ARRAY_INDEX': '1',
+                _constants.ARRAY_PACKED_INPUTS_ENV_VAR: _constants.PACKED_INPUTS_FILE_NAME,
+            }
+            if batch_size:
+                env[_constants.ARRAY_BATCH_SIZE_ENV_VAR] = batch_size
+                env[_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR] = '5'
+            with mock.patch.dict(os.environ, env):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    d.name,
+                    d.name,
+                    False
+                )
+
+            executed = [2, 3] if batch_size else [1]
+            for i in range(5):
+                if i in executed:
+                    assert _read_add_one_outputs(os.path.join(d.name, str(i))) == {'b': i + 1}
+                else:
+                    assert not os.path.exists(os.path.join(d.name, str(i), _constants.OUTPUT_FILE_NAME))
+
+
+def test_dynamic_task_packs_array_inputs():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development',
+                                     'image': 'flyteimage:0.0.1'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+                {'n': 3}, _type_map_from_variable_map(_task_defs.add_ones.interface.inputs))
+            input_file = os.path.join(d.name, "inputs.pb")
+            _utils.write_proto_to_file(literal_map.to_flyte_idl(), input_file)
+
+            with mock.patch.dict(os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+                execute_task(
+                    _task_defs.add_ones.task_module,
+                    _task_defs.add_ones.task_function_name,
+                    input_file,
+                    d.name,
+                    False
+                )
+
+            assert os.path.exists(os.path.join(d.name, _constants.FUTURES_FILE_NAME))
+            (node_id,) = [n for n in os.listdir(d.name) if os.path.isdir(os.path.join(d.name, n))]
+            assert os.listdir(os.path.join(d.name, node_id)) == [_constants.PACKED_INPUTS_FILE_NAME]
+
+            # The containers of the array job each read their own inputs from the packed file.
+            with mock.patch.dict(os.environ, {
+                'BATCH_JOB_ARRAY_INDEX_VAR_NAME': 'AWS_BATCH_JOB_ARRAY_INDEX',
+                'AWS_BATCH_JOB_ARRAY_INDEX': '2',
+                _constants.ARRAY_PACKED_INPUTS_ENV_VAR: _constants.PACKED_INPUTS_FILE_NAME,
+            }):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    os.path.join(d.name, node_id),
+                    os.path.join(d.name, node_id),
+                    False
+                )
+            assert _read_add_one_outputs(os.path.join(d.name, node_id, '2')) == {'b': 3}
+
+
+def test_inputs_are_fetched_while_importing():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            fetching_threads = []
+            get_data = _data_proxy.Data.get_data
+
+            def _get_data(remote_path, local_path, is_multipart=False):
+                fetching_threads.append(threading.current_thread())
+                return get_data(remote_path, local_path, is_multipart=is_multipart)
+
+            with mock.patch.object(_data_proxy.Data, 'get_data', side_effect=_get_data):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    _write_add_one_inputs(d.name, 4),
+                    d.name,
+                    False
+                )
+
+            assert len(fetching_threads) == 1
+            assert fetching_threads[0] is not threading.current_thread()
+            assert _read_add_one_outputs(d.name) == {'b': 5}
+
+
+def _span_names(spans):
+    names = set()
+    for span in spans:
+        names.add(span['name'])
+        names.update(_span_names(span['children']))
+    return names
+
+
+def test_timings_are_reported():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            stats = mock.MagicMock()
+            with mock.patch.dict(os.environ, {_sdk_config.WRITE_TIMINGS.env_var: 'True'}), \
+                    mock.patch('flytekit.engines.flyte.engine.get_task_stats', return_value=stats) as get_task_stats:
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    _write_add_one_inputs(d.name, 4),
+                    d.name,
+                    False
+                )
+
+            get_task_stats.assert_any_call('execution')
+            metrics = {c[0][0] for c in stats.timing.call_args_list}
+            assert {'load_config', 'import_module', 'fetch_inputs.download', 'execute.run_task.user_code',
+                    'execute.upload_outputs.upload'} <= metrics
+
+            with open(os.path.join(d.name, _constants.TIMINGS_FILE_NAME)) as f:
+                timings = json.load(f)
+            assert {'load_config', 'import_module', 'fetch_inputs', 'wait_for_inputs', 'load_inputs', 'unpack_inputs',
+                    'user_code', 'serialize_outputs', 'upload_outputs'} <= _span_names(timings['spans'])
+            assert _read_add_one_outputs(d.name) == {'b': 5}
+
+
+def test_profiles_are_uploaded():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d:
+            with mock.patch.dict(os.environ, {
+                _sdk_config.PROFILE_CPU.env_var: 'True',
+                _sdk_config.PROFILE_MEMORY.env_var: 'True',
+            }):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    _write_add_one_inputs(d.name, 4),
+                    d.name,
+                    False
+                )
+
+            assert sorted(os.listdir(os.path.join(d.name, _constants.PROFILES_DIR))) == \
+                ['cpu.prof', 'cpu.txt', 'memory.txt']
+            assert _read_add_one_outputs(d.name) == {'b': 5}
+
+
+def test_array_job_outputs_are_cached():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d, _utils.AutoDeletingTempDir("cache") as cache:
+            log = os.path.join(d.name, 'log')
+            sub_task_dir = os.path.join(d.name, '1')
+            os.mkdir(sub_task_dir)
+            _utils.write_proto_to_file(
+                _type_helpers.pack_python_std_map_to_literal_map(
+                    {'a': 1, 'log': log},
+                    _type_map_from_variable_map(_task_defs.cached_add_one.interface.inputs)
+                ).to_flyte_idl(),
+                os.path.join(sub_task_dir, _constants.INPUT_FILE_NAME)
+            )
+
+            with mock.patch.dict(os.environ, {
+                'BATCH_JOB_ARRAY_INDEX_VAR_NAME': 'AWS_BATCH_JOB_ARRAY_INDEX',
+                'AWS_BATCH_JOB_ARRAY_INDEX': '1',
+                _sdk_config.OUTPUT_CACHE_PREFIX.env_var: cache.name,
+            }):
+                for _ in range(2):
+                    execute_task(
+                        _task_defs.cached_add_one.task_module,
+                        _task_defs.cached_add_one.task_function_name,
+                        d.name,
+                        d.name,
+                        False
+                    )
+                    assert _read_add_one_outputs(sub_task_dir) == {'b': 2}
+                    # A re-run of the sub-task copies the outputs from the cache.
+                    os.remove(os.path.join(sub_task_dir, _constants.OUTPUT_FILE_NAME))
+
+            with open(log) as f:
+                assert f.read() == "1\n"
+
+
+def test_uncached_tasks_are_not_cached():
+    with _TemporaryConfiguration(os.path.join(os.path.dirname(__file__), 'fake.config'),
+                                 internal_overrides={
+                                     'project': 'test',
+                                     'domain': 'development'
+                                 }):
+        with _utils.AutoDeletingTempDir("dir") as d, _utils.AutoDeletingTempDir("cache") as cache:
+            sub_task_dir = os.path.join(d.name, '0')
+            os.mkdir(sub_task_dir)
+            os.rename(_write_add_one_inputs(d.name, 0), os.path.join(sub_task_dir, _constants.INPUT_FILE_NAME))
+            with mock.patch.dict(os.environ, {
+                'BATCH_JOB_ARRAY_INDEX_VAR_NAME': 'AWS_BATCH_JOB_ARRAY_INDEX',
+                'AWS_BATCH_JOB_ARRAY_INDEX': '0',
+                _sdk_config.OUTPUT_CACHE_PREFIX.env_var: cache.name,
+            }):
+                execute_task(
+                    _task_defs.add_one.task_module,
+                    _task_defs.add_one.task_function_name,
+                    d.name,
+                    d.name,
+                    False
+                )
+            assert _read_add_one_outputs(sub_task_dir) == {'b': 1}
+            assert os.listdir(cache.name) == []
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from flytekit.common.exceptions import system, user, scopes
 from flytekit.models.core import errors as _error_models
 import pytest
+from concurrent import futures
 
 
 @scopes.user_entry_point
@@ -104,3 +105,15 @@ def test_intercepted_scope_flyte_system_exception():
     assert "Bad assert" in e.verbose_message
     assert "SYSTEM ERROR!" in e.verbose_message
     assert e.kind == _error_models.ContainerError.Kind.RECOVERABLE
+
+
+def test_thread_scopes():
+    def _raise_in_thread(thread_scopes):
+        with thread_scopes:
+            _user_func(ValueError("Bad value"))
+
+    thread_scopes = scopes.ThreadScopes()
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError):
+            executor.submit(_raise_in_thread, thread_scopes).result()
+    assert scopes._CONTEXT_STACK.stack == [scopes._NULL_CONTEXT]
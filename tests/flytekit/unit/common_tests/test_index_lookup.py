@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+
+import os
+
+import mock
+import pytest
+
+from flytekit.common import constants as _constants, index_lookup as _index_lookup, utils as _utils
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.interfaces.data import data_proxy as _data_proxy
+from flytekit.models import literals as _literals
+
+
+def _write_index_lookup_pb(directory, child_indices):
+    _utils.write_proto_to_file(
+        _literals.LiteralCollection([
+            _literals.Literal(_literals.Scalar(primitive=_literals.Primitive(integer=i))) for i in child_indices
+        ]).to_flyte_idl(),
+        os.path.join(directory, _constants.INDEX_LOOKUP_FILE_NAME)
+    )
+
+
+def test_to_bytes():
+    assert _index_lookup.to_bytes([]) == b''
+    assert _index_lookup.to_bytes([1, 2 ** 40]) == b'\x01' + b'\x00' * 7 + b'\x00' * 5 + b'\x01' + b'\x00' * 2
+
+
+def test_packed_index_lookup():
+    with _utils.AutoDeletingTempDir("datadir") as datadir, _utils.AutoDeletingTempDir("input_dir") as input_dir, \
+            mock.patch.dict(os.environ, {_sdk_config.PACKED_INDEX_LOOKUP.env_var: 'true'}):
+        _index_lookup.write([4, 7, 9], os.path.join(datadir.name, _constants.PACKED_INDEX_LOOKUP_FILE_NAME))
+        # The packed index lookup takes precedence over the protobuf one.
+        _write_index_lookup_pb(datadir.name, [0, 0, 0])
+        assert [_index_lookup.map_job_index_to_child_index(input_dir, datadir.name, i) for i in range(3)] == [4, 7, 9]
+
+        with pytest.raises(_system_exceptions.FlyteSystemAssertion):
+            _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 3)
+
+        # Falls back to the protobuf index lookup.
+        os.remove(os.path.join(datadir.name, _constants.PACKED_INDEX_LOOKUP_FILE_NAME))
+        assert _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 1) == 0
+
+
+def test_packed_index_lookup_disabled():
+    with _utils.AutoDeletingTempDir("datadir") as datadir, _utils.AutoDeletingTempDir("input_dir") as input_dir, \
+            mock.patch.object(_data_proxy.Data, 'data_exists', wraps=_data_proxy.Data.data_exists) as data_exists:
+        _index_lookup.write([4, 7, 9], os.path.join(datadir.name, _constants.PACKED_INDEX_LOOKUP_FILE_NAME))
+        assert _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 1) == 1
+        # Only the protobuf index lookup is looked for.
+        assert data_exists.call_count == 1
+
+
+def test_index_lookup_pb():
+    with _utils.AutoDeletingTempDir("datadir") as datadir, _utils.AutoDeletingTempDir("input_dir") as input_dir:
+        _write_index_lookup_pb(datadir.name, [4, 7])
+        assert _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 1) == 7
+
+        with pytest.raises(_system_exceptions.FlyteSystemAssertion):
+            _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 2)
+
+
+def test_no_index_lookup():
+    with _utils.AutoDeletingTempDir("datadir") as datadir, _utils.AutoDeletingTempDir("input_dir") as input_dir:
+        assert _index_lookup.map_job_index_to_child_index(input_dir, datadir.name, 5) == 5
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+
+import os as _os
+
+import mock as _mock
+
+from flytekit.common import local_cache as _local_cache, utils as _utils
+from flytekit.common.types import blobs as _blobs, primitives as _primitives
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.models import literals as _literals
+
+
+def _int_map(**kwargs):
+    return _literals.LiteralMap(literals={k: _primitives.Integer(v) for k, v in kwargs.items()})
+
+
+def test_hash_literal_map():
+    assert _local_cache.hash_literal_map(_int_map(a=1, b=2)) == _local_cache.hash_literal_map(_int_map(b=2, a=1))
+    assert _local_cache.hash_literal_map(_int_map(a=1, b=2)) != _local_cache.hash_literal_map(_int_map(a=2, b=1))
+    assert _local_cache.hash_literal_map(_int_map(a=1)) != _local_cache.hash_literal_map(_int_map(b=1))
+    assert _local_cache.hash_literal_map(_int_map()) != _local_cache.hash_literal_map(_int_map(a=0))
+
+
+def test_get_and_put():
+    with _utils.AutoDeletingTempDir("cache") as t:
+        store = _local_cache.LocalMemoStore(t.name)
+        assert store.get("module.task", "1", _int_map(a=1)) is None
+
+        store.put("module.task", "1", _int_map(a=1), _int_map(b=2))
+        assert store.get("module.task", "1", _int_map(a=1)) == _int_map(b=2)
+        assert store.get("module.task", "2", _int_map(a=1)) is None
+        assert store.get("module.other", "1", _int_map(a=1)) is None
+        assert store.get("module.task", "1", _int_map(a=2)) is None
+
+        # Existing entries are kept.
+        store.put("module.task", "1", _int_map(a=1), _int_map(b=3))
+        assert store.get("module.task", "1", _int_map(a=1)) == _int_map(b=2)
+
+
+def test_blobs_are_copied():
+    with _utils.AutoDeletingTempDir("cache") as t, _utils.AutoDeletingTempDir("outputs") as outputs_dir:
+        blob_path = _os.path.join(outputs_dir.name, "blob")
+        with open(blob_path, 'w') as f:
+            f.write("hello")
+        outputs = _literals.LiteralMap(literals={'b': _blobs.Blob.from_python_std(blob_path)})
+
+        store = _local_cache.LocalMemoStore(t.name)
+        store.put("module.task", "1", _int_map(a=1), outputs)
+        _os.remove(blob_path)
+
+        cached_uri = store.get("module.task", "1", _int_map(a=1)).literals['b'].scalar.blob.uri
+        assert cached_uri.startswith(t.name)
+        with open(cached_uri) as f:
+            assert f.read() == "hello"
+
+
+def test_invalidate():
+    with _utils.AutoDeletingTempDir("cache") as t:
+        store = _local_cache.LocalMemoStore(t.name)
+        store.put("module.task", "1", _int_map(a=1), _int_map(b=2))
+        store.put("module.task", "2", _int_map(a=1), _int_map(b=2))
+        store.put("module.other", "1", _int_map(a=1), _int_map(b=2))
+
+        store.invalidate("module.task", "1")
+        assert store.get("module.task", "1", _int_map(a=1)) is None
+        assert store.get("module.task", "2", _int_map(a=1)) is not None
+
+        store.invalidate("module.task")
+        assert store.get("module.task", "2", _int_map(a=1)) is None
+        assert store.get("module.other", "1", _int_map(a=1)) is not None
+
+        store.invalidate()
+        assert store.get("module.other", "1", _int_map(a=1)) is None
+
+
+def test_eviction():
+    with _utils.AutoDeletingTempDir("cache") as t:
+        store = _local_cache.LocalMemoStore(t.name)
+        for i in range(3):
+            store.put("module.task", "1", _int_map(a=i), _int_map(b=i))
+            entry = _os.path.join(store._entry_directory("module.task", "1", _int_map(a=i)), "outputs.pb")
+            _os.utime(entry, (i, i))
+        entry_size = _os.path.getsize(entry)
+
+        # Reading an entry marks it as recently used.
+        assert store.get("module.task", "1", _int_map(a=0)) is not None
+        store.evict(2 * entry_size)
+        assert store.get("module.task", "1", _int_map(a=0)) is not None
+        assert store.get("module.task", "1", _int_map(a=1)) is None
+        assert store.get("module.task", "1", _int_map(a=2)) is not None
+
+        store.evict(0)
+        assert store.get("module.task", "1", _int_map(a=2)) is None
+
+
+def test_eviction_on_put():
+    with _utils.AutoDeletingTempDir("cache") as t:
+        store = _local_cache.LocalMemoStore(t.name)
+        store.put("module.task", "1", _int_map(a=0), _int_map(b=0))
+        entry_size = _directory_size(store._entry_directory("module.task", "1", _int_map(a=0)))
+
+        store = _local_cache.LocalMemoStore(t.name, max_size=5 * entry_size)
+        with _mock.patch.object(store, '_scan', wraps=store._scan) as scan:
+            for i in range(1, 5):
+                store.put("module.task", "1", _int_map(a=i), _int_map(b=i))
+            # The size of the store is only computed once, and updated on every put after that.
+            assert scan.call_count == 1
+
+            # Crossing the maximum size evicts the least recently used entries down to the eviction target.
+            store.put("module.task", "1", _int_map(a=5), _int_map(b=5))
+            assert scan.call_count == 2
+        remaining = [i for i in range(6) if store.get("module.task", "1", _int_map(a=i)) is not None]
+        assert len(remaining) == 4
+        assert 5 in remaining
+
+
+def test_memo_stores_are_shared():
+    with _utils.AutoDeletingTempDir("cache") as t:
+        with _mock.patch.dict(_os.environ, {
+            _sdk_config.LOCAL_CACHE_ENABLED.env_var: 'True',
+            _sdk_config.LOCAL_CACHE_DIRECTORY.env_var: t.name,
+        }):
+            assert _local_cache.get_memo_store() is _local_cache.get_memo_store()
+            assert _local_cache.get_memo_store().directory == t.name
+
+
+def _directory_size(directory):
+    return sum(
+        _os.path.getsize(_os.path.join(root, file_name))
+        for root, _, file_names in _os.walk(directory) for file_name in file_names
+    )
@@ -0,0 +1,53 @@
+from __future__ import absolute_import
+
+import os
+
+from flytekit.common import constants as _constants, output_cache as _output_cache, utils as _utils
+from flytekit.models import literals as _literals
+
+
+def _inputs(a):
+    return _literals.LiteralMap(literals={'a': _literals.Literal(
+        scalar=_literals.Scalar(primitive=_literals.Primitive(integer=a)))})
+
+
+def _outputs(b):
+    return _literals.LiteralMap(literals={'b': _literals.Literal(
+        scalar=_literals.Scalar(primitive=_literals.Primitive(integer=b)))})
+
+
+def test_fetch_and_store(tmpdir):
+    cache = _output_cache.OutputCache(tmpdir.join('cache').strpath, 'my.task', '1')
+    output_prefix = tmpdir.join('outputs').strpath
+    os.makedirs(output_prefix)
+    assert not cache.fetch(_inputs(1), output_prefix)
+    assert not cache.store(_inputs(1), output_prefix)
+
+    _utils.write_proto_to_file(_outputs(2).to_flyte_idl(), os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME))
+    assert cache.store(_inputs(1), output_prefix)
+    assert os.path.exists(cache.entry_path(_inputs(1)))
+    assert os.listdir(os.path.dirname(cache.entry_path(_inputs(1)))) == [_constants.OUTPUT_FILE_NAME]
+
+    fetched_prefix = tmpdir.join('fetched').strpath
+    assert cache.fetch(_inputs(1), fetched_prefix)
+    with open(os.path.join(fetched_prefix, _constants.OUTPUT_FILE_NAME), 'rb') as f:
+        assert f.read() == _outputs(2).to_flyte_idl().SerializeToString()
+    assert not cache.fetch(_inputs(2), fetched_prefix)
+
+
+def test_failed_tasks_are_not_stored(tmpdir):
+    cache = _output_cache.OutputCache(tmpdir.join('cache').strpath, 'my.task', '1')
+    output_prefix = tmpdir.strpath
+    _utils.write_proto_to_file(_outputs(2).to_flyte_idl(), os.path.join(output_prefix, _constants.OUTPUT_FILE_NAME))
+    with open(os.path.join(output_prefix, _constants.ERROR_FILE_NAME), 'w') as f:
+        f.write('error')
+    assert not cache.store(_inputs(1), output_prefix)
+    assert not os.path.exists(cache.entry_path(_inputs(1)))
+
+
+def test_entries_are_keyed_by_version(tmpdir):
+    v1 = _output_cache.OutputCache(tmpdir.strpath, 'my.task', '1')
+    v2 = _output_cache.OutputCache(tmpdir.strpath, 'my.task', '2')
+    assert v1.entry_path(_inputs(1)) != v2.entry_path(_inputs(1))
+    assert v1.entry_path(_inputs(1)) != v1.entry_path(_inputs(2))
+    assert v1.entry_path(_inputs(1)) == _output_cache.OutputCache(tmpdir.strpath, 'my.task', '1').entry_path(_inputs(1))
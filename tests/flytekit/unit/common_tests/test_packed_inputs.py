@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+
+import os
+
+import pytest
+from flyteidl.core import literals_pb2 as _literals_pb2
+
+from flytekit.common import packed_inputs as _packed_inputs, utils as _utils
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.models import literals as _literals
+
+
+def _literal_map(i):
+    return _literals.LiteralMap(literals={
+        'a': _literals.Literal(scalar=_literals.Scalar(primitive=_literals.Primitive(integer=i))),
+        'b': _literals.Literal(scalar=_literals.Scalar(primitive=_literals.Primitive(string_value='x' * i))),
+    })
+
+
+def test_round_trip():
+    packed = _packed_inputs.PackedLiteralMaps([_literal_map(i) for i in range(3)])
+    packed.append(_literal_map(3))
+    assert len(packed) == 4
+    assert _packed_inputs.PackedLiteralMaps.from_bytes(packed.to_bytes()).literal_maps == \
+        [_literal_map(i) for i in range(4)]
+    assert len(_packed_inputs.PackedLiteralMaps.from_bytes(_packed_inputs.PackedLiteralMaps().to_bytes())) == 0
+
+
+def test_fetch_inputs():
+    with _utils.AutoDeletingTempDir("packed") as d:
+        packed_path = os.path.join(d.name, "array", "inputs.packed")
+        _packed_inputs.PackedLiteralMaps([_literal_map(i) for i in range(5)]).write(packed_path)
+        assert len(_packed_inputs.PackedLiteralMaps.read(packed_path)) == 5
+
+        for i in range(5):
+            local_path = os.path.join(d.name, "inputs_{}.pb".format(i))
+            _packed_inputs.fetch_inputs(packed_path, i, local_path)
+            assert _literals.LiteralMap.from_flyte_idl(
+                _utils.load_proto_from_file(_literals_pb2.LiteralMap, local_path)) == _literal_map(i)
+
+        with pytest.raises(_system_exceptions.FlyteSystemAssertion):
+            _packed_inputs.fetch_inputs(packed_path, 5, os.path.join(d.name, "inputs_5.pb"))
+
+
+def test_not_packed():
+    with pytest.raises(_system_exceptions.FlyteSystemAssertion):
+        _packed_inputs.PackedLiteralMaps.from_bytes(_literal_map(20).to_flyte_idl().SerializeToString())
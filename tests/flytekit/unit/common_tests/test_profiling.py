@@ -0,0 +1,48 @@
+from __future__ import absolute_import
+
+import os as _os
+import pstats as _pstats
+
+import mock as _mock
+
+from flytekit.common import profiling as _profiling, utils as _utils
+from flytekit.configuration import sdk as _sdk_config
+
+
+def _allocate():
+    return [list(range(100)) for _ in range(100)]
+
+
+def test_profiling_disabled_by_default():
+    assert _profiling.UserCodeProfiler.from_config('profiles') is None
+
+
+def test_profiler_from_config():
+    with _mock.patch.dict(_os.environ, {_sdk_config.PROFILE_CPU.env_var: 'True'}):
+        assert _profiling.UserCodeProfiler.from_config('profiles') is not None
+
+
+def test_profiler():
+    with _utils.AutoDeletingTempDir('profiling') as t:
+        directory = _os.path.join(t.name, 'profiles')
+        with _profiling.UserCodeProfiler(directory, cpu=True, memory=True):
+            allocated = _allocate()
+        assert len(allocated) == 100
+
+        stats = _pstats.Stats(_os.path.join(directory, _profiling.CPU_PROFILE_FILE_NAME))
+        assert any(name == '_allocate' for _, _, name in stats.stats)
+        with open(_os.path.join(directory, _profiling.CPU_SUMMARY_FILE_NAME)) as f:
+            assert '_allocate' in f.read()
+        with open(_os.path.join(directory, _profiling.MEMORY_SUMMARY_FILE_NAME)) as f:
+            assert f.read().startswith('Peak memory allocated: ')
+
+
+def test_profiler_writes_results_on_failure():
+    with _utils.AutoDeletingTempDir('profiling') as t:
+        try:
+            with _profiling.UserCodeProfiler(t.name, cpu=True):
+                raise ValueError()
+        except ValueError:
+            pass
+        assert _os.path.exists(_os.path.join(t.name, _profiling.CPU_PROFILE_FILE_NAME))
+        assert not _os.path.exists(_os.path.join(t.name, _profiling.MEMORY_SUMMARY_FILE_NAME))
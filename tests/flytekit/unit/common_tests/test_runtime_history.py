@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+
+import fcntl
+import os
+
+from mock import patch
+
+from flytekit.common import runtime_history as _runtime_history
+from flytekit.configuration import sdk as sdk_config
+from flytekit.models import literals as _literals
+from flytekit.sdk.tasks import inputs, outputs, python_task
+from flytekit.sdk.types import Types
+
+
+@inputs(a=Types.Integer)
+@outputs(b=Types.Integer)
+@python_task
+def _sub_task(wf_params, a, b):
+    b.set(a)
+
+
+def _inputs(a):
+    return _literals.LiteralMap(literals={
+        'a': _literals.Literal(scalar=_literals.Scalar(primitive=_literals.Primitive(integer=a))),
+    })
+
+
+def test_record_and_load(tmpdir):
+    history = _runtime_history.RuntimeHistory(tmpdir.strpath)
+    history.record('module.task', 'v1', _inputs(1), 1.5)
+    history.record('module.task', 'v1', _inputs(2), 2.5)
+    history.record('module.task', 'v2', _inputs(1), 3.5)
+
+    runtimes = history.load('module.task', 'v1')
+    assert sorted(runtimes.values()) == [1.5, 2.5]
+    assert list(history.load('module.task', 'v2').values()) == [3.5]
+    assert history.load('module.other', 'v1') == {}
+
+
+def test_load_compacts_superseded_runtimes(tmpdir):
+    history = _runtime_history.RuntimeHistory(tmpdir.strpath)
+    for i in range(5):
+        history.record('module.task', None, _inputs(1), float(i))
+    assert list(history.load('module.task', None).values()) == [4.0]
+
+    runtimes_path = os.path.join(tmpdir.strpath, 'module.task', 'version-', 'runtimes')
+    with open(runtimes_path) as f:
+        assert len(f.readlines()) == 1
+    assert list(history.load('module.task', None).values()) == [4.0]
+
+
+def test_compaction_waits_for_writers(tmpdir):
+    history = _runtime_history.RuntimeHistory(tmpdir.strpath)
+    for i in range(5):
+        history.record('module.task', None, _inputs(1), float(i))
+
+    # While an execution is appending to the file, compaction is left to a later load.
+    runtimes_path = os.path.join(tmpdir.strpath, 'module.task', 'version-', 'runtimes')
+    with open(os.path.join(os.path.dirname(runtimes_path), 'runtimes.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        assert list(history.load('module.task', None).values()) == [4.0]
+    with open(runtimes_path) as f:
+        assert len(f.readlines()) == 5
+
+
+def test_unwritable_history(tmpdir):
+    history = _runtime_history.RuntimeHistory(os.path.join(tmpdir.strpath, 'file'))
+    open(history.directory, 'w').close()
+    history.record('module.task', None, _inputs(1), 1.0)
+    assert history.load('module.task', None) == {}
+
+    @outputs(out=Types.Integer)
+    @python_task
+    def recorded_task(wf_params, out):
+        out.set(1)
+
+    with patch.dict(os.environ, {
+        sdk_config.RUNTIME_HISTORY_ENABLED.env_var: 'True',
+        sdk_config.RUNTIME_HISTORY_DIRECTORY.env_var: history.directory,
+    }):
+        assert recorded_task.unit_test() == {'out': 1}
+
+
+def test_planner(tmpdir):
+    history = _runtime_history.RuntimeHistory(tmpdir.strpath)
+    task_name = _runtime_history.get_task_name(_sub_task)
+    for a in range(10):
+        history.record(task_name, _sub_task.id.version, _inputs(a), 100.0 if a == 9 else 1.0)
+
+    planner = _runtime_history.ArrayJobPlanner(history)
+    assert [planner.add(_sub_task, _inputs(a)) for a in range(12)] == [False] * 9 + [True, False, False]
+
+    # The eleven short sub-tasks take 11 seconds in total, so a parallelism of 1 completes them before the straggler.
+    assert planner.parallelism(_sub_task, False) == 1
+    assert planner.parallelism(_sub_task, True) == 1
+
+
+def test_planner_without_history(tmpdir):
+    planner = _runtime_history.ArrayJobPlanner(_runtime_history.RuntimeHistory(tmpdir.strpath))
+    assert not planner.add(_sub_task, _inputs(1))
+    assert planner.parallelism(_sub_task, False) == 0
+    assert planner.parallelism(_sub_task, False, max_concurrency=5) == 5
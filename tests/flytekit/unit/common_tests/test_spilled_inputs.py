@@ -0,0 +1,21 @@
+from __future__ import absolute_import
+
+import os
+
+from flytekit.common import spilled_inputs as _spilled_inputs, utils as _utils
+from flytekit.models import literals as _literals
+
+
+def test_spill_and_write():
+    literal_map = _literals.LiteralMap(literals={
+        'a': _literals.Literal(scalar=_literals.Scalar(primitive=_literals.Primitive(integer=1))),
+    })
+    with _utils.AutoDeletingTempDir("spilled") as d:
+        spilled = _spilled_inputs.SpilledLiteralMap.spill(literal_map, os.path.join(d.name, "spill", "inputs.pb"))
+        assert spilled.load() == literal_map
+
+        path = os.path.join(d.name, "outputs", "node", "inputs.pb")
+        spilled.write(path)
+        assert not os.path.exists(os.path.join(d.name, "spill", "inputs.pb"))
+        assert spilled.path == path
+        assert spilled.load() == literal_map
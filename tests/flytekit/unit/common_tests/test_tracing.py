@@ -0,0 +1,87 @@
+from __future__ import absolute_import
+
+import json as _json
+import os as _os
+import threading as _threading
+
+import mock as _mock
+
+from flytekit.common import tracing as _tracing, utils as _utils
+
+
+def test_span_without_tracer():
+    with _tracing.span('phase') as span:
+        span.add_bytes(10)
+        span.add_path_bytes(__file__)
+
+
+def test_nested_spans():
+    with _tracing.Tracer() as tracer:
+        with _tracing.span('outer') as outer:
+            with _tracing.span('inner') as inner:
+                inner.add_bytes(3)
+            inner.add_bytes(4)
+        with _tracing.span('second'):
+            pass
+    with _tracing.span('untraced'):
+        pass
+
+    assert [s.name for s in tracer.spans] == ['outer', 'second']
+    assert outer.children == [inner]
+    assert inner.num_bytes == 7
+    assert outer.wall_time >= inner.wall_time >= 0
+    assert outer.start_time <= inner.start_time
+
+
+def test_spans_of_other_threads_are_roots():
+    def _background():
+        with _tracing.span('background'):
+            pass
+
+    with _tracing.Tracer() as tracer:
+        with _tracing.span('main'):
+            t = _threading.Thread(target=_background)
+            _background()
+            t.start()
+            t.join()
+
+    assert [s.name for s in tracer.spans] == ['main', 'background']
+    assert [s.name for s in tracer.spans[0].children] == ['background']
+
+
+def test_path_bytes():
+    with _utils.AutoDeletingTempDir('tracing') as t:
+        for name in ('a', 'b'):
+            with open(_os.path.join(t.name, name), 'w') as f:
+                f.write('12345')
+        with _tracing.Tracer():
+            with _tracing.span('directory') as directory:
+                directory.add_path_bytes(t.name)
+            with _tracing.span('file') as file_span:
+                file_span.add_path_bytes(_os.path.join(t.name, 'a'))
+            with _tracing.span('missing') as missing:
+                missing.add_path_bytes(_os.path.join(t.name, 'c'))
+        assert directory.num_bytes == 10
+        assert file_span.num_bytes == 5
+        assert missing.num_bytes == 0
+
+
+def test_emit_and_write():
+    with _tracing.Tracer() as tracer:
+        with _tracing.span('execute'):
+            with _tracing.span('upload outputs') as upload:
+                upload.add_bytes(5)
+
+    stats = _mock.MagicMock()
+    tracer.emit(stats)
+    assert sorted(c[0][0] for c in stats.timing.call_args_list) == ['execute', 'execute.upload_outputs']
+    stats.gauge.assert_called_once_with('execute.upload_outputs.bytes', 5)
+
+    with _utils.AutoDeletingTempDir('tracing') as t:
+        path = _os.path.join(t.name, 'timings.json')
+        tracer.write(path)
+        with open(path) as f:
+            timings = _json.load(f)
+    assert timings['spans'][0]['name'] == 'execute'
+    assert timings['spans'][0]['children'][0]['bytes'] == 5
+    assert timings['spans'][0]['children'][0]['wall_time'] == upload.wall_time
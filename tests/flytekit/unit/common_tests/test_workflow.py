@@ -1,7 +1,8 @@
 from __future__ import absolute_import
 
 from flytekit.common import workflow, constants, promise
-from flytekit.common.types import primitives
+from flytekit.common.exceptions import user as _user_exceptions
+from flytekit.common.types import primitives, containers
 from flytekit.models.core import workflow as _workflow_models, identifier as _identifier
 from flytekit.sdk.tasks import python_task, inputs, outputs
 
@@ -217,11 +218,6 @@ def test_workflow_node():
 
     w = workflow.SdkWorkflow(inputs=input_list, outputs=wf_out, nodes=nodes)
 
-    with _pytest.raises(NotImplementedError):
-        w()
-
-    # TODO: Uncomment when sub-workflows are supported.
-    """
     # Test that required input isn't set
     with _pytest.raises(_user_exceptions.FlyteAssertion):
         w()
@@ -267,4 +263,3 @@ def test_workflow_node():
         containers.List(containers.List(primitives.Integer)).to_flyte_literal_type()
     assert n.outputs['nested_out'].var == 'nested_out'
     assert n.outputs['nested_out'].node_id == 'node-id'
-    """
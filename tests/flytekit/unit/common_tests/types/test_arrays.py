@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+
+import numpy as _np
+import pytest as _pytest
+
+from flytekit.common.exceptions import user as _user_exceptions
+from flytekit.common.types import arrays as _arrays, base_sdk_types as _base_sdk_types, helpers as _helpers
+from flytekit.models import types as _type_models
+
+
+def test_create_array_invalid_dtype():
+    with _pytest.raises(_user_exceptions.FlyteValueException):
+        _arrays.create_array(object)
+
+
+def test_array_to_literal_type():
+    array_type = _arrays.create_array(_np.float32, shape=(None, 3))
+    literal_type = array_type.to_flyte_literal_type()
+    assert literal_type.simple == _type_models.SimpleType.BINARY
+    assert literal_type.metadata[_arrays.Array.DTYPE_FIELD_KEY] == '<f4'
+    assert literal_type.metadata[_arrays.Array.SHAPE_FIELD_KEY] == '-1,3'
+    assert array_type.short_class_string() == "Types.Array(float32, shape=(-1, 3))"
+
+
+def test_array_type_equality():
+    assert _arrays.create_array('int64') == _arrays.create_array(_np.int64)
+    assert _arrays.create_array('int64') != _arrays.create_array('int32')
+    assert _arrays.create_array('int64', shape=(2,)) != _arrays.create_array('int64')
+    assert hash(_arrays.create_array('int64')) == hash(_arrays.create_array(_np.int64))
+
+
+def test_array_round_trip():
+    array_type = _arrays.create_array(_np.float64, shape=(None, 3))
+    value = _np.arange(12, dtype=_np.float64).reshape(4, 3)
+
+    obj = array_type.from_python_std(value)
+    obj2 = array_type.from_flyte_idl(obj.to_flyte_idl())
+    assert obj == obj2
+
+    out = obj2.to_python_std()
+    assert out.dtype == _np.float64
+    assert out.shape == (4, 3)
+    assert not out.flags.writeable
+    _np.testing.assert_array_equal(out, value)
+
+
+def test_array_non_contiguous():
+    array_type = _arrays.create_array(_np.int32)
+    value = _np.arange(20, dtype=_np.int32).reshape(4, 5)[:, ::2]
+    out = array_type.from_python_std(value).to_python_std()
+    _np.testing.assert_array_equal(out, value)
+
+
+def test_array_type_checking():
+    array_type = _arrays.create_array(_np.float64, shape=(None, 3))
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        array_type.from_python_std([1.0, 2.0, 3.0])
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        array_type.from_python_std(_np.zeros((2, 3), dtype=_np.float32))
+    with _pytest.raises(_user_exceptions.FlyteValueException):
+        array_type.from_python_std(_np.zeros((2, 4), dtype=_np.float64))
+    with _pytest.raises(_user_exceptions.FlyteValueException):
+        array_type.from_python_std(_np.zeros((3,), dtype=_np.float64))
+    assert isinstance(array_type.from_python_std(None), _base_sdk_types.Void)
+
+
+def test_array_promote_wrong_type():
+    obj = _arrays.create_array(_np.int32).from_python_std(_np.zeros(3, dtype=_np.int32))
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        _arrays.create_array(_np.int64).from_flyte_idl(obj.to_flyte_idl())
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        _arrays.create_array(_np.int32, shape=(4,)).from_flyte_idl(obj.to_flyte_idl())
+
+
+def test_array_is_castable_from():
+    generic = _arrays.create_array(_np.int64)
+    matrix = _arrays.create_array(_np.int64, shape=(None, 2))
+    fixed = _arrays.create_array(_np.int64, shape=(5, 2))
+    assert generic.is_castable_from(matrix)
+    assert matrix.is_castable_from(fixed)
+    assert not fixed.is_castable_from(matrix)
+    assert not matrix.is_castable_from(generic)
+    assert not generic.is_castable_from(_arrays.create_array(_np.int32))
+
+
+def test_array_from_string():
+    array_type = _arrays.create_array(_np.int64, shape=(2, 2))
+    out = array_type.from_string('[[1, 2], [3, 4]]').to_python_std()
+    _np.testing.assert_array_equal(out, _np.array([[1, 2], [3, 4]]))
+
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        array_type.from_string('abc')
+    with _pytest.raises(_user_exceptions.FlyteValueException):
+        array_type.from_string('[1, 2, 3]')
+
+
+def test_array_through_type_engine():
+    array_type = _arrays.create_array(_np.uint8, shape=(None,))
+    assert _helpers.get_sdk_type_from_literal_type(array_type.to_flyte_literal_type()) == array_type
+
+    value = _np.arange(256, dtype=_np.uint8)
+    literal = array_type.from_python_std(value)
+    inferred = _helpers.infer_sdk_type_from_literal(literal)
+    assert inferred.dtype == _np.uint8
+    assert inferred.shape == (256,)
+    _np.testing.assert_array_equal(_helpers.get_sdk_value_from_literal(literal).to_python_std(), value)
@@ -1,4 +1,6 @@
 from __future__ import absolute_import
+import os as _os
+from flytekit.common import utils as _utils
 from flytekit.common.types import helpers as _type_helpers, base_sdk_types as _base_sdk_types
 from flytekit.models import literals as _literals, types as _model_types
 from flytekit.sdk import types as _sdk_types
@@ -58,3 +60,31 @@ def test_get_sdk_value_from_literal():
         )
     )
     assert o.to_python_std() == [1, None]
+
+
+def test_offload_and_hydrate_large_literals():
+    literal_map = _type_helpers.pack_python_std_map_to_literal_map(
+        {'small': 1, 'large': list(range(1000))},
+        {'small': _sdk_types.Types.Integer, 'large': _sdk_types.Types.List(_sdk_types.Types.Integer)}
+    )
+    with _utils.AutoDeletingTempDir("offload") as local_dir:
+        offloaded = _type_helpers.offload_large_literals(
+            literal_map, 100, local_dir.name, "/remote/dir"
+        )
+        assert offloaded.literals['small'] == literal_map.literals['small']
+        assert _type_helpers.is_offloaded_literal(offloaded.literals['large'])
+        assert offloaded.literals['large'].scalar.blob.uri == "/remote/dir/large.pb"
+        assert _os.path.exists(_os.path.join(local_dir.name, "large.pb"))
+
+        # Point the references at the local files and make sure they re-hydrate on unpack.
+        offloaded = _type_helpers.offload_large_literals(
+            literal_map, 100, local_dir.name, local_dir.name
+        )
+        assert _type_helpers.hydrate_literal(offloaded.literals['large']) == literal_map.literals['large']
+        assert _type_helpers.hydrate_literal(offloaded.literals['small']) is offloaded.literals['small']
+
+        unpacked = _type_helpers.unpack_literal_map_to_sdk_python_std(
+            offloaded,
+            {'small': _sdk_types.Types.Integer, 'large': _sdk_types.Types.List(_sdk_types.Types.Integer)}
+        )
+        assert unpacked == {'small': 1, 'large': list(range(1000))}
@@ -1,9 +1,12 @@
 from __future__ import absolute_import
 from flytekit.common.exceptions import user as user_exceptions
 from flytekit.common.types import primitives, base_sdk_types
+from flytekit.configuration import sdk as sdk_config
 from flytekit.models import types as literal_types
 from dateutil import tz
+from mock import patch
 import datetime
+import os
 import pytest
 
 
@@ -249,3 +252,24 @@ def test_generic():
     obj = primitives.Generic.from_string('{"a": 1.0}')
     assert obj.to_python_std() == {"a": 1.0}
     assert primitives.Generic.from_flyte_idl(obj.to_flyte_idl()) == obj
+
+    with pytest.raises(user_exceptions.FlyteValueException):
+        primitives.Generic.from_python_std({'a': datetime.datetime.now()})
+
+
+def test_generic_binary_encoding():
+    d = {'a': [1, 2, 3], 'b': 'abc', 'c': 1.5, 'd': {'a': None}}
+    with patch.dict(os.environ, {sdk_config.GENERIC_BINARY_ENCODING_THRESHOLD.env_var: '10'}):
+        obj = primitives.Generic.from_python_std(d)
+        small = primitives.Generic.from_python_std({'a': 1})
+
+    assert obj.scalar.generic is None
+    assert obj.scalar.binary.tag == primitives.Generic.BINARY_TAG
+    assert obj.to_python_std() == d
+    assert type(obj.to_python_std()['a'][0]) is int
+    assert primitives.Generic.from_flyte_idl(obj.to_flyte_idl()) == obj
+    assert primitives.Generic.promote_from_model(obj).to_python_std() == d
+
+    # Values below the threshold are still stored as a Struct
+    assert small.scalar.binary is None
+    assert small.to_python_std() == {'a': 1.0}
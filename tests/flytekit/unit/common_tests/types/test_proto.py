@@ -2,7 +2,7 @@ from __future__ import absolute_import
 from flytekit.common.exceptions import user as _user_exceptions
 from flytekit.common.types import proto as _proto
 from flyteidl.core import errors_pb2 as _errors_pb2
-from flytekit.models import types as _type_models
+from flytekit.models import types as _type_models, literals as _literals
 import base64 as _base64
 import pytest as _pytest
 
@@ -11,6 +11,9 @@ def test_wrong_type():
     with _pytest.raises(_user_exceptions.FlyteTypeException):
         _proto.create_protobuf(int)
 
+    with _pytest.raises(_user_exceptions.FlyteTypeException):
+        _proto.create_protobuf([_errors_pb2.ContainerError])
+
 
 def test_proto_to_literal_type():
     proto_type = _proto.create_protobuf(_errors_pb2.ContainerError)
@@ -48,3 +51,28 @@ def test_from_string():
     obj = proto_type.from_string(pb_str)
     assert obj.to_python_std().code == "code"
     assert obj.to_python_std().message == "message"
+
+
+def test_create_protobuf_is_interned():
+    assert _proto.create_protobuf(_errors_pb2.ContainerError) is _proto.create_protobuf(_errors_pb2.ContainerError)
+    assert _proto.create_protobuf(_errors_pb2.ContainerError) is not _proto.create_protobuf(_errors_pb2.ErrorDocument)
+
+
+def test_promote_from_model_is_lazy():
+    proto_type = _proto.create_protobuf(_errors_pb2.ContainerError)
+    literal = _literals.Literal(
+        scalar=_literals.Scalar(
+            binary=_literals.Binary(value=b"not a valid message", tag=proto_type.tag)
+        )
+    )
+
+    # Nothing is parsed until the message itself is requested.
+    obj = proto_type.promote_from_model(literal)
+    assert obj.scalar.binary.value is literal.scalar.binary.value
+    with _pytest.raises(Exception):
+        obj.to_python_std()
+
+    pb = _errors_pb2.ContainerError(code="code", message="message")
+    obj = proto_type.promote_from_model(proto_type.from_python_std(pb))
+    assert obj.to_python_std() == pb
+    assert obj.to_python_std() is not obj.to_python_std()
@@ -2,12 +2,13 @@ from __future__ import absolute_import
 
 import os
 
-from flyteidl.core import errors_pb2
+from flyteidl.core import errors_pb2, literals_pb2
 from mock import MagicMock, patch, PropertyMock
 
-from flytekit.common import constants, utils
+from flytekit.common import constants, spilled_inputs, utils
 from flytekit.common.exceptions import scopes
-from flytekit.configuration import TemporaryConfiguration
+from flytekit.common.types import helpers as type_helpers
+from flytekit.configuration import TemporaryConfiguration, sdk as sdk_config
 from flytekit.engines.flyte import engine
 from flytekit.models import literals, execution as _execution_models, common as _common_models, launch_plan as \
     _launch_plan_models
@@ -76,6 +77,133 @@ def test_task_user_failure():
             assert "userUSERuser" in doc.error.message
 
 
+def test_task_offloads_large_literals():
+    with TemporaryConfiguration(
+        os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../../common/configs/local.config'),
+        internal_overrides={
+            'image': 'flyteimage:{}'.format(
+                os.environ.get('IMAGE_VERSION', 'sha')
+            ),
+            'project': 'myflyteproject',
+            'domain': 'development'
+        }
+    ):
+        large = literals.Literal(
+            scalar=literals.Scalar(primitive=literals.Primitive(string_value="a" * 1000))
+        )
+        small = literals.Literal(scalar=literals.Scalar(primitive=literals.Primitive(integer=1)))
+        m = MagicMock()
+        m.execute = MagicMock(return_value={
+            constants.OUTPUT_FILE_NAME: literals.LiteralMap(literals={'large': large, 'small': small})
+        })
+        m.offload_large_literals = True
+
+        with patch.dict(os.environ, {sdk_config.LITERAL_OFFLOADING_THRESHOLD.env_var: '100'}):
+            with utils.AutoDeletingTempDir("test") as tmp:
+                engine.FlyteTask(m).execute(None, {'output_prefix': tmp.name})
+
+                outputs = literals.LiteralMap.from_flyte_idl(
+                    utils.load_proto_from_file(literals_pb2.LiteralMap,
+                                               os.path.join(tmp.name, constants.OUTPUT_FILE_NAME))
+                )
+                assert outputs.literals['small'] == small
+                assert outputs.literals['large'].scalar.blob.uri == os.path.join(
+                    tmp.name, constants.OFFLOADED_LITERALS_DIR, 'outputs', 'large.pb')
+                assert type_helpers.hydrate_literal(outputs.literals['large']) == large
+
+            # Tasks that don't opt in keep their literals inline whatever the threshold.
+            m.offload_large_literals = False
+            with utils.AutoDeletingTempDir("test") as tmp:
+                engine.FlyteTask(m).execute(None, {'output_prefix': tmp.name})
+
+                outputs = literals.LiteralMap.from_flyte_idl(
+                    utils.load_proto_from_file(literals_pb2.LiteralMap,
+                                               os.path.join(tmp.name, constants.OUTPUT_FILE_NAME))
+                )
+                assert outputs.literals['large'] == large
+                assert not os.path.exists(os.path.join(tmp.name, constants.OFFLOADED_LITERALS_DIR))
+
+
+def test_task_writes_spilled_inputs():
+    with TemporaryConfiguration(
+        os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../../common/configs/local.config'),
+        internal_overrides={
+            'image': 'flyteimage:{}'.format(
+                os.environ.get('IMAGE_VERSION', 'sha')
+            ),
+            'project': 'myflyteproject',
+            'domain': 'development'
+        }
+    ):
+        large = literals.Literal(
+            scalar=literals.Scalar(primitive=literals.Primitive(string_value="a" * 1000))
+        )
+        inputs_path = os.path.join('node', constants.INPUT_FILE_NAME)
+
+        def _execute(context, inputs):
+            return {
+                inputs_path: spilled_inputs.SpilledLiteralMap.spill(
+                    literals.LiteralMap(literals={'large': large}),
+                    os.path.join(context.working_directory.name, constants.SPILLED_INPUTS_DIR, inputs_path)
+                )
+            }
+
+        m = MagicMock()
+        m.execute = _execute
+        m.offload_large_literals = True
+
+        for threshold in ('0', '100'):
+            with patch.dict(os.environ, {sdk_config.LITERAL_OFFLOADING_THRESHOLD.env_var: threshold}):
+                with utils.AutoDeletingTempDir("test") as tmp:
+                    engine.FlyteTask(m).execute(None, {'output_prefix': tmp.name})
+
+                    inputs = literals.LiteralMap.from_flyte_idl(
+                        utils.load_proto_from_file(literals_pb2.LiteralMap, os.path.join(tmp.name, inputs_path))
+                    )
+                    assert type_helpers.hydrate_literal(inputs.literals['large']) == large
+                    assert type_helpers.is_offloaded_literal(inputs.literals['large']) == (threshold == '100')
+
+
+def test_task_uploads_outputs_in_parallel():
+    with TemporaryConfiguration(
+        os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../../common/configs/local.config'),
+        internal_overrides={
+            'image': 'flyteimage:{}'.format(
+                os.environ.get('IMAGE_VERSION', 'sha')
+            ),
+            'project': 'myflyteproject',
+            'domain': 'development'
+        }
+    ):
+        large = literals.Literal(
+            scalar=literals.Scalar(primitive=literals.Primitive(string_value="a" * 1000))
+        )
+        generated_files = {
+            os.path.join('node', str(i), constants.INPUT_FILE_NAME): literals.LiteralMap(literals={
+                'i': literals.Literal(scalar=literals.Scalar(primitive=literals.Primitive(integer=i))),
+                'large': large,
+            })
+            for i in range(10)
+        }
+        m = MagicMock()
+        m.execute = MagicMock(return_value=generated_files)
+        m.offload_large_literals = True
+
+        with patch.dict(os.environ, {
+            sdk_config.UPLOAD_PARALLELISM.env_var: '4',
+            sdk_config.LITERAL_OFFLOADING_THRESHOLD.env_var: '100',
+        }):
+            with utils.AutoDeletingTempDir("test") as tmp:
+                engine.FlyteTask(m).execute(None, {'output_prefix': tmp.name})
+
+                for path, expected in generated_files.items():
+                    inputs = literals.LiteralMap.from_flyte_idl(
+                        utils.load_proto_from_file(literals_pb2.LiteralMap, os.path.join(tmp.name, path))
+                    )
+                    assert inputs.literals['i'] == expected.literals['i']
+                    assert type_helpers.hydrate_literal(inputs.literals['large']) == large
+
+
 @patch.object(engine._FlyteClientManager, '_CLIENT', new_callable=PropertyMock)
 def test_execution_notification_overrides(mock_client_factory):
     mock_client = MagicMock()
@@ -258,7 +386,7 @@ def test_execution_annotation_overrides(mock_client_factory):
     )
 
 
-@patch.object(engine, '_SynchronousFlyteClient')
+@patch('flytekit.clients.friendly.SynchronousFlyteClient')
 def test_fetch_launch_plan(mock_client_factory):
     mock_client = MagicMock()
     mock_client.get_launch_plan = MagicMock(
@@ -0,0 +1,238 @@
+from __future__ import absolute_import
+
+import os
+
+import pytest
+from mock import patch
+
+from flytekit.common.exceptions import user as user_exceptions
+from flytekit.configuration import sdk as sdk_config, internal as internal_config
+from flytekit.engines import loader
+from flytekit.engines.local import engine as local_engine
+from flytekit.sdk.tasks import python_task, dynamic_task, map_task, inputs, outputs
+from flytekit.sdk.types import Types
+from flytekit.sdk.workflow import workflow_class, Input, Output
+from tests.flytekit.common.workflows import batch, nested, simple
+
+
+@inputs(a=Types.Integer)
+@outputs(b=Types.Integer)
+@python_task
+def fail(wf_params, a, b):
+    raise ValueError("Failing on purpose: {}".format(a))
+
+
+@inputs(a=Types.Integer, log=Types.String)
+@outputs(b=Types.Integer)
+@python_task(cache=True, cache_version='1')
+def cached_add_one(wf_params, a, log, b):
+    with open(log, 'a') as f:
+        f.write("{}\n".format(a))
+    b.set(a + 1)
+
+
+@inputs(n=Types.Integer, log=Types.String)
+@outputs(out=[Types.Integer])
+@dynamic_task
+def cached_add_ones(wf_params, n, log, out):
+    res = []
+    for i in range(n):
+        t = cached_add_one(a=i, log=log)
+        yield t
+        res.append(t.outputs.b)
+    out.set(res)
+
+
+@inputs(a=Types.Integer, log=Types.String)
+@python_task
+def log_value(wf_params, a, log):
+    with open(log, 'a') as f:
+        f.write("{}\n".format(a))
+
+
+@inputs(n=Types.Integer, log=Types.String)
+@outputs(out=Types.Integer)
+@dynamic_task(array_batch_size=2)
+def batched_log_values(wf_params, n, log, out):
+    for i in range(n):
+        yield log_value(a=i, log=log)
+    out.set(n)
+
+
+@inputs(n=Types.Integer)
+@outputs(out=[Types.Integer])
+@dynamic_task(array_batch_size=2)
+def batched_add_ones(wf_params, n, out):
+    res = []
+    for i in range(n):
+        t = nested.add_one(a=i)
+        yield t
+        res.append(t.outputs.b)
+    out.set(res)
+
+
+@inputs(n=Types.Integer)
+@outputs(out=[Types.Integer])
+@dynamic_task
+def mapped_add_ones(wf_params, n, out):
+    out.set(map_task(nested.add_one, over=list(range(n))).outputs.b)
+
+
+@workflow_class
+class FailingWorkflow(object):
+    a = nested.add_one(a=1)
+    b = fail(a=a.outputs.b)
+    output = Output(b.outputs.b, sdk_type=Types.Integer)
+
+
+@workflow_class
+class DiamondWorkflow(object):
+    input_1 = Input(Types.Integer)
+    a = nested.add_one(a=input_1)
+    b = nested.add_one(a=a.outputs.b)
+    c = nested.subtract_one(a=a.outputs.b)
+    d = nested.sum(a=b.outputs.b, b=c.outputs.b)
+    output = Output(d.outputs.c, sdk_type=Types.Integer)
+
+
+fixed_diamond_launch_plan = DiamondWorkflow.create_launch_plan(fixed_inputs={'input_1': 10})
+
+
+@inputs(n=Types.Integer)
+@outputs(out=[Types.Integer], out_lp=Types.Integer)
+@dynamic_task
+def diamond_fan_out(wf_params, n, out, out_lp):
+    res = []
+    for i in range(n):
+        node = DiamondWorkflow(input_1=i)
+        yield node
+        res.append(node.outputs.output)
+    out.set(res)
+    out_lp.set(fixed_diamond_launch_plan().outputs.output)
+
+
+@pytest.fixture(
+    params=[('1', 'True'), ('4', 'True'), ('4', 'False')],
+    ids=['in_process', 'fork_server', 'process_pool']
+)
+def local_sandbox(request, tmpdir):
+    parallelism, fork_server_enabled = request.param
+    with patch.dict(os.environ, {
+        sdk_config.LOCAL_SANDBOX.env_var: tmpdir.strpath,
+        sdk_config.LOCAL_EXECUTION_PARALLELISM.env_var: parallelism,
+        sdk_config.FORK_SERVER_ENABLED.env_var: fork_server_enabled,
+    }):
+        yield tmpdir.strpath
+
+
+def test_local_load():
+    assert isinstance(loader.get_engine('local'), local_engine.LocalEngineFactory)
+
+
+def test_workflow(local_sandbox):
+    assert DiamondWorkflow.local_execute(input_1=1) == {'output': 4}
+    # The files passed between nodes are removed when the execution completes.
+    assert os.listdir(os.path.join(local_sandbox, 'local_executions')) == []
+
+
+def test_launch_plans(local_sandbox):
+    assert nested.Parent.local_execute(input_1=1) == {'output': 202}
+
+
+def test_special_types(local_sandbox):
+    assert simple.SimpleWorkflow.local_execute(input_1=1) == {}
+
+
+def test_dynamic_tasks(local_sandbox):
+    assert batch.sample_batch_task_sq.local_execute() == {'out_ints': [0, 1, 4]}
+
+    outputs = batch.no_inputs_sample_batch_task.local_execute()
+    assert outputs['out_str'] == [
+        "I'm the first result",
+        "hello 0",
+        "I'm after each sub-task result",
+        "hello 1",
+        "I'm after each sub-task result",
+        "hello 2",
+        "I'm after each sub-task result",
+        "I'm the last result"
+    ]
+    assert outputs['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+def test_batched_array_job(local_sandbox):
+    log = os.path.join(local_sandbox, 'executions.log')
+    assert batched_log_values.local_execute(n=5, log=log) == {'out': 5}
+    with open(log) as f:
+        assert sorted(f.read().split()) == ['0', '1', '2', '3', '4']
+    # The array job of sub-tasks whose outputs are used isn't batched.
+    assert batched_add_ones.local_execute(n=5) == {'out': [1, 2, 3, 4, 5]}
+
+
+def test_packed_array_job(local_sandbox):
+    with patch.dict(os.environ, {sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        assert batched_add_ones.local_execute(n=5) == {'out': [1, 2, 3, 4, 5]}
+        assert batch.sample_batch_task_sq.local_execute() == {'out_ints': [0, 1, 4]}
+
+
+def test_streamed_dynamic_tasks(local_sandbox):
+    with patch.dict(os.environ, {sdk_config.STREAM_DYNAMIC_JOB_SPEC.env_var: 'true'}):
+        assert batched_add_ones.local_execute(n=5) == {'out': [1, 2, 3, 4, 5]}
+        outputs = batch.no_inputs_sample_batch_task.local_execute()
+    assert outputs['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+def test_map_task(local_sandbox):
+    assert mapped_add_ones.local_execute(n=5) == {'out': [1, 2, 3, 4, 5]}
+    with patch.dict(os.environ, {sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        assert mapped_add_ones.local_execute(n=5) == {'out': [1, 2, 3, 4, 5]}
+
+
+def test_sub_workflows(local_sandbox):
+    assert diamond_fan_out.local_execute(n=3) == {'out': [2, 4, 6], 'out_lp': 22}
+
+
+def test_python_task(local_sandbox):
+    assert nested.add_one.local_execute(a=1) == {'b': 2}
+
+
+def test_failing_workflow(local_sandbox):
+    with pytest.raises(user_exceptions.FlyteAssertion) as e:
+        FailingWorkflow.local_execute()
+    assert "Failing on purpose: 2" in str(e.value)
+    assert os.listdir(os.path.join(local_sandbox, 'local_executions')) == []
+
+
+def test_image_is_only_set_during_execution(local_sandbox):
+    with patch.dict(os.environ):
+        os.environ.pop(internal_config.IMAGE.env_var, None)
+        assert DiamondWorkflow.local_execute(input_1=1) == {'output': 4}
+        assert internal_config.IMAGE.env_var not in os.environ
+
+        os.environ[internal_config.IMAGE.env_var] = 'my_image'
+        assert DiamondWorkflow.local_execute(input_1=1) == {'output': 4}
+        assert os.environ[internal_config.IMAGE.env_var] == 'my_image'
+
+
+def test_unsupported_calls():
+    with pytest.raises(user_exceptions.FlyteAssertion):
+        loader.get_engine('local').get_launch_plan(nested.child_lp)
+
+    with pytest.raises(user_exceptions.FlyteAssertion):
+        loader.get_engine('local').get_workflow(DiamondWorkflow).register(None)
+
+
+def test_memoized_tasks(local_sandbox):
+    log = os.path.join(local_sandbox, 'executions.log')
+    with patch.dict(os.environ, {sdk_config.LOCAL_CACHE_ENABLED.env_var: 'true'}):
+        assert cached_add_one.local_execute(a=1, log=log) == {'b': 2}
+        assert cached_add_one.local_execute(a=1, log=log) == {'b': 2}
+        assert cached_add_ones.local_execute(n=3, log=log) == {'out': [1, 2, 3]}
+        assert cached_add_ones.local_execute(n=4, log=log) == {'out': [1, 2, 3, 4]}
+    with open(log) as f:
+        # The sub-tasks of the array jobs share the memoized outputs of the task executed on its own.
+        assert sorted(f.read().split()) == ['0', '1', '2', '3']
+
+    assert cached_add_one.local_execute(a=1, log=log) == {'b': 2}
+    with open(log) as f:
+        assert len(f.read().split()) == 5
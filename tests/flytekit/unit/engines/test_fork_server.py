@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+
+import os as _os
+import sys as _sys
+import time as _time
+
+import mock as _mock
+import pytest as _pytest
+from concurrent import futures as _futures
+
+from flytekit.common.exceptions import system as _system_exceptions
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.engines import fork_server as _fork_server
+
+_STATE = []
+
+
+class _UnloadableError(Exception):
+
+    def __init__(self, a, b):
+        super(_UnloadableError, self).__init__("{} {}".format(a, b))
+
+
+def _add(a, b=0):
+    return a + b
+
+
+def _append_to_state(value):
+    _STATE.append(value)
+    return list(_STATE)
+
+
+def _fail():
+    raise ValueError("failed")
+
+
+def _fail_unloadable():
+    raise _UnloadableError(1, 2)
+
+
+def _exit():
+    _os._exit(3)
+
+
+def _is_imported(module):
+    return module in _sys.modules
+
+
+def _sleep_and_return_pid(seconds):
+    _time.sleep(seconds)
+    return _os.getpid()
+
+
+@_pytest.fixture
+def fork_server():
+    server = _fork_server.ForkServer(2, preload=['tests.flytekit.common.task_definitions'])
+    yield server
+    server.shutdown()
+
+
+def test_results(fork_server):
+    assert [f.result() for f in [fork_server.submit(_add, i, b=1) for i in range(5)]] == [1, 2, 3, 4, 5]
+    assert list(fork_server.map(_add, [1, 2], [3, 4])) == [4, 6]
+
+
+def test_calls_do_not_share_state(fork_server):
+    assert fork_server.submit(_append_to_state, 1).result() == [1]
+    assert fork_server.submit(_append_to_state, 2).result() == [2]
+    assert _STATE == []
+
+
+def test_modules_are_preloaded(fork_server):
+    assert fork_server.submit(_is_imported, 'tests.flytekit.common.task_definitions').result()
+
+
+def test_failures(fork_server):
+    with _pytest.raises(ValueError):
+        fork_server.submit(_fail).result()
+    with _pytest.raises(_system_exceptions.FlyteSystemAssertion) as e:
+        fork_server.submit(_fail_unloadable).result()
+    assert '_UnloadableError' in str(e.value)
+    with _pytest.raises(_system_exceptions.FlyteSystemAssertion):
+        fork_server.submit(_exit).result()
+    assert fork_server.submit(_add, 1).result() == 1
+
+
+def test_max_workers(fork_server):
+    submitted = [fork_server.submit(_sleep_and_return_pid, 0.2) for _ in range(4)]
+    start = _time.time()
+    _futures.wait(submitted)
+    assert _time.time() - start >= 0.3
+    assert len({f.result() for f in submitted}) == 4
+
+
+def test_shutdown():
+    server = _fork_server.ForkServer(1)
+    submitted = server.submit(_sleep_and_return_pid, 0.1)
+    server.shutdown()
+    assert submitted.done()
+    with _pytest.raises(RuntimeError):
+        server.submit(_add, 1)
+
+
+def test_create_process_pool():
+    pool = _fork_server.create_process_pool(1)
+    try:
+        assert isinstance(pool, _fork_server.ForkServer)
+    finally:
+        pool.shutdown()
+
+    with _mock.patch.dict(_os.environ, {_sdk_config.FORK_SERVER_ENABLED.env_var: 'False'}):
+        pool = _fork_server.create_process_pool(1)
+        try:
+            assert isinstance(pool, _futures.ProcessPoolExecutor)
+        finally:
+            pool.shutdown()
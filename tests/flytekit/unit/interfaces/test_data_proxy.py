@@ -0,0 +1,75 @@
+from __future__ import absolute_import
+
+import os
+
+import pytest
+from concurrent import futures
+from mock import patch
+
+from flytekit.common import utils
+from flytekit.common.exceptions import user as user_exceptions
+from flytekit.interfaces.data import data_proxy
+
+
+def _write(path, content):
+    if not os.path.exists(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def test_put_directories():
+    with utils.AutoDeletingTempDir("local") as local, utils.AutoDeletingTempDir("remote") as remote:
+        local_dirs = [os.path.join(local.name, str(i)) for i in range(4)]
+        for i, d in enumerate(local_dirs):
+            _write(os.path.join(d, 'node', str(i), 'inputs.pb'), str(i))
+        _write(os.path.join(local_dirs[0], 'futures.pb'), 'futures')
+
+        data_proxy.Data.put_directories(local_dirs, remote.name, max_workers=4)
+
+        assert sorted(os.listdir(os.path.join(remote.name, 'node'))) == ['0', '1', '2', '3']
+        with open(os.path.join(remote.name, 'node', '2', 'inputs.pb')) as f:
+            assert f.read() == '2'
+        assert os.path.exists(os.path.join(remote.name, 'futures.pb'))
+
+
+@patch.object(data_proxy._time, 'sleep')
+@patch.object(data_proxy.Data, 'put_data')
+def test_put_directories_retries(mock_put_data, mock_sleep):
+    mock_put_data.side_effect = [user_exceptions.FlyteAssertion("failed"), None]
+    data_proxy.Data.put_directories(['/local'], '/remote', retries=1)
+    assert mock_put_data.call_count == 2
+    mock_sleep.assert_called_once_with(data_proxy._RETRY_DELAY)
+
+    mock_put_data.reset_mock()
+    mock_put_data.side_effect = user_exceptions.FlyteAssertion("failed")
+    with pytest.raises(user_exceptions.FlyteAssertion):
+        data_proxy.Data.put_directories(['/local'], '/remote', retries=2)
+    assert mock_put_data.call_count == 3
+
+
+def _active_contexts():
+    return data_proxy.LocalWorkingDirectoryContext.get(), data_proxy._OutputDataContext.get_active_proxy()
+
+
+def test_threads_share_contexts():
+    remote = data_proxy.RemoteDataContext()
+    with data_proxy.LocalWorkingDirectoryContext('/sandbox'), remote:
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(_active_contexts).result() == ('/sandbox', remote._context)
+
+
+def test_thread_contexts():
+    def _enter_contexts(thread_contexts):
+        with thread_contexts, data_proxy.LocalWorkingDirectoryContext('/thread'):
+            return _active_contexts()
+
+    remote = data_proxy.RemoteDataContext()
+    with data_proxy.LocalWorkingDirectoryContext('/sandbox'), remote:
+        thread_contexts = data_proxy.ThreadContexts()
+        with data_proxy.LocalWorkingDirectoryContext('/other'):
+            with futures.ThreadPoolExecutor(max_workers=1) as executor:
+                assert executor.submit(_enter_contexts, thread_contexts).result() == ('/thread', remote._context)
+                # Leaving the thread contexts restores the contexts shared by the process.
+                assert executor.submit(_active_contexts).result() == ('/other', remote._context)
+            assert _active_contexts() == ('/other', remote._context)
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 from flytekit.models import common as _common
 from flytekit.models.core import execution as _execution
+import pytest
 
 
 def test_notification_email():
@@ -66,3 +67,17 @@ def test_annotations():
     assert obj.values == {"my": "annotation"}
     obj2 = _common.Annotations.from_flyte_idl(obj.to_flyte_idl())
     assert obj2 == obj
+
+
+def test_dict_to_struct():
+    d = {'a': [1, 2.5, 'x', None, True], 'b': {'c': {'d': False}}, 'e': (1, 2), 1: 'one'}
+    obj = _common.struct_to_dict(_common.dict_to_struct(d))
+    assert obj == {'a': [1.0, 2.5, 'x', None, True], 'b': {'c': {'d': False}}, 'e': [1.0, 2.0], '1': 'one'}
+    assert obj['b']['c']['d'] is False
+    assert _common.struct_to_dict(_common.dict_to_struct({'empty': {}, 'list': []})) == {'empty': {}, 'list': []}
+
+    with pytest.raises(TypeError):
+        _common.dict_to_struct({'a': object()})
+
+    with pytest.raises(TypeError):
+        _common.dict_to_struct({(1, 2): 'a'})
@@ -1,11 +1,26 @@
 from __future__ import absolute_import
 from __future__ import print_function
 
+import logging as _logging
+import os as _os
+from datetime import datetime as _datetime
+
+import mock as _mock
+import pytest as _pytest
 from six import moves as _six_moves
 
+from flytekit.common import constants as _constants, packed_inputs as _packed_inputs, \
+    runtime_history as _runtime_history, spilled_inputs as _spilled_inputs, utils as _common_utils
+from flytekit.common.exceptions import user as _user_exceptions
 from flytekit.common.tasks import sdk_runnable as _sdk_runnable, sdk_dynamic as _sdk_dynamic
-from flytekit.sdk.tasks import inputs, outputs, dynamic_task, python_task
+from flytekit.configuration import sdk as _sdk_config
+from flytekit.engines import common as _common_engine
+from flytekit.models import array_job as _array_job, literals as _literals
+from flytekit.models.core import identifier as _identifier
+from flytekit.models.core.identifier import WorkflowExecutionIdentifier
+from flytekit.sdk.tasks import inputs, outputs, dynamic_task, map_task, python_task
 from flytekit.sdk.types import Types
+from flytekit.sdk.workflow import workflow_class, Input, Output
 
 
 @inputs(in1=Types.Integer)
@@ -124,6 +139,209 @@ def test_batch_task():
     assert expected == res
 
 
+def test_batch_task_with_profiling():
+    with _mock.patch.dict(_os.environ, {
+        _sdk_config.PROFILE_CPU.env_var: 'True',
+        _sdk_config.PROFILE_MEMORY.env_var: 'True',
+    }):
+        res = sample_batch_task.unit_test(in1=3)
+    assert res['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+@inputs(in1=Types.Integer)
+@outputs(out1=Types.Integer)
+@python_task
+def failing_sub_task(wf_params, in1, out1):
+    if in1 == 1:
+        raise ValueError("sub-task {} failed".format(in1))
+    out1.set(in1)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_ints=[Types.Integer])
+@dynamic_task
+def failing_batch_task(wf_params, in1, out_ints):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = failing_sub_task(in1=i)
+        yield task
+        res.append(task.outputs.out1)
+    out_ints.set(res)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out1=Types.Integer)
+@python_task(cache=True, cache_version='1')
+def memoized_sub_task(wf_params, in1, out1):
+    memoized_sub_task_executions.append(in1)
+    out1.set(in1 + 1)
+
+
+memoized_sub_task_executions = []
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_ints=[Types.Integer])
+@dynamic_task
+def memoized_batch_task(wf_params, in1, out_ints):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = memoized_sub_task(in1=i)
+        yield task
+        res.append(task.outputs.out1)
+    out_ints.set(res)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String])
+@dynamic_task(array_batch_size=2, allowed_failure_ratio=0.5)
+def batched_batch_task(wf_params, in1, out_str):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = sub_task(in1=i)
+        yield task
+        res.append(task.outputs.out1)
+    out_str.set(res)
+
+
+@inputs(in1=Types.Integer)
+@dynamic_task(array_batch_size=2, allowed_failure_ratio=0.5)
+def unconsumed_batched_batch_task(wf_params, in1):
+    for i in _six_moves.range(0, in1):
+        yield sub_task(in1=i)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_ints=[Types.Integer])
+@dynamic_task(array_batch_size=2)
+def batched_memoized_batch_task(wf_params, in1, out_ints):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = memoized_sub_task(in1=i)
+        yield task
+        res.append(task.outputs.out1)
+    out_ints.set(res)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String], out_ints=[[Types.Integer]])
+@dynamic_task(deduplicate_sub_tasks=True)
+def deduplicated_batch_task(wf_params, in1, out_str, out_ints):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = sub_task(in1=i % 3)
+        yield task
+        res.append(task.outputs.out1)
+
+    res2 = []
+    for _ in _six_moves.range(0, 2):
+        task = sample_batch_task_sq()
+        yield task
+        res2.append(task.outputs.out_ints)
+
+    out_str.set(res)
+    out_ints.set(res2)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String])
+@dynamic_task
+def simple_batch_task(wf_params, in1, out_str):
+    res = []
+    for i in _six_moves.range(0, in1):
+        task = sub_task(in1=i)
+        yield task
+        res.append(task.outputs.out1)
+    out_str.set(res)
+
+
+@inputs(in1=Types.Integer, in2=Types.String)
+@outputs(out1=Types.String)
+@python_task
+def prefixed_sub_task(wf_params, in1, in2, out1):
+    out1.set("{} {}".format(in2, in1))
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String], out_prefixed=[Types.String], out_empty=[Types.String])
+@dynamic_task
+def mapped_batch_task(wf_params, in1, out_str, out_prefixed, out_empty):
+    yield sub_task(in1=in1)
+
+    prefixed = map_task(prefixed_sub_task, over=_six_moves.range(in1), in2='hi')
+    yield prefixed
+    out_prefixed.set(prefixed.outputs.out1)
+
+    # Map nodes whose outputs are used needn't be yielded.
+    out_str.set(map_task(sub_task, over=_six_moves.range(in1)).outputs.out1)
+    out_empty.set(map_task(sub_task, over=[]).outputs.out1)
+
+
+@workflow_class
+class SubWorkflow(object):
+    in1 = Input(Types.Integer)
+    t = sub_task(in1=in1)
+    out = Output(t.outputs.out1, sdk_type=Types.String)
+
+
+fixed_launch_plan = SubWorkflow.create_launch_plan(fixed_inputs={'in1': 5})
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String], out_lp=Types.String)
+@dynamic_task
+def sub_workflow_batch_task(wf_params, in1, out_str, out_lp):
+    res = []
+    for i in _six_moves.range(0, in1):
+        node = SubWorkflow(in1=i)
+        yield node
+        res.append(node.outputs.out)
+    out_str.set(res)
+    out_lp.set(fixed_launch_plan().outputs.out)
+
+
+@inputs(in1=Types.Integer)
+@outputs(out_str=[Types.String])
+@dynamic_task
+def colliding_sub_workflow_batch_task(wf_params, in1, out_str):
+    yield SubWorkflow(in1=in1)
+    task = sub_task(in1=in1)
+    yield task
+    out_str.set([task.outputs.out1])
+
+
+@_pytest.fixture(params=['serial', 'thread', 'process'])
+def unit_test_executor(request):
+    with _mock.patch.dict(_os.environ, {
+        _sdk_config.UNIT_TEST_EXECUTOR.env_var: request.param,
+        _sdk_config.UNIT_TEST_PARALLELISM.env_var: '4',
+    }):
+        yield request.param
+
+
+def test_batch_task_with_executor(unit_test_executor):
+    res = sample_batch_task.unit_test(in1=3)
+    assert res['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+    assert res['out_str'][1] == 'hello 0'
+    assert res['out_str'][5] == 'hello 2'
+
+    res = sample_batch_task_no_inputs.unit_test()
+    assert res['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+def test_failing_sub_task_with_executor(unit_test_executor):
+    assert failing_batch_task.unit_test(in1=1) == {'out_ints': [0]}
+    with _pytest.raises(Exception) as e:
+        failing_batch_task.unit_test(in1=3)
+    assert "sub-task 1 failed" in str(e.value)
+
+
+def test_unknown_executor():
+    with _mock.patch.dict(_os.environ, {_sdk_config.UNIT_TEST_EXECUTOR.env_var: 'fibers'}):
+        with _pytest.raises(_user_exceptions.FlyteAssertion):
+            sample_batch_task.unit_test(in1=1)
+
+
 def test_no_future_batch_task():
     expected = {
         'out_str': ["res1", "res2"]
@@ -131,3 +349,422 @@ def test_no_future_batch_task():
 
     res = no_future_batch_task.unit_test(in1=3)
     assert expected == res
+
+
+def test_memoized_sub_tasks(tmpdir):
+    del memoized_sub_task_executions[:]
+    with _mock.patch.dict(_os.environ, {
+        _sdk_config.LOCAL_CACHE_ENABLED.env_var: 'true',
+        _sdk_config.LOCAL_CACHE_DIRECTORY.env_var: tmpdir.strpath,
+    }):
+        assert memoized_batch_task.unit_test(in1=2) == {'out_ints': [1, 2]}
+        assert memoized_batch_task.unit_test(in1=3) == {'out_ints': [1, 2, 3]}
+        assert memoized_sub_task.unit_test(in1=1) == {'out1': 2}
+    assert memoized_sub_task_executions == [0, 1, 2]
+
+    assert memoized_sub_task.unit_test(in1=1) == {'out1': 2}
+    assert memoized_sub_task_executions == [0, 1, 2, 1]
+
+
+def test_batched_array_job_spec():
+    with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+        context = _common_engine.EngineContext(
+            execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+            execution_date=_datetime.utcnow(),
+            stats=None,
+            logging=_logging,
+            tmp_dir=user_working_directory
+        )
+        spec, generated_files = unconsumed_batched_batch_task._produce_dynamic_job_spec(
+            context,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=5)))})
+        )
+
+    assert len(spec.tasks) == 1
+    array_task = spec.tasks[0]
+    array_job = _array_job.ArrayJob.from_dict(array_task.custom)
+    assert array_job.size == 3
+    assert array_job.min_successes == 2
+    assert array_task.container.env[_constants.ARRAY_BATCH_SIZE_ENV_VAR] == '2'
+    assert array_task.container.env[_constants.ARRAY_SUB_TASK_COUNT_ENV_VAR] == '5'
+    assert len(generated_files) == 5
+
+    # The user's task is left untouched.
+    assert _constants.ARRAY_BATCH_SIZE_ENV_VAR not in sub_task.container.env
+
+
+def _max_output_index(binding_data, node_id):
+    if binding_data.promise is not None:
+        if binding_data.promise.node_id != node_id:
+            return -1
+        return int(binding_data.promise.var[1:binding_data.promise.var.index(']')])
+    if binding_data.collection is not None:
+        return max([_max_output_index(b, node_id) for b in binding_data.collection.bindings] + [-1])
+    if binding_data.map is not None:
+        return max([_max_output_index(b, node_id) for b in binding_data.map.bindings.values()] + [-1])
+    return -1
+
+
+def test_consumed_array_jobs_are_not_batched():
+    spec, generated_files = _produce_spec(batched_batch_task, in1=5)
+
+    # Every sub-task whose outputs are bound needs a container of its own for the platform to collect its outputs.
+    assert len(spec.tasks) == 1
+    array_task = spec.tasks[0]
+    array_job = _array_job.ArrayJob.from_dict(array_task.custom)
+    max_index = max(_max_output_index(b.binding, spec.nodes[0].id) for b in spec.outputs)
+    assert max_index == 4
+    assert array_job.size > max_index
+    assert array_job.min_successes == 3
+    assert _constants.ARRAY_BATCH_SIZE_ENV_VAR not in array_task.container.env
+    assert len(generated_files) == 5
+
+
+def test_batched_batch_task():
+    assert batched_batch_task.unit_test(in1=5) == {'out_str': ['hello {}'.format(i) for i in range(5)]}
+
+
+def test_discoverable_tasks_are_not_batched():
+    with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+        context = _common_engine.EngineContext(
+            execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+            execution_date=_datetime.utcnow(),
+            stats=None,
+            logging=_logging,
+            tmp_dir=user_working_directory
+        )
+        spec, generated_files = batched_memoized_batch_task._produce_dynamic_job_spec(
+            context,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=5)))})
+        )
+
+    # The platform looks up the sub-task of every container of a discoverable array job by its index.
+    array_task = spec.tasks[0]
+    assert _array_job.ArrayJob.from_dict(array_task.custom).size == 5
+    assert _constants.ARRAY_BATCH_SIZE_ENV_VAR not in array_task.container.env
+    assert len(generated_files) == 5
+
+
+def test_packed_array_job_spec():
+    with _mock.patch.dict(_os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+            context = _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+                execution_date=_datetime.utcnow(),
+                stats=None,
+                logging=_logging,
+                tmp_dir=user_working_directory
+            )
+            spec, generated_files = unconsumed_batched_batch_task._produce_dynamic_job_spec(
+                context,
+                _literals.LiteralMap(literals={'in1': _literals.Literal(
+                    scalar=_literals.Scalar(primitive=_literals.Primitive(integer=5)))})
+            )
+
+    array_task = spec.tasks[0]
+    assert array_task.container.env[_constants.ARRAY_PACKED_INPUTS_ENV_VAR] == _constants.PACKED_INPUTS_FILE_NAME
+    assert array_task.container.env[_constants.ARRAY_BATCH_SIZE_ENV_VAR] == '2'
+    assert list(generated_files) == [_os.path.join(spec.nodes[0].id, _constants.PACKED_INPUTS_FILE_NAME)]
+    packed = list(generated_files.values())[0]
+    assert isinstance(packed, _packed_inputs.PackedLiteralMaps)
+    assert [m.literals['in1'].scalar.primitive.integer for m in packed.literal_maps] == list(range(5))
+
+
+def test_discoverable_inputs_are_not_packed():
+    with _mock.patch.dict(_os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+            context = _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+                execution_date=_datetime.utcnow(),
+                stats=None,
+                logging=_logging,
+                tmp_dir=user_working_directory
+            )
+            spec, generated_files = memoized_batch_task._produce_dynamic_job_spec(
+                context,
+                _literals.LiteralMap(literals={'in1': _literals.Literal(
+                    scalar=_literals.Scalar(primitive=_literals.Primitive(integer=3)))})
+            )
+
+    # The platform discovers the outputs of each sub-task from its own inputs file.
+    array_task = spec.tasks[0]
+    assert _constants.ARRAY_PACKED_INPUTS_ENV_VAR not in array_task.container.env
+    assert sorted(generated_files) == [
+        _os.path.join(spec.nodes[0].id, str(i), _constants.INPUT_FILE_NAME) for i in range(3)
+    ]
+    with _mock.patch.dict(_os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        assert memoized_batch_task.unit_test(in1=3) == {'out_ints': [1, 2, 3]}
+
+
+def test_packed_batch_task(unit_test_executor):
+    with _mock.patch.dict(_os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        assert batched_batch_task.unit_test(in1=5) == {'out_str': ['hello {}'.format(i) for i in range(5)]}
+        res = sample_batch_task.unit_test(in1=3)
+    assert res['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+def test_deduplicated_array_job_spec():
+    with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+        context = _common_engine.EngineContext(
+            execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+            execution_date=_datetime.utcnow(),
+            stats=None,
+            logging=_logging,
+            tmp_dir=user_working_directory
+        )
+        spec, generated_files = deduplicated_batch_task._produce_dynamic_job_spec(
+            context,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=7)))})
+        )
+
+    assert len(spec.nodes) == 2
+    array_task = [t for t in spec.tasks if t.type == _constants.SdkTaskType.CONTAINER_ARRAY_TASK][0]
+    assert _array_job.ArrayJob.from_dict(array_task.custom).size == 3
+    assert len(generated_files) == 4
+
+    out_str = [b for b in spec.outputs if b.var == 'out_str'][0]
+    assert [p.promise.var for p in out_str.binding.collection.bindings] == [
+        '[0].out1', '[1].out1', '[2].out1', '[0].out1', '[1].out1', '[2].out1', '[0].out1']
+    out_ints = [b for b in spec.outputs if b.var == 'out_ints'][0]
+    assert len({p.promise.node_id for p in out_ints.binding.collection.bindings}) == 1
+
+
+def test_deduplicated_batch_task():
+    assert deduplicated_batch_task.unit_test(in1=7) == {
+        'out_str': ['hello {}'.format(i % 3) for i in range(7)],
+        'out_ints': [[0, 1, 4], [0, 1, 4]],
+    }
+
+
+def test_streamed_array_job_spec():
+    with _mock.patch.dict(_os.environ, {_sdk_config.STREAM_DYNAMIC_JOB_SPEC.env_var: 'true'}):
+        with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+            context = _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+                execution_date=_datetime.utcnow(),
+                stats=None,
+                logging=_logging,
+                tmp_dir=user_working_directory
+            )
+            spec, generated_files = sample_batch_task._produce_dynamic_job_spec(
+                context,
+                _literals.LiteralMap(literals={'in1': _literals.Literal(
+                    scalar=_literals.Scalar(primitive=_literals.Primitive(integer=3)))})
+            )
+
+            assert len(spec.nodes) == 4
+            assert len(generated_files) == 8
+            for path, spilled in generated_files.items():
+                assert isinstance(spilled, _spilled_inputs.SpilledLiteralMap)
+                assert spilled.path == _os.path.join(
+                    user_working_directory.name, _constants.SPILLED_INPUTS_DIR, path)
+            array_inputs = generated_files[_os.path.join(spec.nodes[2].id, '1', _constants.INPUT_FILE_NAME)]
+            assert array_inputs.load().literals['in1'].scalar.primitive.integer == 1
+
+    out_str = [b for b in spec.outputs if b.var == 'out_str'][0]
+    assert [b.promise.var for b in out_str.binding.collection.bindings if b.promise] == [
+        '[0].out1', '[1].out1', '[2].out1']
+
+
+def test_streamed_batch_task(unit_test_executor):
+    with _mock.patch.dict(_os.environ, {_sdk_config.STREAM_DYNAMIC_JOB_SPEC.env_var: 'true'}):
+        assert batched_batch_task.unit_test(in1=5) == {'out_str': ['hello {}'.format(i) for i in range(5)]}
+        res = sample_batch_task.unit_test(in1=3)
+    assert res['out_ints'] == [[0, 0, 0], [1, 2, 3], [2, 4, 6], [0, 1, 4], [0, 1, 4]]
+
+
+def test_planned_array_job_spec(tmpdir):
+    history = _runtime_history.RuntimeHistory(tmpdir.strpath)
+    for i in range(41):
+        history.record(
+            _runtime_history.get_task_name(sub_task),
+            sub_task.id.version,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=i)))}),
+            10.0 if i == 40 else 1.0
+        )
+
+    with _mock.patch.dict(_os.environ, {
+        _sdk_config.RUNTIME_HISTORY_ENABLED.env_var: 'true',
+        _sdk_config.RUNTIME_HISTORY_DIRECTORY.env_var: tmpdir.strpath,
+    }):
+        with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+            context = _common_engine.EngineContext(
+                execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+                execution_date=_datetime.utcnow(),
+                stats=None,
+                logging=_logging,
+                tmp_dir=user_working_directory
+            )
+            spec, generated_files = simple_batch_task._produce_dynamic_job_spec(
+                context,
+                _literals.LiteralMap(literals={'in1': _literals.Literal(
+                    scalar=_literals.Scalar(primitive=_literals.Primitive(integer=41)))})
+            )
+
+    assert len(spec.nodes) == 2
+    assert len(generated_files) == 41
+    array_jobs = {t.id.name: _array_job.ArrayJob.from_dict(t.custom) for t in spec.tasks}
+    assert array_jobs[sub_task.id.name].size == 40
+    assert array_jobs[sub_task.id.name].parallelism == 4
+    assert array_jobs['{}-stragglers'.format(sub_task.id.name)].size == 1
+    assert array_jobs['{}-stragglers'.format(sub_task.id.name)].parallelism == 1
+
+    straggler_node = [n for n in spec.nodes if n.task_node.reference_id.name.endswith('-stragglers')][0]
+    promises = [b.promise for b in spec.outputs[0].binding.collection.bindings]
+    assert (promises[-1].node_id, promises[-1].var) == (straggler_node.id, '[0].out1')
+    assert promises[0].node_id != straggler_node.id
+
+
+def test_planned_batch_task(tmpdir):
+    with _mock.patch.dict(_os.environ, {
+        _sdk_config.RUNTIME_HISTORY_ENABLED.env_var: 'true',
+        _sdk_config.RUNTIME_HISTORY_DIRECTORY.env_var: tmpdir.strpath,
+    }):
+        history = _runtime_history.get_runtime_history()
+        for i in range(5):
+            history.record(
+                _runtime_history.get_task_name(sub_task),
+                sub_task.id.version,
+                _literals.LiteralMap(literals={'in1': _literals.Literal(
+                    scalar=_literals.Scalar(primitive=_literals.Primitive(integer=i)))}),
+                10.0 if i == 2 else 1.0
+            )
+        assert simple_batch_task.unit_test(in1=5) == {'out_str': ['hello {}'.format(i) for i in range(5)]}
+        # The sub-tasks record their runtimes as they execute.
+        assert len(history.load(_runtime_history.get_task_name(sub_task), sub_task.id.version)) == 5
+
+
+def test_mapped_array_job_spec():
+    with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+        context = _common_engine.EngineContext(
+            execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+            execution_date=_datetime.utcnow(),
+            stats=None,
+            logging=_logging,
+            tmp_dir=user_working_directory
+        )
+        spec, generated_files = mapped_batch_task._produce_dynamic_job_spec(
+            context,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=3)))})
+        )
+
+    # The yielded sub-task and the two map nodes over values.
+    assert len(spec.nodes) == 3
+    assert len(set(t.id for t in spec.tasks)) == 3
+    assert len(generated_files) == 7
+    sizes = sorted(_array_job.ArrayJob.from_dict(t.custom).size for t in spec.tasks)
+    assert sizes == [1, 3, 3]
+
+    outputs = {b.var: b.binding for b in spec.outputs}
+    assert outputs['out_empty'].collection.bindings == []
+    prefixed_node = [n for n in spec.nodes if 'prefixed' in n.task_node.reference_id.name][0]
+    assert prefixed_node.task_node.reference_id.name.startswith(prefixed_sub_task.id.name)
+    assert [(b.promise.node_id, b.promise.var) for b in outputs['out_prefixed'].collection.bindings] == [
+        (prefixed_node.id, '[{}].out1'.format(i)) for i in range(3)
+    ]
+    inputs_file = generated_files[_os.path.join(prefixed_node.id, '2', _constants.INPUT_FILE_NAME)]
+    assert inputs_file.literals['in1'].scalar.primitive.integer == 2
+    assert inputs_file.literals['in2'].scalar.primitive.string_value == 'hi'
+
+
+def test_mapped_batch_task(unit_test_executor):
+    expected = {
+        'out_str': ['hello {}'.format(i) for i in range(3)],
+        'out_prefixed': ['hi {}'.format(i) for i in range(3)],
+        'out_empty': [],
+    }
+    assert mapped_batch_task.unit_test(in1=3) == expected
+    with _mock.patch.dict(_os.environ, {_sdk_config.PACK_ARRAY_INPUTS.env_var: 'true'}):
+        assert mapped_batch_task.unit_test(in1=3) == expected
+
+
+def test_map_task_validation():
+    with _pytest.raises(_user_exceptions.FlyteAssertion):
+        map_task(prefixed_sub_task, over=[1, 2])
+    with _pytest.raises(_user_exceptions.FlyteAssertion):
+        map_task(sample_batch_task_sq, over=[1, 2])
+    with _pytest.raises(_user_exceptions.FlyteAssertion):
+        map_task(sub_task, over=sub_task(in1=1).outputs.out1)
+
+
+def _produce_spec(batch_task, in1=3):
+    with _common_utils.AutoDeletingTempDir("user_dir") as user_working_directory:
+        context = _common_engine.EngineContext(
+            execution_id=WorkflowExecutionIdentifier(project='unit_test', domain='unit_test', name='unit_test'),
+            execution_date=_datetime.utcnow(),
+            stats=None,
+            logging=_logging,
+            tmp_dir=user_working_directory
+        )
+        return batch_task._produce_dynamic_job_spec(
+            context,
+            _literals.LiteralMap(literals={'in1': _literals.Literal(
+                scalar=_literals.Scalar(primitive=_literals.Primitive(integer=in1)))})
+        )
+
+
+def test_sub_workflow_spec():
+    spec, generated_files = _produce_spec(sub_workflow_batch_task)
+
+    # Workflow nodes bind their inputs in the node, and the workflow is in the spec once.
+    assert generated_files == {}
+    assert len(spec.nodes) == 4
+    assert [w.id for w in spec.subworkflows] == [SubWorkflow.id]
+    assert [t.id for t in spec.tasks] == [sub_task.id]
+    assert all(n.workflow_node.sub_workflow_ref == SubWorkflow.id for n in spec.nodes)
+    assert len(set(n.id for n in spec.nodes)) == 4
+    assert spec.nodes[2].inputs[0].binding.scalar.primitive.integer == 2
+
+    # The launch plan isn't registered, so its workflow runs with the fixed inputs of the launch plan.
+    assert spec.nodes[3].inputs[0].binding.scalar.primitive.integer == 5
+
+    outputs = {b.var: b.binding for b in spec.outputs}
+    assert [(b.promise.node_id, b.promise.var) for b in outputs['out_str'].collection.bindings] == [
+        (n.id, 'out') for n in spec.nodes[:3]
+    ]
+    assert outputs['out_lp'].promise.node_id == spec.nodes[3].id
+
+
+def test_registered_launch_plan_spec():
+    launch_plan_id = _identifier.Identifier(_identifier.ResourceType.LAUNCH_PLAN, 'p', 'd', 'fixed_launch_plan', 'v')
+    with _mock.patch.object(fixed_launch_plan, '_id', launch_plan_id):
+        spec, _ = _produce_spec(sub_workflow_batch_task)
+
+        launch_plan_node = spec.nodes[3]
+        assert launch_plan_node.workflow_node.launchplan_ref == launch_plan_id
+        assert launch_plan_node.inputs == []
+        assert {b.var: b.binding for b in spec.outputs}['out_lp'].promise.node_id == launch_plan_node.id
+
+
+def test_sub_workflow_task_collision():
+    with _pytest.raises(_user_exceptions.FlyteAssertion):
+        _produce_spec(colliding_sub_workflow_batch_task)
+
+
+def test_sub_workflow_batch_task():
+    with _pytest.raises(_user_exceptions.FlyteAssertion):
+        sub_workflow_batch_task.unit_test(in1=3)
+
+
+def test_tasks_are_not_serialized_per_node():
+    def _count_serializations(batch_task, in1):
+        calls = []
+        to_flyte_idl = _sdk_runnable.SdkRunnableTask.to_flyte_idl
+
+        def _counting_to_flyte_idl(self):
+            calls.append(self)
+            return to_flyte_idl(self)
+
+        with _mock.patch.object(_sdk_runnable.SdkRunnableTask, 'to_flyte_idl', _counting_to_flyte_idl):
+            _produce_spec(batch_task, in1=in1)
+        return len(calls)
+
+    # Sub-tasks are keyed by the identity of their task, so producing the spec serializes no more tasks as the
+    # number of nodes grows.
+    for batch_task in (simple_batch_task, deduplicated_batch_task):
+        assert _count_serializations(batch_task, 10) == _count_serializations(batch_task, 100)
@@ -2,10 +2,12 @@ from __future__ import absolute_import
 from flytekit.sdk.tasks import python_task, inputs, outputs
 from flytekit.sdk.types import Types
 from flytekit.common import constants as _common_constants
+from flytekit.common.exceptions import user as _user_exceptions
 from flytekit.common.tasks import sdk_runnable as _sdk_runnable
 from flytekit.models import types as _type_models
 from flytekit.models.core import identifier as _identifier
 import datetime as _datetime
+import pytest as _pytest
 
 
 @inputs(in1=Types.Integer)
@@ -34,3 +36,18 @@ def test_default_python_task():
     assert default_task.metadata.discoverable is False
     assert default_task.metadata.discovery_version == ''
     assert default_task.metadata.retries.retries == 0
+    assert default_task.offload_large_literals is False
+
+
+def test_offloading_python_task():
+    @outputs(out1=Types.String)
+    @python_task(offload_large_literals=True)
+    def offloading_task(wf_params, out1):
+        pass
+
+    assert offloading_task.offload_large_literals is True
+
+    with _pytest.raises(_user_exceptions.FlyteValidationException):
+        @python_task(offload_large_literals=True, cache=True, cache_version='1')
+        def cached_offloading_task(wf_params):
+            pass
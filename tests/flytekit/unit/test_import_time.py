@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that are only needed to talk to the platform, to declare plugin task types, to handle schemas or to move data.
+# None of them should be imported just to declare python tasks and workflows.
+_LAZY_MODULES = [
+    'grpc',
+    'flytekit.clients.friendly',
+    'flytekit.common.launch_plan',
+    'flytekit.common.tasks.spark_task',
+    'flytekit.common.tasks.hive_task',
+    'flytekit.common.tasks.sidecar_task',
+    'flytekit.interfaces.data.data_proxy',
+    'flytekit.models.qubole',
+    'flyteidl.plugins.qubole_pb2',
+    'numpy.core',
+    'pandas.core.frame',
+    'distutils',
+    'setuptools',
+    'pkg_resources',
+]
+
+# The entrypoint moves the inputs and outputs of the tasks it executes.
+_ENTRYPOINT_MODULES = ['flytekit.interfaces.data.data_proxy']
+
+# Cumulative import time in microseconds, as reported by python -X importtime, of the fastest of a few imports.  The
+# budgets are just above the import times once the data proxy and launch plans are deferred, with enough headroom for
+# noisy machines.  Pulling the data proxy back in, with distutils and setuptools, takes about 150ms more.
+_IMPORT_TIME_BUDGETS = {
+    'flytekit.sdk.tasks': 300 * 1000,
+    'flytekit.sdk.workflow': 300 * 1000,
+    'flytekit.bin.entrypoint': 300 * 1000,
+}
+
+_IMPORT_TIME_RUNS = 5
+
+_MODULES = ['flytekit.sdk.tasks', 'flytekit.sdk.workflow', 'flytekit.bin.entrypoint']
+
+
+def _imported_modules(module):
+    output = subprocess.check_output(
+        [sys.executable, '-c', 'import sys, {}; print("\\n".join(sys.modules))'.format(module)],
+        universal_newlines=True
+    )
+    return set(output.split())
+
+
+def _import_time(module):
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        stderr=subprocess.STDOUT,
+        universal_newlines=True
+    )
+    for line in output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if line.startswith('import time:') and len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError("No import time reported for {}:\n{}".format(module, output))
+
+
+@pytest.mark.parametrize('module', _MODULES)
+def test_heavy_modules_are_imported_lazily(module):
+    lazy_modules = set(_LAZY_MODULES)
+    if module == 'flytekit.bin.entrypoint':
+        lazy_modules -= set(_ENTRYPOINT_MODULES)
+    # Older versions of protobuf declare their namespace package with pkg_resources, which is outside of our control.
+    lazy_modules -= _imported_modules('google.protobuf')
+    assert not lazy_modules & _imported_modules(module)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="python -X importtime requires Python 3.7")
+@pytest.mark.parametrize('module', _MODULES)
+def test_import_time_budget(module):
+    assert min(_import_time(module) for _ in range(_IMPORT_TIME_RUNS)) <= _IMPORT_TIME_BUDGETS[module]
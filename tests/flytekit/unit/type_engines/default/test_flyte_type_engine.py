@@ -1,6 +1,6 @@
 from __future__ import absolute_import
 from flytekit.common.exceptions import user as _user_exceptions
-from flytekit.common.types import proto as _proto
+from flytekit.common.types import proto as _proto, primitives as _primitives
 from flytekit.type_engines.default import flyte as _flyte_engine
 from flytekit.models import types as _type_models, literals as _literal_models
 from flyteidl.core import errors_pb2 as _errors_pb2
@@ -56,3 +56,26 @@ def test_infer_proto_from_literal():
         )
     )
     assert sdk_type.pb_type == _errors_pb2.ContainerError
+
+
+def test_proto_from_literal_type_is_cached():
+    literal_type = _type_models.LiteralType(
+        simple=_type_models.SimpleType.BINARY,
+        metadata={
+            _proto.Protobuf.PB_FIELD_KEY: "flyteidl.core.errors_pb2.ContainerError"
+        }
+    )
+    engine = _flyte_engine.FlyteDefaultTypeEngine()
+    assert engine.get_sdk_type_from_literal_type(literal_type) is engine.get_sdk_type_from_literal_type(literal_type)
+    assert engine.get_sdk_type_from_literal_type(literal_type) is _proto.create_protobuf(_errors_pb2.ContainerError)
+
+
+def test_infer_binary_generic_from_literal():
+    sdk_type = _flyte_engine.FlyteDefaultTypeEngine().infer_sdk_type_from_literal(
+        _literal_models.Literal(
+            scalar=_literal_models.Scalar(
+                binary=_literal_models.Binary(value=b'{}', tag=_primitives.Generic.BINARY_TAG)
+            )
+        )
+    )
+    assert sdk_type is _primitives.Generic